@@ -0,0 +1,830 @@
+# maya
+from maya import cmds
+from maya.api import OpenMaya as om
+
+# domino
+from domino.component import BREAK_POINT_RIG, REGISTRY, build, load
+from domino.core import attribute, remap, rigkit, sidecar, weights, writer
+from domino.core.utils import logger
+
+# built-ins
+from pathlib import Path
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+
+# region UTILS
+def get_memory():
+    """maya heap memory(MB)."""
+    return cmds.memory(heapMemory=True, megaByte=True)
+
+
+def find_template(components=("humanarm01", "humanleg01"), template_dir=None):
+    """template 중 components 를 가장 많이 사용하는 .domino 파일을 찾습니다.
+
+    Args:
+        components (tuple, optional): 찾을 component. Defaults to ("humanarm01", "humanleg01").
+        template_dir (str, optional): Defaults to DOMINO_RIG_TEMPLATE_DIR.
+
+    Returns:
+        str: file path
+    """
+    template_dir = template_dir or os.getenv("DOMINO_RIG_TEMPLATE_DIR", None)
+    if not template_dir:
+        logger.warning("DOMINO_RIG_TEMPLATE_DIR 가 설정되어 있지 않습니다.")
+        return
+
+    result = None
+    max_count = 0
+    for template in Path(template_dir).iterdir():
+        if not template.is_file() or template.suffix != ".domino":
+            continue
+        with open(template, "r") as f:
+            data = json.load(f)
+        count = 0
+        stack = [data]
+        while stack:
+            component_data = stack.pop(0)
+            if component_data["component"]["value"] in components:
+                count += 1
+            stack.extend(component_data["children"])
+        if count > max_count:
+            max_count = count
+            result = template.as_posix()
+    return result
+
+
+def create_chain_rig(chain_count, master_layer_count=2, sub_layer_count=4):
+    """assembly 아래 chain01 하나가 있는 rig 데이터를 만듭니다.
+
+    guide 는 x 축 방향으로 1 씩 떨어뜨립니다.
+    """
+    rig = REGISTRY.create("assembly")
+    chain = REGISTRY.create("chain01")
+    chain.set_count(master_layer_count, sub_layer_count, chain_count)
+    for i, m in enumerate(chain["guide_matrix"]["value"]):
+        m[12] = float(i)
+    chain.set_parent(rig)
+    rig["break_point"] = BREAK_POINT_RIG
+    return rig
+
+
+def get_attributes_cmds(node, attributes):
+    """attribute.snapshot 이전의 cmds.listAttr, cmds.getAttr 으로 읽는 방식."""
+    result = {}
+    for attr in attributes:
+        if getattr(attr, "data_type", None) in attribute.GEOMETRY_DATA_TYPES:
+            continue
+        if attr[attr.long_name]["multi"]:
+            value = []
+            for a in cmds.listAttr(f"{node}.{attr.long_name}", multi=True) or []:
+                value.append(cmds.getAttr(f"{node}.{a}"))
+        else:
+            value = cmds.getAttr(f"{node}.{attr.long_name}")
+        result[attr.long_name] = value
+    return result
+
+
+def get_attributes_elements(node, attributes):
+    """get_matrix_array 이전의 multi element 마다 MPlug 로 읽는 방식."""
+    selection_list = om.MSelectionList()
+    selection_list.add(node)
+    fn_node = om.MFnDependencyNode(selection_list.getDependNode(0))
+    result = {}
+    for attr in attributes:
+        data = attr[attr.long_name]
+        _type = data.get("dataType") or data.get("attributeType")
+        if _type in attribute.GEOMETRY_DATA_TYPES:
+            continue
+        plug = fn_node.findPlug(attr.long_name, False)
+        if data["multi"]:
+            result[attr.long_name] = [
+                attribute.get_plug_value(plug.elementByPhysicalIndex(i), _type)
+                for i in range(plug.numElements())
+            ]
+        else:
+            result[attr.long_name] = attribute.get_plug_value(plug, _type)
+    return result
+
+
+def create_skin_mesh(subdivisions=200, joint_count=100, influences=4):
+    """joint_count 개의 joint 에 bind 된 polySphere 와 cluster.
+
+    vertex 마다 influences 개의 임의 joint weight 를 설정합니다.
+
+    Returns:
+        tuple: (mesh shape, skinCluster, cluster)
+    """
+    mesh = cmds.polySphere(
+        subdivisionsAxis=subdivisions, subdivisionsHeight=subdivisions
+    )[0]
+    shape = cmds.listRelatives(mesh, shapes=True)[0]
+    joints = []
+    for i in range(joint_count):
+        cmds.select(clear=True)
+        joints.append(cmds.joint(name=f"benchmark{i}_jnt", position=(0, i * 0.1, 0)))
+    skin = cmds.skinCluster(joints, mesh, toSelectedBones=True)[0]
+    fn_skin = weights.get_skin_cluster(skin)
+    dag_path = weights.get_dag_path(shape)
+    count = weights.get_shape_info(dag_path)[0]
+
+    values = np.zeros((count, joint_count))
+    rows = np.arange(count)
+    for _ in range(influences):
+        values[rows, np.random.randint(0, joint_count, count)] += np.random.random(
+            count
+        )
+    values /= values.sum(axis=1, keepdims=True)
+    fn_skin.setWeights(
+        dag_path,
+        weights.get_component(dag_path),
+        om.MIntArray(list(range(joint_count))),
+        om.MDoubleArray(values.ravel().tolist()),
+        normalize=False,
+    )
+    cluster = cmds.cluster(mesh)[0]
+    for i in range(0, count, 3):
+        cmds.setAttr(f"{cluster}.weightList[0].weights[{i}]", 0.5)
+    return shape, skin, cluster
+
+
+def create_sphere_points(rows, columns, jitter=0.0):
+    """maya 없이 만드는 sphere 의 point, triangle 배열.
+
+    Returns:
+        tuple: (points (rows * columns, 3), triangles (t, 3))
+    """
+    u = np.linspace(0.0, np.pi, rows)
+    v = np.linspace(0.0, 2.0 * np.pi, columns, endpoint=False)
+    u, v = np.meshgrid(u, v, indexing="ij")
+    points = np.stack(
+        [np.sin(u) * np.cos(v), np.sin(u) * np.sin(v), np.cos(u)], axis=-1
+    ).reshape(-1, 3)
+    if jitter:
+        points += np.random.uniform(-jitter, jitter, points.shape)
+    index = np.arange(rows * columns).reshape(rows, columns)
+    a, b = index[:-1], index[1:]
+    c, d = np.roll(b, -1, axis=1), np.roll(a, -1, axis=1)
+    triangles = np.concatenate(
+        [np.stack([a, b, c], axis=-1), np.stack([a, c, d], axis=-1)]
+    ).reshape(-1, 3)
+    return points, triangles
+
+
+def is_close(a, b, tolerance=1e-6):
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(is_close(x, y, tolerance) for x, y in zip(a, b))
+    if isinstance(a, float) or isinstance(b, float):
+        return abs(a - b) <= tolerance
+    return a == b
+
+
+def log_result(title, results):
+    logger.info(title)
+    for mode, records in results.items():
+        if not records:
+            continue
+        times = [x["time"] for x in records]
+        memories = [x["memory"] for x in records]
+        logger.info(
+            f"\t{mode:<20}time avg {sum(times) / len(times):.4f}s "
+            f"min {min(times):.4f}s / memory avg {sum(memories) / len(memories):.2f}MB"
+        )
+
+
+# endregion
+
+
+# region BENCHMARK
+def benchmark_fast_build(file_path=None, repeat=3):
+    """undo chunk build 와 fast build 의 시간, memory 를 비교합니다.
+
+    매 build 마다 새 scene 에서 undo queue 를 비운 뒤 load 합니다.
+    memory 는 build 전후 maya heap memory 차이입니다.
+
+    Examples:
+        >>> from domino import benchmark
+        >>> benchmark.benchmark_fast_build()
+
+    Args:
+        file_path (str, optional): .domino file. Defaults to humanarm/humanleg 가 많은 template.
+        repeat (int, optional): 반복 횟수. Defaults to 3.
+
+    Returns:
+        dict: {"undo": [{"time", "memory"}], "fast": [...]}
+    """
+    file_path = file_path or find_template()
+    if not file_path:
+        return
+
+    results = {"undo": [], "fast": []}
+    for mode, fast in (("undo", False), ("fast", True)):
+        for _ in range(repeat):
+            cmds.file(newFile=True, force=True)
+            cmds.flushUndo()
+            memory = get_memory()
+            start_time = time.perf_counter()
+            load(file_path, create=True, fast=fast, use_cache=False)
+            results[mode].append(
+                {
+                    "time": time.perf_counter() - start_time,
+                    "memory": get_memory() - memory,
+                }
+            )
+    cmds.file(newFile=True, force=True)
+    cmds.flushUndo()
+    log_result(f"Fast build benchmark {file_path}", results)
+    return results
+
+
+def benchmark_setup_skel(chain_counts=(50, 100, 200, 400), repeat=3):
+    """chain01 의 chain_count 에 따른 setup_skel 시간, memory 를 구합니다.
+
+    output 을 찾는 비용이 일정하므로 시간은 chain_count 에 비례해야 합니다.
+    rig 단계까지만 fast build 하며 시간은 profile 의 setup_skel stage 입니다.
+
+    Examples:
+        >>> from domino import benchmark
+        >>> benchmark.benchmark_setup_skel(chain_counts=(100, 500))
+
+    Args:
+        chain_counts (tuple, optional): Defaults to (50, 100, 200, 400).
+        repeat (int, optional): 반복 횟수. Defaults to 3.
+
+    Returns:
+        dict: {"chain_count {n}": [{"time", "memory"}]}
+    """
+    results = {}
+    for chain_count in chain_counts:
+        records = []
+        for _ in range(repeat):
+            cmds.file(newFile=True, force=True)
+            cmds.flushUndo()
+            rig = create_chain_rig(chain_count)
+            memory = get_memory()
+            context = build({}, rig, profile=True, fast=True)
+            if "_error" in context:
+                logger.warning(f"chain_count {chain_count} build 에 실패했습니다.")
+                break
+            stage = [
+                x for x in context["_profile"]["stages"] if x["name"] == "setup_skel"
+            ][0]
+            records.append({"time": stage["duration"], "memory": get_memory() - memory})
+        results[f"chain_count {chain_count}"] = records
+    cmds.file(newFile=True, force=True)
+    cmds.flushUndo()
+    log_result("setup_skel benchmark", results)
+    return results
+
+
+def benchmark_parse(file_path=None, repeat=5):
+    """같은 rig 를 v1(json), v2(json + sidecar) 로 저장하고 읽는 시간, 크기를 비교합니다.
+
+    temp 디렉토리에 저장하므로 원본 파일은 바뀌지 않습니다.
+
+    Examples:
+        >>> from domino import benchmark
+        >>> benchmark.benchmark_parse()
+
+    Args:
+        file_path (str, optional): .domino file. Defaults to humanarm/humanleg 가 많은 template.
+        repeat (int, optional): 반복 횟수. Defaults to 5.
+
+    Returns:
+        dict: {"v1": {"size", "times"}, "v2": {"size", "times"}}
+    """
+    file_path = file_path or find_template()
+    if not file_path:
+        return
+
+    data = sidecar.read(file_path)
+    temp_dir = Path(tempfile.mkdtemp(prefix="domino_parse_"))
+    name = Path(file_path).name
+    results = {}
+    try:
+        v1_path = temp_dir / "v1" / name
+        v1_path.parent.mkdir()
+        with open(v1_path, "w") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        v2_path = temp_dir / "v2" / name
+        v2_path.parent.mkdir()
+        sidecar.write(v2_path.as_posix(), data)
+
+        for mode, path in (("v1", v1_path), ("v2", v2_path)):
+            size = sum(f.stat().st_size for f in path.parent.iterdir())
+            times = []
+            for _ in range(repeat):
+                start_time = time.perf_counter()
+                sidecar.read(path.as_posix())
+                times.append(time.perf_counter() - start_time)
+            results[mode] = {"size": size, "times": times}
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    logger.info(f"Parse benchmark {file_path}")
+    for mode, result in results.items():
+        times = result["times"]
+        logger.info(
+            f"\t{mode:<20}time avg {sum(times) / len(times):.4f}s "
+            f"min {min(times):.4f}s / size {result['size'] / 1024**2:.2f}MB"
+        )
+    return results
+
+
+def benchmark_save_writer(file_count=200, latency=0.005, repeat=3):
+    """fake exporter 로 순차 쓰기와 SaveHandle thread pool 쓰기의 wall-clock 을 비교합니다.
+
+    fake exporter 는 main thread 에서 data 를 만들고 파일마다 latency(초) 만큼
+    disk, network drive 지연을 흉내 낸 뒤 json 을 씁니다. scene 에 접근하지 않습니다.
+
+    Examples:
+        >>> from domino import benchmark
+        >>> benchmark.benchmark_save_writer(file_count=500)
+
+    Args:
+        file_count (int, optional): 파일 수. Defaults to 200.
+        latency (float, optional): 파일마다 추가할 지연. Defaults to 0.005.
+        repeat (int, optional): 반복 횟수. Defaults to 3.
+
+    Returns:
+        dict: {"serial": [{"time", "main"}], "writer": [...]}
+    """
+
+    def fake_export(file_path, data):
+        time.sleep(latency)
+        writer.write_json(file_path, data)
+
+    def collect(i):
+        return {"name": f"fake{i}", "matrix": [float(x) for x in range(16)] * 64}
+
+    results = {"serial": [], "writer": []}
+    temp_dir = Path(tempfile.mkdtemp(prefix="domino_writer_"))
+    try:
+        for mode in results:
+            for n in range(repeat):
+                directory = temp_dir / f"{mode}{n}"
+                directory.mkdir()
+                start_time = time.perf_counter()
+                if mode == "serial":
+                    for i in range(file_count):
+                        fake_export((directory / f"{i}.json").as_posix(), collect(i))
+                    main_time = time.perf_counter() - start_time
+                else:
+                    handle = writer.SaveHandle(directory.as_posix())
+                    for i in range(file_count):
+                        handle.submit(
+                            i,
+                            fake_export,
+                            (directory / f"{i}.json").as_posix(),
+                            collect(i),
+                        )
+                    handle.start()
+                    main_time = time.perf_counter() - start_time
+                    handle.wait()
+                    if handle.errors():
+                        logger.warning(
+                            f"{len(handle.errors())} 개의 쓰기가 실패했습니다."
+                        )
+                results[mode].append(
+                    {"time": time.perf_counter() - start_time, "main": main_time}
+                )
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    logger.info(f"Save writer benchmark {file_count} files, latency {latency}s")
+    for mode, records in results.items():
+        times = [x["time"] for x in records]
+        mains = [x["main"] for x in records]
+        logger.info(
+            f"\t{mode:<20}time avg {sum(times) / len(times):.4f}s "
+            f"min {min(times):.4f}s / main thread avg {sum(mains) / len(mains):.4f}s"
+        )
+    return results
+
+
+def benchmark_snapshot(file_path=None, repeat=5):
+    """rig root attribute 를 cmds 로 읽는 방식과 attribute.snapshot 을 비교합니다.
+
+    rig 단계까지 build 한 뒤 모든 rig root 를 읽습니다. 값이 다르다면
+    warning 을 남깁니다. element 는 multi element 마다 MPlug 로 읽는 이전 방식입니다.
+
+    Examples:
+        >>> from domino import benchmark
+        >>> benchmark.benchmark_snapshot()
+
+    Args:
+        file_path (str, optional): .domino file. Defaults to humanarm/humanleg 가 많은 template.
+        repeat (int, optional): 반복 횟수. Defaults to 5.
+
+    Returns:
+        dict: {"cmds": [{"time", "memory"}], "element": [...], "snapshot": [...]}
+    """
+    file_path = file_path or find_template()
+    if not file_path:
+        return
+
+    cmds.file(newFile=True, force=True)
+    load(
+        file_path, create=True, break_point=BREAK_POINT_RIG, fast=True, use_cache=False
+    )
+    roots = [
+        (x.split(".")[0], REGISTRY.data(cmds.getAttr(f"{x.split('.')[0]}.component")))
+        for x in cmds.ls("*.is_domino_rig_root", recursive=True)
+    ]
+
+    matrix_count = 0
+    for node, attributes in roots:
+        expected = get_attributes_cmds(node, attributes)
+        values = attribute.snapshot(node, attributes)
+        for long_name, value in expected.items():
+            if not is_close(value, values[long_name]):
+                logger.warning(f"{node}.{long_name} 의 값이 다릅니다.")
+        for attr in attributes:
+            data = attr[attr.long_name]
+            _type = data.get("dataType") or data.get("attributeType")
+            if data["multi"] and _type == "matrix":
+                matrix_count += len(values[attr.long_name])
+
+    results = {"cmds": [], "element": [], "snapshot": []}
+    for mode, func in (
+        ("cmds", get_attributes_cmds),
+        ("element", get_attributes_elements),
+        ("snapshot", attribute.snapshot),
+    ):
+        for _ in range(repeat):
+            memory = get_memory()
+            start_time = time.perf_counter()
+            for node, attributes in roots:
+                func(node, attributes)
+            results[mode].append(
+                {
+                    "time": time.perf_counter() - start_time,
+                    "memory": get_memory() - memory,
+                }
+            )
+    cmds.file(newFile=True, force=True)
+    cmds.flushUndo()
+    log_result(
+        f"Attribute snapshot benchmark {file_path} "
+        f"({len(roots)} roots, {matrix_count} matrix elements)",
+        results,
+    )
+    snapshot_time = min(x["time"] for x in results["snapshot"])
+    for mode in ("cmds", "element"):
+        logger.info(
+            f"\tsnapshot / {mode:<11}"
+            f"x{min(x['time'] for x in results[mode]) / snapshot_time:.2f}"
+        )
+    return results
+
+
+def benchmark_weights(subdivisions=200, joint_count=100, influences=4, repeat=3):
+    """deformerWeights json 과 sparse .npz 의 파일 크기, import 시간을 비교합니다.
+
+    skinCluster 는 매 import 전에 지우므로 import 시간에 skinCluster 생성이 포함됩니다.
+    cluster 는 weight 만 다시 씁니다.
+
+    Examples:
+        >>> from domino import benchmark
+        >>> benchmark.benchmark_weights(subdivisions=400, joint_count=300)
+
+    Args:
+        subdivisions (int, optional): polySphere subdivision. Defaults to 200.
+        joint_count (int, optional): skinCluster influence 수. Defaults to 100.
+        influences (int, optional): vertex 당 weight 를 설정할 joint 수. Defaults to 4.
+        repeat (int, optional): 반복 횟수. Defaults to 3.
+
+    Returns:
+        dict: {"json": [{"time", "memory", "size"}], "npz": [...]}
+    """
+    cmds.file(newFile=True, force=True)
+    shape, skin, cluster = create_skin_mesh(subdivisions, joint_count, influences)
+    expected = weights.read_skin_weights(skin, shape)[0]
+
+    results = {"json": [], "npz": []}
+    temp_dir = Path(tempfile.mkdtemp(prefix="domino_weights_"))
+    try:
+        for mode in results:
+            directory = temp_dir / mode
+            directory.mkdir()
+            if mode == "json":
+                files = []
+                for deformer in (skin, cluster):
+                    path = directory / f"{shape}__{deformer}.json"
+                    rigkit.export_weight(path.as_posix(), deformer)
+                    files.append(path)
+            else:
+                files = [
+                    Path(x)
+                    for deformer in (skin, cluster)
+                    for x in weights.export_weights(directory.as_posix(), deformer)
+                ]
+            size = sum(x.stat().st_size for x in files) / 1024 / 1024
+            for _ in range(repeat):
+                cmds.delete(skin)
+                cmds.flushUndo()
+                memory = get_memory()
+                start_time = time.perf_counter()
+                for path in files:
+                    if mode == "json":
+                        rigkit.import_weight(path.as_posix())
+                    else:
+                        weights.import_weights(path.as_posix())
+                results[mode].append(
+                    {
+                        "time": time.perf_counter() - start_time,
+                        "memory": get_memory() - memory,
+                        "size": size,
+                    }
+                )
+            error = np.abs(weights.read_skin_weights(skin, shape)[0] - expected).max()
+            if error > 1e-3:
+                logger.warning(f"{mode} import 후 weight 오차가 큽니다. {error:.6f}")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    cmds.file(newFile=True, force=True)
+    cmds.flushUndo()
+
+    log_result(
+        f"Weights benchmark {subdivisions}x{subdivisions} sphere, "
+        f"{joint_count} joints, {influences} influences",
+        results,
+    )
+    for mode, records in results.items():
+        logger.info(f"\t{mode:<20}size {records[0]['size']:.2f}MB")
+    return results
+
+
+def benchmark_export_weight(shape_count=3, subdivisions=100, repeat=3):
+    """여러 geometry 에 bind 된 cluster 를 geometry 마다 json 으로 export, import 합니다.
+
+    painted cluster 와 weight 를 수정하지 않은 cluster 를 사용합니다.
+    geometry 마다 파일이 하나씩 만들어지고 import 후 weight 가 같은지 확인합니다.
+
+    Examples:
+        >>> from domino import benchmark
+        >>> benchmark.benchmark_export_weight(shape_count=5)
+
+    Args:
+        shape_count (int, optional): cluster 에 bind 할 polySphere 수. Defaults to 3.
+        subdivisions (int, optional): polySphere subdivision. Defaults to 100.
+        repeat (int, optional): 반복 횟수. Defaults to 3.
+
+    Returns:
+        dict: {"export": [{"time", "memory"}], "import": [...]}
+    """
+    cmds.file(newFile=True, force=True)
+    meshes = [
+        cmds.polySphere(subdivisionsAxis=subdivisions, subdivisionsHeight=subdivisions)[
+            0
+        ]
+        for _ in range(shape_count)
+    ]
+    painted = cmds.cluster(meshes)[0]
+    unpainted = cmds.cluster(meshes)[0]
+    shapes = cmds.deformer(painted, geometry=True, query=True)
+    expected = {}
+    for i, shape in enumerate(shapes):
+        count = cmds.polyEvaluate(shape, vertex=True)
+        values = np.round(np.random.random(count), 4)
+        for index in range(count):
+            cmds.setAttr(
+                f"{painted}.weightList[{i}].weights[{index}]", float(values[index])
+            )
+        expected[shape] = values
+
+    def get_values(deformer, shape, count):
+        index = weights.get_geometry_index(deformer, shape)
+        plug = weights.get_layer_plugs(deformer, index)["weights"]
+        return weights.read_plug_weights(plug, count)
+
+    results = {"export": [], "import": []}
+    temp_dir = Path(tempfile.mkdtemp(prefix="domino_export_weight_"))
+    try:
+        for n in range(repeat):
+            directory = temp_dir / str(n)
+            directory.mkdir()
+            memory = get_memory()
+            start_time = time.perf_counter()
+            files = []
+            for deformer in (painted, unpainted):
+                flags = rigkit.get_export_flags(deformer)
+                for shape in flags:
+                    path = directory / rigkit.get_weight_file_name(
+                        shape, deformer, "cluster"
+                    )
+                    files.append(
+                        rigkit.export_weight(path.as_posix(), deformer, shape, flags)
+                    )
+            results["export"].append(
+                {
+                    "time": time.perf_counter() - start_time,
+                    "memory": get_memory() - memory,
+                }
+            )
+            if len(set(files)) != shape_count * 2:
+                logger.warning(f"geometry 마다 파일이 만들어지지 않았습니다. {files}")
+            for file_path in files:
+                with open(file_path, "r") as f:
+                    data = json.load(f)["deformerWeight"]
+                if [x["name"] for x in data["shapes"]] != [
+                    Path(file_path).name.split("__")[0]
+                ]:
+                    logger.warning(f"{file_path} 의 shape 가 다릅니다.")
+                if "weights" not in data:
+                    logger.warning(f"{file_path} 에 weights 가 없습니다.")
+
+            for i, shape in enumerate(shapes):
+                cmds.setAttr(
+                    f"{painted}.weightList[{i}].weights[0:{len(expected[shape]) - 1}]",
+                    *[1.0] * len(expected[shape]),
+                )
+            memory = get_memory()
+            start_time = time.perf_counter()
+            for file_path in files:
+                rigkit.import_weight(file_path)
+            results["import"].append(
+                {
+                    "time": time.perf_counter() - start_time,
+                    "memory": get_memory() - memory,
+                }
+            )
+            for shape, values in expected.items():
+                error = np.abs(get_values(painted, shape, len(values)) - values).max()
+                if error > 1e-4:
+                    logger.warning(f"{shape} 의 weight 가 다릅니다. {error:.6f}")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    cmds.file(newFile=True, force=True)
+    cmds.flushUndo()
+    log_result(
+        f"Export weight benchmark {shape_count} shapes, "
+        f"{subdivisions}x{subdivisions} sphere",
+        results,
+    )
+    return results
+
+
+def benchmark_weight_maps(
+    subdivisions=300, deformer_types=("cluster", "deltaMush", "tension"), repeat=3
+):
+    """skinCluster 가 아닌 deformer 의 painted map export, import 시간을 비교합니다.
+
+    json 은 rigkit.export_weight, import_weight(deformerWeights),
+    npz 는 weights.export_weights, import_weights(MArrayDataHandle, MArrayDataBuilder) 입니다.
+    import 후 weight 가 같은지 확인합니다.
+
+    Examples:
+        >>> from domino import benchmark
+        >>> benchmark.benchmark_weight_maps(subdivisions=500)
+
+    Args:
+        subdivisions (int, optional): polySphere subdivision. Defaults to 300.
+        deformer_types (tuple, optional): deformer command.
+            Defaults to ("cluster", "deltaMush", "tension").
+        repeat (int, optional): 반복 횟수. Defaults to 3.
+
+    Returns:
+        dict: {"json export": [{"time", "memory"}], "json import": [...], ...}
+    """
+    cmds.file(newFile=True, force=True)
+    mesh = cmds.polySphere(
+        subdivisionsAxis=subdivisions, subdivisionsHeight=subdivisions
+    )[0]
+    shape = cmds.listRelatives(mesh, shapes=True)[0]
+    count = cmds.polyEvaluate(shape, vertex=True)
+    deformers = [getattr(cmds, x)(mesh)[0] for x in deformer_types]
+    expected = {}
+    for deformer in deformers:
+        plug = weights.get_layer_plugs(deformer, 0)["weights"]
+        values = np.random.random(count).astype(np.float32).astype(np.float64)
+        weights.write_plug_weights(plug, values)
+        expected[deformer] = values
+
+    def reset():
+        for deformer in deformers:
+            plug = weights.get_layer_plugs(deformer, 0)["weights"]
+            weights.write_plug_weights(plug, np.ones(count))
+
+    def check(mode):
+        for deformer, values in expected.items():
+            plug = weights.get_layer_plugs(deformer, 0)["weights"]
+            error = np.abs(weights.read_plug_weights(plug, count) - values).max()
+            if error > 1e-4:
+                logger.warning(f"{mode} {deformer} 의 weight 가 다릅니다. {error:.6f}")
+
+    results = {f"{m} {x}": [] for m in ("json", "npz") for x in ("export", "import")}
+    temp_dir = Path(tempfile.mkdtemp(prefix="domino_weight_maps_"))
+    try:
+        for mode in ("json", "npz"):
+            for n in range(repeat):
+                directory = temp_dir / f"{mode}{n}"
+                directory.mkdir()
+                memory = get_memory()
+                start_time = time.perf_counter()
+                if mode == "json":
+                    files = []
+                    for deformer in deformers:
+                        path = directory / rigkit.get_weight_file_name(
+                            shape, deformer, cmds.nodeType(deformer)
+                        )
+                        files.append(rigkit.export_weight(path.as_posix(), deformer))
+                else:
+                    files = [
+                        x
+                        for deformer in deformers
+                        for x in weights.export_weights(
+                            directory.as_posix(), deformer, prune=0.0
+                        )
+                    ]
+                results[f"{mode} export"].append(
+                    {
+                        "time": time.perf_counter() - start_time,
+                        "memory": get_memory() - memory,
+                    }
+                )
+                reset()
+                memory = get_memory()
+                start_time = time.perf_counter()
+                for file_path in files:
+                    if mode == "json":
+                        rigkit.import_weight(file_path)
+                    else:
+                        weights.import_weights(file_path)
+                results[f"{mode} import"].append(
+                    {
+                        "time": time.perf_counter() - start_time,
+                        "memory": get_memory() - memory,
+                    }
+                )
+                check(mode)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    cmds.file(newFile=True, force=True)
+    cmds.flushUndo()
+    log_result(
+        f"Weight map benchmark {count} vertices, {', '.join(deformer_types)}",
+        results,
+    )
+    return results
+
+
+def benchmark_remap(source_size=450, target_size=400, layer_count=100, repeat=3):
+    """remap.get_mapping, remap 의 시간과 오차. maya scene 을 사용하지 않습니다.
+
+    source sphere 의 weight 는 point 위치의 선형 함수이므로 barycentric remap 의
+    오차는 sphere 곡률에 의한 오차만 남습니다.
+
+    Examples:
+        >>> from domino import benchmark
+        >>> benchmark.benchmark_remap()  # 약 200k -> 160k point
+
+    Args:
+        source_size (int, optional): source sphere 의 row, column 수. Defaults to 450.
+        target_size (int, optional): target sphere 의 row, column 수. Defaults to 400.
+        layer_count (int, optional): weight layer 수. Defaults to 100.
+        repeat (int, optional): 반복 횟수. Defaults to 3.
+
+    Returns:
+        dict: {"nearest": [{"time", "error"}], "barycentric": [...]}
+    """
+    source_points, triangles = create_sphere_points(source_size, source_size)
+    target_points, _ = create_sphere_points(target_size, target_size, jitter=1e-3)
+    gradient = np.random.random((3, layer_count))
+    source_values = source_points @ gradient
+    expected = target_points @ gradient
+
+    results = {mode: [] for mode in remap.MODES}
+    for mode in results:
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            indices, weights = remap.get_mapping(
+                source_points, target_points, triangles, mode
+            )
+            values = remap.remap(source_values, indices, weights)
+            results[mode].append(
+                {
+                    "time": time.perf_counter() - start_time,
+                    "error": float(np.abs(values - expected).max()),
+                }
+            )
+
+    logger.info(
+        f"Remap benchmark {len(source_points)} -> {len(target_points)} points, "
+        f"{layer_count} layers"
+    )
+    for mode, records in results.items():
+        times = [x["time"] for x in records]
+        logger.info(
+            f"\t{mode:<20}time avg {sum(times) / len(times):.4f}s "
+            f"min {min(times):.4f}s / max error {records[0]['error']:.6f}"
+        )
+    return results
+
+
+# endregion
@@ -1,11 +1,24 @@
 # domino
-from domino.dynamicmanager import DYNAMIC_MANAGER, export_dynamic, import_dynamic
-from domino.psdmanager import PSD_MANAGER, export_psd, import_psd
-from domino.sdkmanager import SDK_MANAGER, SDK_SETS, export_sdk, import_sdk
+from domino.dynamicmanager import (
+    DYNAMIC_MANAGER,
+    import_dynamic,
+    get_data as get_dynamic_data,
+)
+from domino.psdmanager import (
+    PSD_MANAGER,
+    import_psd,
+    get_data as get_psd_data,
+)
+from domino.sdkmanager import (
+    SDK_MANAGER,
+    SDK_SETS,
+    import_sdk,
+    get_export_data as get_sdk_export_data,
+)
 from domino.spacemanager import (
     SPACE_MANAGER,
-    export_space_manager_data,
     import_space_manager_data,
+    get_data as get_space_manager_data,
 )
 from domino.core import (
     Name,
@@ -18,7 +31,19 @@ from domino.core import (
     attribute,
     nurbscurve,
     rigkit,
+    get_mobject,
 )
+from domino.core import (
+    buildcache,
+    manifest,
+    schema,
+    scriptrunner,
+    sidecar,
+    weights,
+    writer,
+)
+from domino.core.modifier import batch as modifier_batch
+from domino.core.profiler import Profiler
 from domino.core.utils import (
     build_log,
     logger,
@@ -34,15 +59,20 @@ from maya.api import OpenMaya as om
 
 # built-ins
 from pathlib import Path
+from functools import partial
 import copy
 import json
+import tempfile
+import hashlib
 import time
 import shutil
 import importlib
 import logging
-import sys
+import pkgutil
 
-COMPONENTLIST = [
+COMPONENTLIST = []  # REGISTRY 에서 채워집니다.
+# Manager 의 component list 순서. 새로 찾은 component 는 뒤에 추가됩니다.
+COMPONENT_ORDER = (
     "assembly",
     "pivot01",
     "cog01",
@@ -59,7 +89,7 @@ COMPONENTLIST = [
     "psd01",
     "chain01",
     "sc01",
-]
+)
 GUIDE = "guide"
 RIG = "rig"
 SKEL = "skel"
@@ -75,6 +105,13 @@ DYNAMIC_SETS = "dynamic_sets"
 DEFORMER_WEIGHTS_SETS = "deformerWeights_sets"
 DEFORMER_ORDER_SETS = "deformerOrder_sets"
 
+# nurbsCurve, nurbsSurface, mesh attribute 를 plug 에서 직접 읽는 class.
+GEOMETRY_CLASSES = {
+    "nurbsCurve": NurbsCurve,
+    "nurbsSurface": NurbsSurface,
+    "mesh": Mesh,
+}
+
 BREAK_POINT_RIG = 0
 BREAK_POINT_PRECUSTOMSCRIPTS = 1
 BREAK_POINT_SPACEMANAGER = 2
@@ -86,6 +123,164 @@ BREAK_POINT_DEFORMERWEIGHTS = 7
 BREAK_POINT_DEFORMERORDER = 8
 BREAK_POINT_POSTCUSTOMSCRIPTS = 9
 
+# rig() 결과에 영향을 주지 않는 attribute 는 content hash 에서 제외합니다.
+CONTENT_HASH_EXCLUDE_ATTRS = (
+    "domino_path",
+    "run_pre_custom_scripts",
+    "pre_custom_scripts",
+    "pre_custom_scripts_str",
+    "run_post_custom_scripts",
+    "post_custom_scripts",
+    "post_custom_scripts_str",
+)
+
+
+# region REGISTRY
+class ComponentRegistry:
+    """component module 을 한번만 찾고 module, DATA, Rig, UI class 를 cache 합니다.
+
+    domino.component package 에서 `{name}.py` 와 `{name}ui.py` 가 같이 있는
+    module 을 component 로 등록합니다. module 은 처음 사용할 때 import 되고
+    UI class 는 ui_class 를 호출할 때 import 됩니다.
+
+    Examples:
+        >>> REGISTRY.names()
+        >>> component = REGISTRY.create("fk01")
+        >>> ui = REGISTRY.ui_class("fk01")(root=guide_root)
+    """
+
+    def __init__(self):
+        self._names = None
+        self._modules = {}
+        self._ui_classes = {}
+
+    def names(self):
+        """COMPONENT_ORDER 순서의 component 이름 list.
+
+        COMPONENT_ORDER 에 없는 component 는 이름 순으로 뒤에 추가됩니다.
+        """
+        if self._names is None:
+            modules = {
+                x.name for x in pkgutil.iter_modules([Path(__file__).parent.as_posix()])
+            }
+            names = [x for x in modules if not x.endswith("ui") and f"{x}ui" in modules]
+            self._names = [x for x in COMPONENT_ORDER if x in names] + sorted(
+                x for x in names if x not in COMPONENT_ORDER
+            )
+        return list(self._names)
+
+    def module(self, name):
+        module = self._modules.get(name)
+        if module is None:
+            module = importlib.import_module(f"{__name__}.{name}")
+            self._modules[name] = module
+        return module
+
+    def data(self, name):
+        return self.module(name).DATA
+
+    def rig_class(self, name):
+        return self.module(name).Rig
+
+    def create(self, name):
+        return self.module(name).Rig()
+
+    def ui_class(self, name):
+        """`{name}ui` module 에서 이름이 name 과 같은(대소문자 무시) class."""
+        ui_class = self._ui_classes.get(name)
+        if ui_class is None:
+            ui_module = importlib.import_module(f"{__name__}.{name}ui")
+            for attr in dir(ui_module):
+                if attr.lower() == name.lower() and isinstance(
+                    getattr(ui_module, attr), type
+                ):
+                    ui_class = getattr(ui_module, attr)
+                    break
+            else:
+                raise LookupError(f"{name}ui 에 {name} UI class 가 없습니다.")
+            self._ui_classes[name] = ui_class
+        return ui_class
+
+    def refresh(self):
+        """새 component 를 추가했다면 다시 찾습니다."""
+        self._names = None
+        self._modules = {}
+        self._ui_classes = {}
+        COMPONENTLIST[:] = self.names()
+
+
+REGISTRY = ComponentRegistry()
+COMPONENTLIST.extend(REGISTRY.names())
+# endregion
+
+
+# region NODE REGISTRY
+class NodeRegistry:
+    """build 중 생성된 rig root, controller, output joint 를 기록합니다.
+
+    build 단계와 sets 구성에서 scene 전체를 attribute 로 검색하는 대신 사용합니다.
+    MObjectHandle 로 기록하므로 rename 되어도 유효하며 삭제된 node 는 무시됩니다.
+
+    Examples:
+        >>> NODE_REGISTRY.register("controller", ctl)
+        >>> NODE_REGISTRY.nodes("controller")
+    """
+
+    CATEGORIES = ("rig_root", "controller", "output_joint")
+
+    def __init__(self):
+        self._handles = {}
+        self.clear()
+
+    def clear(self):
+        self._handles = {x: [] for x in self.CATEGORIES}
+
+    def register(self, category, node):
+        mobj = get_mobject(node)
+        if mobj is None:
+            return
+        self._handles[category].append(om.MObjectHandle(mobj))
+
+    def unregister(self, category, node):
+        mobj = get_mobject(node)
+        self._handles[category] = [
+            x for x in self._handles[category] if x.isValid() and x.object() != mobj
+        ]
+
+    def register_scene(self):
+        """scene 의 rig root 와 연결된 controller, output joint 를 다시 기록합니다.
+
+        build cache 에서 import 한 rig 처럼 build 없이 만들어진 rig 에 사용합니다.
+        """
+        self.clear()
+        for attr in cmds.ls("*.is_domino_rig_root", recursive=True):
+            rig_root = attr.split(".")[0]
+            self.register("rig_root", rig_root)
+            for category, attr_name in (
+                ("controller", "controller"),
+                ("output_joint", "output_joint"),
+            ):
+                for node in (
+                    cmds.listConnections(
+                        f"{rig_root}.{attr_name}", source=True, destination=False
+                    )
+                    or []
+                ):
+                    self.register(category, node)
+
+    def nodes(self, category):
+        """category 에 기록된 node 중 존재하는 node 의 이름 list."""
+        result = []
+        for handle in self._handles[category]:
+            if not handle.isValid():
+                continue
+            result.append(om.MFnDagNode(handle.object()).partialPathName())
+        return result
+
+
+NODE_REGISTRY = NodeRegistry()
+# endregion
+
 
 # region RIG
 class Rig(dict):
@@ -278,6 +473,7 @@ class Rig(dict):
         )
         rig_root = ins.create()
         cmds.addAttr(rig_root, longName="is_domino_rig_root", attributeType="bool")
+        NODE_REGISTRY.register("rig_root", rig_root)
         cmds.addAttr(rig_root, longName="parent", attributeType="message")
         cmds.addAttr(rig_root, longName="children", attributeType="message")
         cmds.addAttr(
@@ -288,6 +484,9 @@ class Rig(dict):
             rig_root, longName="output_joint", attributeType="message", multi=True
         )
         cmds.addAttr(rig_root, longName="host", attributeType="message")
+        cmds.addAttr(
+            rig_root, longName="rig_nodes", attributeType="message", multi=True
+        )
         cmds.setAttr(f"{rig_root}.useOutlinerColor", 1)
         cmds.setAttr(f"{rig_root}.outlinerColor", 0.375, 0.75, 0.75)
 
@@ -513,6 +712,7 @@ class Rig(dict):
                 f"{ctl}.message", f"{self.instance.rig_root}.controller[{next_index}]"
             )
             self.node = ctl
+            NODE_REGISTRY.register("controller", ctl)
 
             cmds.setAttr(f"{ctl}.sx", lock=True, keyable=False)
             cmds.setAttr(f"{ctl}.sy", lock=True, keyable=False)
@@ -730,6 +930,7 @@ class Rig(dict):
             )[0]
             cmds.connectAttr(f"{output}.message", attr)
             cmds.setAttr(f"{jnt}.rotateAxis", lock=True)
+            NODE_REGISTRY.register("output_joint", jnt)
 
             self._node = jnt
             return jnt
@@ -879,8 +1080,21 @@ class Rig(dict):
         cmds.vnnConnect(graph, f"/{rig_compound}.output", "/output.output")
         return graph
 
-    def setup_skel(self, joints):
+    def setup_skel(self, joints, output_map=None):
+        """output joint 를 output 에 연결합니다.
 
+        Args:
+            joints (list): output joints
+            output_map (dict, optional): get_output_map() 의 결과.
+                None 이라면 새로 구합니다. Defaults to None.
+        """
+        if output_map is None:
+            output_map = get_output_map()
+
+        # SKEL index 는 한번만 세고 연결할 때마다 증가시킵니다.
+        index = len(
+            cmds.listAttr(f"{SKEL}.initialize_parent_inverse_matrix", multi=True) or []
+        )
         for output_joint in joints:
             parent = cmds.listRelatives(output_joint, parent=True)[0]
             # initialize_parent_inverse_matrix
@@ -888,21 +1102,9 @@ class Rig(dict):
                 parent_output = cmds.listConnections(
                     f"{parent}.output", destination=False, source=True
                 )[0]
-                plugs = [
-                    x
-                    for x in cmds.listConnections(
-                        f"{parent_output}.message",
-                        destination=True,
-                        source=False,
-                        plugs=True,
-                    )
-                    if "[" in x
-                ]
-                plug = [x for x in plugs if "output[" in x][0]
-                parent_root = plug.split(".")[0]
-                index = int(plug.split("[")[1].split("]")[0])
+                parent_root, parent_index = output_map[parent_output]
                 initialize_parent_inverse_matrix = (
-                    f"{parent_root}.initialize_output_inverse_matrix[{index}]"
+                    f"{parent_root}.initialize_output_inverse_matrix[{parent_index}]"
                 )
             else:
                 initialize_parent_inverse_matrix = "skel.worldInverseMatrix[0]"
@@ -910,29 +1112,12 @@ class Rig(dict):
             output = cmds.listConnections(
                 f"{output_joint}.output", destination=False, source=True
             )[0]
-            plugs = cmds.listConnections(
-                f"{output}.message",
-                destination=True,
-                source=False,
+            root, output_index = output_map[output]
+            initialize_output_matrix = (
+                f"{root}.initialize_output_matrix[{output_index}]"
             )
-            root = [
-                plug for plug in plugs if cmds.objExists(f"{plug}.is_domino_rig_root")
-            ][0]
-            list_attr = cmds.listAttr(f"{root}.output", multi=True)
-            for attr in list_attr:
-                plug = cmds.listConnections(
-                    f"{root}.{attr}", source=True, destination=False
-                )[0]
-                if plug == output:
-                    break
-            index = int(attr.split("[")[1].split("]")[0])
-            initialize_output_matrix = f"{root}.initialize_output_matrix[{index}]"
 
             # connect
-            index = len(
-                cmds.listAttr(f"{SKEL}.initialize_parent_inverse_matrix", multi=True)
-                or []
-            )
             cmds.setAttr(f"{output_joint}.skel_index", index)
             cmds.connectAttr(
                 initialize_parent_inverse_matrix,
@@ -948,6 +1133,7 @@ class Rig(dict):
                 f"{SKEL}.initialize_parent_inverse_matrix[{index}]"
             )
             initialize_output_matrix = f"{SKEL}.initialize_output_matrix[{index}]"
+            index += 1
 
             # jointOrient
             mult_m = cmds.createNode("multMatrix")
@@ -1083,9 +1269,58 @@ class Rig(dict):
         cmds.addAttr(self.rig_root, longName="notes", dataType="string")
         cmds.setAttr(f"{self.rig_root}.notes", description, type="string")
         cmds.setAttr(f"{self.rig_root}.notes", lock=True)
+        cmds.addAttr(self.rig_root, longName="content_hash", dataType="string")
+        cmds.setAttr(
+            f"{self.rig_root}.content_hash", self.content_hash(), type="string"
+        )
+        cmds.setAttr(f"{self.rig_root}.content_hash", lock=True)
         for i, m in enumerate(self["guide_matrix"]["value"]):
             cmds.setAttr(f"{self.rig_root}.guide_matrix[{i}]", m, type="matrix")
 
+    def content_hash(self):
+        """DATA, controller, output, output_joint 로 component 의 hash 를 구합니다.
+
+        build 시 rig root 의 content_hash 에 기록되고
+        incremental build 에서 다시 build 할 component 를 찾는데 사용됩니다.
+        """
+
+        def normalize(value):
+            if isinstance(value, bool):
+                return int(value)
+            if isinstance(value, float):
+                # getAttr float 오차, -0.0 제거.
+                return round(value, 5) + 0.0
+            if isinstance(value, (list, tuple)):
+                return [normalize(v) for v in value]
+            if isinstance(value, dict):
+                return {str(k): normalize(v) for k, v in value.items()}
+            return value
+
+        parent = self.get_parent()
+        payload = {
+            "parent": parent.identifier if parent else None,
+            "data": {
+                long_name: data.get("value")
+                for long_name, data in self.items()
+                if isinstance(data, dict)
+                and (data.get("dataType") or data.get("attributeType"))
+                and long_name not in CONTENT_HASH_EXCLUDE_ATTRS
+            },
+            "controller": [
+                (ctl["description"], ctl["parent_controllers"])
+                for ctl in self["controller"]
+            ],
+            "output": [
+                (output["description"], output["extension"])
+                for output in self["output"]
+            ],
+            "output_joint": [
+                output_joint["description"] for output_joint in self["output_joint"]
+            ],
+        }
+        data = json.dumps(normalize(payload), sort_keys=True, default=str)
+        return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
     # endregion
 
     def populate(self):
@@ -1452,57 +1687,17 @@ class Rig(dict):
             component = stack.pop(0)
             if not cmds.objExists(component.rig_root):
                 continue
-            module = importlib.import_module(
-                f"domino.component.{component['component']['value']}"
-            )
-
             # attribute
-            attribute_data = module.DATA
-            for attr in attribute_data.copy():
-                if hasattr(attr, "data_type") and attr.data_type == "nurbsCurve":
-                    temp_crv = cmds.circle(name="temp1", constructionHistory=False)[0]
-                    cmds.connectAttr(
-                        f"{component.rig_root}.{attr.long_name}", f"{temp_crv}.create"
-                    )
-                    ins = NurbsCurve(node=temp_crv)
-                    component[attr.long_name]["value"] = ins.data
-                    cmds.delete(temp_crv)
-                    continue
-                elif hasattr(attr, "data_type") and attr.data_type == "nurbsSurface":
-                    temp_surface = cmds.nurbsPlane(
-                        name="temp1", constructionHistory=False
-                    )[0]
-                    cmds.connectAttr(
-                        f"{component.rig_root}.{attr.long_name}",
-                        f"{temp_surface}.create",
-                    )
-                    ins = NurbsSurface(node=temp_surface)
-                    component[attr.long_name]["value"] = ins.data
-                    cmds.delete(temp_surface)
-                    continue
-                elif hasattr(attr, "data_type") and attr.data_type == "mesh":
-                    temp_mesh = cmds.polySphere(
-                        name="temp1", constructionHistory=False
-                    )[0]
-                    cmds.connectAttr(
-                        f"{component.rig_root}.{attr.long_name}", f"{temp_mesh}.inMesh"
+            attribute_data = REGISTRY.data(component["component"]["value"])
+            values = attribute.snapshot(component.rig_root, attribute_data)
+            for attr in attribute_data:
+                if getattr(attr, "data_type", None) in GEOMETRY_CLASSES:
+                    ins = GEOMETRY_CLASSES[attr.data_type](
+                        plug=f"{component.rig_root}.{attr.long_name}"
                     )
-                    ins = Mesh(node=temp_mesh)
                     component[attr.long_name]["value"] = ins.data
-                    cmds.delete(temp_mesh)
                     continue
-                if attr[attr.long_name]["multi"]:
-                    value = []
-                    for a in (
-                        cmds.listAttr(
-                            f"{component.rig_root}.{attr.long_name}", multi=True
-                        )
-                        or []
-                    ):
-                        value.append(cmds.getAttr(f"{component.rig_root}.{a}"))
-                else:
-                    value = cmds.getAttr(f"{component.rig_root}.{attr.long_name}")
-                component[attr.long_name]["value"] = value
+                component[attr.long_name]["value"] = values[attr.long_name]
 
             # controller data.
             component["controller"] = []
@@ -1551,114 +1746,473 @@ class Rig(dict):
 
 
 # region BUILD
+# 아직 restore, 삭제되지 않은 snapshot 파일.
+# build 가 성공하면 이전 build 의 snapshot 은 삭제합니다.
+SNAPSHOTS = []
+
+
+def save_snapshot():
+    """build 전 scene 을 임시 mayaBinary 파일로 저장합니다.
+
+    fast build 에서 undo 대신 사용합니다.
+
+    Returns:
+        str: snapshot file path
+    """
+    file_path = Path(tempfile.gettempdir()) / f"domino_snapshot_{time.time_ns()}.mb"
+    cmds.file(
+        file_path.as_posix(),
+        exportAll=True,
+        type="mayaBinary",
+        preserveReferences=True,
+        force=True,
+    )
+    logger.info(f"Save snapshot {file_path.as_posix()}")
+    SNAPSHOTS.append(file_path.as_posix())
+    return file_path.as_posix()
+
+
+def restore_snapshot(file_path):
+    """save_snapshot 으로 저장한 scene 을 엽니다. scene 이름은 유지됩니다.
+
+    restore 후 snapshot 파일은 삭제됩니다.
+    """
+    scene_name = cmds.file(query=True, sceneName=True)
+    if scene_name:
+        cmds.file(file_path, open=True, force=True)
+        cmds.file(rename=scene_name)
+    else:
+        cmds.file(newFile=True, force=True)
+        cmds.file(file_path, i=True, force=True)
+    logger.info(f"Restore snapshot {file_path}")
+    remove_snapshot(file_path)
+
+
+def remove_snapshot(file_path):
+    """snapshot 파일을 삭제합니다."""
+    if file_path in SNAPSHOTS:
+        SNAPSHOTS.remove(file_path)
+    try:
+        Path(file_path).unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning(f"snapshot 을 삭제하지 못했습니다. {file_path} {e}")
+
+
+def get_output_map(roots=None):
+    """output node 에서 (rig root, output index) 를 구하는 dict.
+
+    rig root 의 output multi attribute 를 한번에 query 합니다.
+
+    Args:
+        roots (list, optional): rig roots. Defaults to scene 의 모든 rig root.
+
+    Returns:
+        dict: {output: (root, index)}
+    """
+    if roots is None:
+        roots = [
+            x.split(".")[0] for x in cmds.ls("*.is_domino_rig_root", recursive=True)
+        ]
+    if not roots:
+        return {}
+    connections = (
+        cmds.listConnections(
+            [f"{x}.output" for x in roots],
+            source=True,
+            destination=False,
+            connections=True,
+        )
+        or []
+    )
+    output_map = {}
+    for plug, output in zip(connections[::2], connections[1::2]):
+        root, attr = plug.split(".", 1)
+        output_map[output] = (root, int(attr.split("[")[1].split("]")[0]))
+    return output_map
+
+
+def record_rig_nodes():
+    """rig() 중에 생성된 DG node 를 기록하는 callback 을 추가합니다.
+
+    Returns:
+        tuple: callback id, 생성된 node 의 MObjectHandle list
+    """
+    handles = []
+
+    def cb_node_added(obj, *args):
+        handles.append(om.MObjectHandle(obj))
+
+    callback_id = om.MDGMessage.addNodeAddedCallback(cb_node_added, "dependNode")
+    return callback_id, handles
+
+
+def connect_rig_nodes(component, handles):
+    """기록된 DG node 를 rig root 의 rig_nodes 에 연결합니다.
+
+    dag node, controller tag, sets 는 rig root, controller 로 찾을 수 있으므로 제외합니다.
+    """
+    if not cmds.objExists(f"{component.rig_root}.rig_nodes"):
+        return
+    selection_list = om.MSelectionList()
+    selection_list.add(component.rig_root)
+    fn_node = om.MFnDependencyNode(selection_list.getDependNode(0))
+    rig_nodes_plug = fn_node.findPlug("rig_nodes", False)
+
+    modifier = om.MDGModifier()
+    index = rig_nodes_plug.numElements()
+    for handle in handles:
+        if not handle.isValid():
+            continue
+        obj = handle.object()
+        if obj.hasFn(om.MFn.kDagNode) or obj.hasFn(om.MFn.kSet):
+            continue
+        fn_rig_node = om.MFnDependencyNode(obj)
+        if fn_rig_node.typeName == "controller":
+            continue
+        modifier.connect(
+            fn_rig_node.findPlug("message", False),
+            rig_nodes_plug.elementByLogicalIndex(index),
+        )
+        index += 1
+    modifier.doIt()
+
+
+def get_dirty_components(component):
+    """content hash 가 바뀐 component 와 그 output 을 사용하는 component 를 구합니다.
+
+    dependents
+        - children (parent output 아래에 rig root 가 생성됨)
+        - parent_controllers 로 controller 를 참조하는 component
+        - output joint 아래에 output joint 가 parent 된 component
+
+    Returns:
+        list: bfs 순서의 component list
+    """
+    components = []
+    stack = [component]
+    while stack:
+        c = stack.pop(0)
+        components.append(c)
+        stack.extend(c["children"])
+    root_table = {c.rig_root: c for c in components}
+
+    dirty_ids = set()
+    for c in components:
+        attr = f"{c.rig_root}.content_hash"
+        if not cmds.objExists(attr) or cmds.getAttr(attr) != c.content_hash():
+            dirty_ids.add(id(c))
+
+    stack = [c for c in components if id(c) in dirty_ids]
+    while stack:
+        c = stack.pop(0)
+        dependents = list(c["children"])
+        for other in components:
+            for ctl in other["controller"]:
+                if any(
+                    tuple(identifier) == c.identifier
+                    for identifier, _ in ctl["parent_controllers"]
+                ):
+                    dependents.append(other)
+                    break
+        if cmds.objExists(f"{c.rig_root}.output_joint"):
+            for jnt in (
+                cmds.listConnections(
+                    f"{c.rig_root}.output_joint", source=True, destination=False
+                )
+                or []
+            ):
+                for child in cmds.listRelatives(jnt, children=True, type="joint") or []:
+                    for root in (
+                        cmds.listConnections(
+                            f"{child}.message", source=False, destination=True
+                        )
+                        or []
+                    ):
+                        if root in root_table:
+                            dependents.append(root_table[root])
+        for dependent in dependents:
+            if id(dependent) not in dirty_ids:
+                dirty_ids.add(id(dependent))
+                stack.append(dependent)
+    return [c for c in components if id(c) in dirty_ids]
+
+
+def teardown_component(component):
+    """component 의 rig root 와 build 중 생성된 node 를 삭제합니다.
+
+    children 의 rig root 도 같이 삭제되므로 children 부터 호출해야 합니다.
+    """
+    rig_root = component.rig_root
+    if not cmds.objExists(rig_root):
+        return
+
+    nodes = [rig_root]
+    if cmds.objExists(f"{rig_root}.rig_nodes"):
+        nodes += (
+            cmds.listConnections(
+                f"{rig_root}.rig_nodes", source=True, destination=False
+            )
+            or []
+        )
+    for ctl in (
+        cmds.listConnections(f"{rig_root}.controller", source=True, destination=False)
+        or []
+    ):
+        nodes.append(f"{ctl}_tag")
+    for jnt in (
+        cmds.listConnections(f"{rig_root}.output_joint", source=True, destination=False)
+        or []
+    ):
+        # setup_skel 에서 생성된 node
+        nodes.append(jnt)
+        nodes += cmds.listConnections(jnt, type="parentConstraint") or []
+        for attr in ["jointOrient", "sx"]:
+            for decom_m in (
+                cmds.listConnections(
+                    f"{jnt}.{attr}",
+                    source=True,
+                    destination=False,
+                    type="decomposeMatrix",
+                )
+                or []
+            ):
+                nodes.append(decom_m)
+                nodes += (
+                    cmds.listConnections(
+                        f"{decom_m}.inputMatrix",
+                        source=True,
+                        destination=False,
+                        type="multMatrix",
+                    )
+                    or []
+                )
+    nodes = [n for n in set(nodes) if cmds.objExists(n)]
+    cmds.delete(nodes)
+
+
 @build_log(logging.INFO)
-def build(context, component, attach_guide=False):
+def build(
+    context,
+    component,
+    attach_guide=False,
+    batch=False,
+    incremental=False,
+    profile=False,
+    fast=False,
+    snapshot=False,
+):
+    """component 를 build 합니다.
+
+    batch 가 True 라면 component 별로 Transform, Joint, Controller 생성을
+    BatchModifier 로 모아서 실행합니다. modifier 로 생성된 node 는
+    undo chunk 에 기록되지 않으므로 fast 와 함께 사용해야 합니다.
+    batch 는 API 에서만 사용할 수 있습니다. (load, deserialize, Manager 는 사용하지 않습니다.)
+
+    incremental 이 True 이고 rig 가 존재한다면 content hash 가 바뀐 component 와
+    dependents 만 삭제 후 다시 build 합니다. 나머지 rig 는 그대로 유지되며
+    metadata 는 실행하지 않습니다. custom scripts 는 READS 에 다시 build 된
+    component identifier 가 포함된 script 만 실행합니다.
+    assembly 가 바뀌었다면 전체를 다시 build 합니다.
+
+    profile 이 True 라면 component rig, setup_skel, 각 stage 의 시간,
+    cmds 호출 수, 생성된 node 수를 기록하고 .domino 파일 옆에
+    profile.json, trace.json(chrome trace event) 으로 저장합니다.
+    report 는 context["_profile"] 에도 기록됩니다.
+
+    fast 가 True 라면 undo chunk 대신 build 동안 undo 기록을 끄고
+    finally 에서 원래 상태로 되돌립니다. snapshot 이 True 라면 build 전
+    scene 을 임시 파일로 저장하고 context["_snapshot"] 에 경로를 기록합니다.
+    restore_snapshot 으로 build 전 scene 을 되돌릴 수 있습니다.
+    snapshot 파일은 restore 후 또는 다음 build 가 성공하면 삭제됩니다.
+
+    custom scripts 는 scriptrunner 로 실행되며 각 script 의 실행 시간은
+    context["_scripts"] 에 기록됩니다. `*` 로 시작하는(비활성화된) script 는 실행하지 않습니다.
+    """
+    # undo chunk 안에서 modifier 로 만든 node 는 undo 되지 않아 scene 이 반만 남습니다.
+    if batch and not fast:
+        raise ValueError("batch 는 fast 와 함께 사용해야 합니다.")
+    profiler = Profiler(enabled=profile)
+    profiler.start()
+    undo_state = cmds.undoInfo(query=True, state=True)
+    start_time = time.perf_counter()
+    used_components = []
+    # mayapy 등 batch mode 에서는 main pane 이 없습니다.
+    g_main_pane = ""
     try:
-        g_main_pane = mel.eval("global string $gMainPane; $temp = $gMainPane;")
-        cmds.paneLayout(g_main_pane, edit=True, manage=False)
-        cmds.undoInfo(openChunk=True)
-        start_time = time.perf_counter()
+        if not cmds.about(batch=True):
+            g_main_pane = mel.eval("global string $gMainPane; $temp = $gMainPane;")
+            cmds.paneLayout(g_main_pane, edit=True, manage=False)
+        if fast:
+            if snapshot:
+                context["_snapshot"] = save_snapshot()
+            cmds.undoInfo(stateWithoutFlush=False)
+        else:
+            cmds.undoInfo(openChunk=True)
 
         if "break_point" not in component:
             component["break_point"] = BREAK_POINT_POSTCUSTOMSCRIPTS
 
+        NODE_REGISTRY.clear()
+
+        # incremental
+        rebuild_ids = None
+        if incremental and cmds.objExists(RIG):
+            dirty_components = get_dirty_components(component)
+            if not dirty_components:
+                logger.info("변경된 component 가 없습니다.")
+                return context
+            if dirty_components[0] is component:
+                logger.info("assembly 가 변경되어 전체 rig 를 다시 build 합니다.")
+                tags = cmds.ls(type="controller")
+                if tags:
+                    cmds.delete(tags)
+                if cmds.objExists(RIG_SETS):
+                    cmds.delete((cmds.sets(RIG_SETS, query=True) or []) + [RIG_SETS])
+                cmds.delete(RIG)
+            else:
+                for c in reversed(dirty_components):
+                    teardown_component(c)
+                rebuild_ids = set(id(c) for c in dirty_components)
+
         # rig build
         stack = [component]
-        used_components = []
         while stack:
             c = stack.pop(0)
-            c.rig()
-            if attach_guide:
-                c.attach_guide()
             identifier = "_".join([str(x) for x in c.identifier if str(x)])
             context[identifier] = {
                 "controller": c["controller"],
                 "output": c["output"],
                 "output_joint": c["output_joint"],
             }
-            used_components.append([identifier, c["component"]["value"]])
             stack.extend(c["children"])
+            if rebuild_ids is not None and id(c) not in rebuild_ids:
+                continue
+            with profiler.stage(identifier, category="component"):
+                callback_id, handles = record_rig_nodes()
+                try:
+                    if batch:
+                        with modifier_batch():
+                            c.rig()
+                    else:
+                        c.rig()
+                finally:
+                    om.MMessage.removeCallback(callback_id)
+                connect_rig_nodes(c, handles)
+                if attach_guide:
+                    c.attach_guide()
+            used_components.append([identifier, c["component"]["value"]])
 
-        # custom data
-        if "custom_nurbscurve_data" in component:
-            for i, data in enumerate(component["custom_nurbscurve_data"]):
-                ins = NurbsCurve(data=data)
-                crv = ins.create_from_data()
-                cmds.connectAttr(f"{crv}.message", f"{RIG}.custom_nurbscurve_data[{i}]")
-        if "custom_nurbssurface_data" in component:
-            for i, data in enumerate(component["custom_nurbssurface_data"]):
-                ins = NurbsSurface(data=data)
-                surface = ins.create_from_data()
-                cmds.connectAttr(
-                    f"{surface}.message", f"{RIG}.custom_nurbssurface_data[{i}]"
-                )
-        if "custom_mesh_data" in component:
-            for i, data in enumerate(component["custom_mesh_data"]):
-                ins = Mesh(data=data)
-                mesh = ins.create_from_data()
-                cmds.connectAttr(f"{mesh}.message", f"{RIG}.custom_mesh_data[{i}]")
+        # custom data, incremental build 에서는 이미 존재합니다.
+        with profiler.stage("custom_data"):
+            if rebuild_ids is None and "custom_nurbscurve_data" in component:
+                for i, data in enumerate(component["custom_nurbscurve_data"]):
+                    ins = NurbsCurve(data=data)
+                    crv = ins.create_from_data()
+                    cmds.connectAttr(
+                        f"{crv}.message", f"{RIG}.custom_nurbscurve_data[{i}]"
+                    )
+            if rebuild_ids is None and "custom_nurbssurface_data" in component:
+                for i, data in enumerate(component["custom_nurbssurface_data"]):
+                    ins = NurbsSurface(data=data)
+                    surface = ins.create_from_data()
+                    cmds.connectAttr(
+                        f"{surface}.message", f"{RIG}.custom_nurbssurface_data[{i}]"
+                    )
+            if rebuild_ids is None and "custom_mesh_data" in component:
+                for i, data in enumerate(component["custom_mesh_data"]):
+                    ins = Mesh(data=data)
+                    mesh = ins.create_from_data()
+                    cmds.connectAttr(f"{mesh}.message", f"{RIG}.custom_mesh_data[{i}]")
 
         # setup controller sets
-        all_controllers = [x.split(".")[0] for x in cmds.ls("*.is_domino_controller")]
-        # remove psd controller
-        domino_controllers = [
-            x for x in all_controllers if not cmds.objExists(f"{x}.is_psd_controller")
-        ]
-        cmds.sets(domino_controllers, edit=True, addElement=CONTROLLER_SETS)
+        # psd controller 는 psd01 에서 registry 에서 제외됩니다.
+        with profiler.stage("sets"):
+            domino_controllers = NODE_REGISTRY.nodes("controller")
+            if domino_controllers:
+                cmds.sets(domino_controllers, edit=True, addElement=CONTROLLER_SETS)
 
         # setup output joint
-        domino_skel = [x.split(".")[0] for x in cmds.ls("*.is_domino_skel")]
-        cmds.sets(domino_skel, edit=True, addElement=SKEL_SETS)
-
-        output_joints = []
-        color_index = 1
-        stack = [component]
-        while stack:
-            c = stack.pop(0)
-            if color_index > 8:
-                # color index 1~8
-                color_index = 1
-            name, side, index = c.identifier
-            for output_joint in c["output_joint"]:
-                joint_name = Name.create(
-                    convention=Name.joint_name_convention,
-                    name=name,
-                    side=side,
-                    index=index,
-                    description=output_joint["description"],
-                    extension=Name.joint_extension,
-                )
-                if output_joint["name"] != joint_name and cmds.objExists(joint_name):
-                    joint_name = cmds.rename(joint_name, output_joint["name"])
-                parent = cmds.listRelatives(joint_name, parent=True) or []
-                if parent:
-                    parent = parent[0]
-                if parent != output_joint["parent"]:
-                    cmds.parent(joint_name, output_joint["parent"])
-                cmds.setAttr(f"{joint_name}.radius", output_joint["radius"])
-                cmds.setAttr(f"{joint_name}.drawStyle", output_joint["draw_style"])
-                cmds.color(joint_name, userDefined=color_index)
-                output_joints.append(joint_name)
-            color_index += 1
-            stack.extend(c["children"])
-        component.setup_skel(output_joints)
+        with profiler.stage("setup_skel"):
+            domino_skel = NODE_REGISTRY.nodes("output_joint")
+            if domino_skel:
+                cmds.sets(domino_skel, edit=True, addElement=SKEL_SETS)
+
+            output_joints = []
+            color_index = 1
+            stack = [component]
+            while stack:
+                c = stack.pop(0)
+                if color_index > 8:
+                    # color index 1~8
+                    color_index = 1
+                name, side, index = c.identifier
+                output_joints_data = c["output_joint"]
+                if rebuild_ids is not None and id(c) not in rebuild_ids:
+                    output_joints_data = []
+                for output_joint in output_joints_data:
+                    joint_name = Name.create(
+                        convention=Name.joint_name_convention,
+                        name=name,
+                        side=side,
+                        index=index,
+                        description=output_joint["description"],
+                        extension=Name.joint_extension,
+                    )
+                    if output_joint["name"] != joint_name and cmds.objExists(
+                        joint_name
+                    ):
+                        joint_name = cmds.rename(joint_name, output_joint["name"])
+                    parent = cmds.listRelatives(joint_name, parent=True) or []
+                    if parent:
+                        parent = parent[0]
+                    if parent != output_joint["parent"]:
+                        cmds.parent(joint_name, output_joint["parent"])
+                    cmds.setAttr(f"{joint_name}.radius", output_joint["radius"])
+                    cmds.setAttr(f"{joint_name}.drawStyle", output_joint["draw_style"])
+                    cmds.color(joint_name, userDefined=color_index)
+                    output_joints.append(joint_name)
+                color_index += 1
+                stack.extend(c["children"])
+            component.setup_skel(output_joints, output_map=get_output_map())
+
+        # incremental build 는 metadata 를 실행하지 않습니다.
+        # custom scripts 는 READS 가 다시 build 된 component 를 포함할 때만 실행합니다.
+        namespace = scriptrunner.get_namespace(component["domino_path"]["value"])
+        context["_scripts"] = []
+        if rebuild_ids is not None:
+            changed_keys = [x[0] for x in used_components]
+            for attr, break_point in [
+                ("pre_custom_scripts", BREAK_POINT_PRECUSTOMSCRIPTS),
+                ("post_custom_scripts", BREAK_POINT_POSTCUSTOMSCRIPTS),
+            ]:
+                if component["break_point"] < break_point:
+                    continue
+                with profiler.stage(attr):
+                    context["_scripts"].extend(
+                        scriptrunner.run_scripts(
+                            component[attr]["value"],
+                            context,
+                            namespace,
+                            profiler,
+                            changed_keys=changed_keys,
+                        )
+                    )
+            return context
 
         # BREAK POINT RIG
         if component["break_point"] == BREAK_POINT_RIG:
             return context
 
         # pre custom scripts
-        for script_path in component["pre_custom_scripts"]["value"]:
-            if not script_path:
-                continue
-            name = Path(script_path).name.split(".")[0]
-            spec = importlib.util.spec_from_file_location(name, script_path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            sys.modules[name] = module
-
-            logger.info(f"Run {name} {script_path}")
-            module.run(context=context)
+        with profiler.stage("pre_custom_scripts"):
+            context["_scripts"].extend(
+                scriptrunner.run_scripts(
+                    component["pre_custom_scripts"]["value"],
+                    context,
+                    namespace,
+                    profiler,
+                )
+            )
 
         # BREAK POINT PRECUSTOMSCRIPTS
         if component["break_point"] == BREAK_POINT_PRECUSTOMSCRIPTS:
@@ -1672,126 +2226,152 @@ def build(context, component, attach_guide=False):
             )
 
         # SPACEMANAGER
-        if component["domino_path"]["value"]:
-            space_dir = metadata_dir / "space"
-            if space_dir.exists():
-                import_space_manager_data((space_dir / "space.smf").as_posix())
-                cmds.parent(SPACE_MANAGER, RIG)
+        with profiler.stage("space_manager"):
+            if component["domino_path"]["value"]:
+                space_dir = metadata_dir / "space"
+                if space_dir.exists():
+                    import_space_manager_data((space_dir / "space.smf").as_posix())
+                    cmds.parent(SPACE_MANAGER, RIG)
 
         # BREAK POINT SPACEMANAGER
         if component["break_point"] == BREAK_POINT_SPACEMANAGER:
             return context
 
         # blendshape
-        if component["domino_path"]["value"]:
-            blendshape_dir = metadata_dir / "blendshape"
-            if blendshape_dir.exists():
-                rigkit.import_blendshape(blendshape_dir.as_posix())
-
-            blendshape_sets = cmds.sets(BLENDSHAPE_SETS, query=True) or []
-            for bs in component["blendshape"]:
-                if not cmds.objExists(bs):
-                    logger.warning(
-                        f"{bs} 가 존재하지 않습니다. 설정이 뭔가 바뀌었나요?"
-                    )
-                    continue
+        with profiler.stage("blendshape"):
+            if component["domino_path"]["value"]:
+                blendshape_dir = metadata_dir / "blendshape"
+                if blendshape_dir.exists():
+                    rigkit.import_blendshape(blendshape_dir.as_posix())
+
+                blendshape_sets = cmds.sets(BLENDSHAPE_SETS, query=True) or []
+                for bs in component["blendshape"]:
+                    if not cmds.objExists(bs):
+                        logger.warning(
+                            f"{bs} 가 존재하지 않습니다. 설정이 뭔가 바뀌었나요?"
+                        )
+                        continue
 
-                if bs not in blendshape_sets:
-                    cmds.sets(bs, edit=True, addElement=BLENDSHAPE_SETS)
+                    if bs not in blendshape_sets:
+                        cmds.sets(bs, edit=True, addElement=BLENDSHAPE_SETS)
 
         # BREAK POINT BLENDSHAPE
         if component["break_point"] == BREAK_POINT_BLENDSHAPE:
             return context
 
         # PSD
-        if component["domino_path"]["value"]:
-            psd_dir = metadata_dir / "pose"
-            if psd_dir.exists():
-                import_psd((psd_dir / "poseSpaceDeformation.psd").as_posix())
-                cmds.parent(PSD_MANAGER, RIG)
+        with profiler.stage("psd_manager"):
+            if component["domino_path"]["value"]:
+                psd_dir = metadata_dir / "pose"
+                if psd_dir.exists():
+                    import_psd((psd_dir / "poseSpaceDeformation.psd").as_posix())
+                    cmds.parent(PSD_MANAGER, RIG)
 
         # BREAK POINT PSD
         if component["break_point"] == BREAK_POINT_PSDMANAGER:
             return context
 
         # SDK
-        if component["domino_path"]["value"]:
-            sdk_dir = metadata_dir / "sdk"
-            if sdk_dir.exists():
-                import_sdk((sdk_dir / "setDriven.sdk").as_posix())
-                cmds.parent(SDK_MANAGER, RIG)
+        with profiler.stage("sdk_manager"):
+            if component["domino_path"]["value"]:
+                sdk_dir = metadata_dir / "sdk"
+                if sdk_dir.exists():
+                    import_sdk((sdk_dir / "setDriven.sdk").as_posix())
+                    cmds.parent(SDK_MANAGER, RIG)
 
         # BREAK POINT SDK
         if component["break_point"] == BREAK_POINT_SDKMANAGER:
             return context
 
         # DYNAMICMANAGER
-        if component["domino_path"]["value"]:
-            dynamic_dir = metadata_dir / "dynamic"
-            if dynamic_dir.exists():
-                import_dynamic((dynamic_dir / "dynamic.dyn").as_posix())
-                cmds.parent(DYNAMIC_MANAGER, RIG)
+        with profiler.stage("dynamic_manager"):
+            if component["domino_path"]["value"]:
+                dynamic_dir = metadata_dir / "dynamic"
+                if dynamic_dir.exists():
+                    import_dynamic((dynamic_dir / "dynamic.dyn").as_posix())
+                    cmds.parent(DYNAMIC_MANAGER, RIG)
 
         # BREAK POINT DYNAMICMANAGER
         if component["break_point"] == BREAK_POINT_DYNAMICMANAGER:
             return context
 
         # deformer weights
-        if component["domino_path"]["value"]:
-            deformer_weights_dir = metadata_dir / "deformerWeights"
-            if deformer_weights_dir.exists():
-                rigkit.import_weights_from_directory(deformer_weights_dir.as_posix())
-
-            deformers_sets = cmds.sets(DEFORMER_WEIGHTS_SETS, query=True) or []
-            for deformer in component["deformer_weights"]:
-                if not cmds.objExists(deformer):
-                    logger.warning(
-                        f"{deformer} 가 존재하지 않습니다. 설정이 뭔가 바뀌었나요?"
+        with profiler.stage("deformer_weights"):
+            if component["domino_path"]["value"]:
+                deformer_weights_dir = metadata_dir / "deformerWeights"
+                if deformer_weights_dir.exists():
+                    rigkit.import_weights_from_directory(
+                        deformer_weights_dir.as_posix()
                     )
-                    continue
 
-                if deformer not in deformers_sets:
-                    cmds.sets(deformer, edit=True, addElement=DEFORMER_WEIGHTS_SETS)
+                deformers_sets = cmds.sets(DEFORMER_WEIGHTS_SETS, query=True) or []
+                for deformer in component["deformer_weights"]:
+                    if not cmds.objExists(deformer):
+                        logger.warning(
+                            f"{deformer} 가 존재하지 않습니다. 설정이 뭔가 바뀌었나요?"
+                        )
+                        continue
+
+                    if deformer not in deformers_sets:
+                        cmds.sets(deformer, edit=True, addElement=DEFORMER_WEIGHTS_SETS)
 
         # BREAK POINT DEFORMERWEIGHTS
         if component["break_point"] == BREAK_POINT_DEFORMERWEIGHTS:
             return context
 
         # deformer order
-        if component["deformer_order"]:
-            order_sets = cmds.sets(DEFORMER_ORDER_SETS, query=True) or []
-            for geo, chain in component["deformer_order"].items():
-                if not cmds.objExists(geo):
-                    logger.warning(
-                        f"{geo} 가 존재하지 않습니다. 설정이 뭔가 바뀌었나요?"
-                    )
-                    continue
+        with profiler.stage("deformer_order"):
+            if component["deformer_order"]:
+                order_sets = cmds.sets(DEFORMER_ORDER_SETS, query=True) or []
+                for geo, chain in component["deformer_order"].items():
+                    if not cmds.objExists(geo):
+                        logger.warning(
+                            f"{geo} 가 존재하지 않습니다. 설정이 뭔가 바뀌었나요?"
+                        )
+                        continue
 
-                rigkit.set_deformer_chain(geo, chain)
+                    rigkit.set_deformer_chain(geo, chain)
 
-                if geo not in order_sets:
-                    cmds.sets(geo, edit=True, addElement=DEFORMER_ORDER_SETS)
+                    if geo not in order_sets:
+                        cmds.sets(geo, edit=True, addElement=DEFORMER_ORDER_SETS)
 
         # BREAK POINT DEFORMERORDER
         if component["break_point"] == BREAK_POINT_DEFORMERORDER:
             return context
 
         # post custom scripts
-        for script_path in component["post_custom_scripts"]["value"]:
-            if not script_path:
-                continue
-            name = Path(script_path).name.split(".")[0]
-            spec = importlib.util.spec_from_file_location(name, script_path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            sys.modules[name] = module
-
-            logger.info(f"Run {name} {script_path}")
-            module.run(context=context)
+        with profiler.stage("post_custom_scripts"):
+            context["_scripts"].extend(
+                scriptrunner.run_scripts(
+                    component["post_custom_scripts"]["value"],
+                    context,
+                    namespace,
+                    profiler,
+                )
+            )
 
     except Exception as e:
+        context["_error"] = e
         logger.error(e, exc_info=True)
     finally:
+        # profiler 가 교체한 cmds 와 callback, undo 상태, main pane 을 가장 먼저 되돌립니다.
+        # 이후 scene 작업이 실패해도 session 에 남지 않습니다.
+        try:
+            profiler.stop()
+        finally:
+            try:
+                if fast:
+                    cmds.undoInfo(stateWithoutFlush=undo_state)
+                else:
+                    cmds.undoInfo(closeChunk=True)
+            finally:
+                if g_main_pane:
+                    cmds.paneLayout(g_main_pane, edit=True, manage=True)
+        # build 가 성공했다면 이전 build 의 snapshot 은 필요하지 않습니다.
+        if "_error" not in context:
+            for file_path in [x for x in SNAPSHOTS if x != context.get("_snapshot")]:
+                remove_snapshot(file_path)
+
         execution_time = time.perf_counter() - start_time
         minutes, seconds = divmod(execution_time, 60)
         hours, minutes = divmod(minutes, 60)
@@ -1804,17 +2384,30 @@ def build(context, component, attach_guide=False):
         plugins = used_plugins()
         for i in range(int(len(plugins) / 2)):
             info += f"\n\t{plugins[i * 2]:<20}{plugins[i * 2 + 1]}"
-        info += "\n\nUsed Components"
+        info += "\n\nUsed Components" if not incremental else "\n\nRebuilt Components"
         for identifier, component_value in used_components:
             info += f"\n\t{identifier:<30}{component_value}"
         info += f"\n\nTotal Build Time : {int(hours):01d}h {int(minutes):01d}m {seconds:.4f}s"
-        cmds.addAttr(RIG, longName="notes", dataType="string")
-        cmds.setAttr(f"{RIG}.notes", info, type="string")
-        cmds.setAttr(f"{RIG}.notes", lock=True)
-        cmds.select(RIG)
-
-        cmds.undoInfo(closeChunk=True)
-        cmds.paneLayout(g_main_pane, edit=True, manage=True)
+        # rig 가 만들어지기 전에 실패했다면 RIG 가 없습니다.
+        if cmds.objExists(RIG):
+            try:
+                if not cmds.objExists(f"{RIG}.notes"):
+                    cmds.addAttr(RIG, longName="notes", dataType="string")
+                cmds.setAttr(f"{RIG}.notes", lock=False)
+                cmds.setAttr(f"{RIG}.notes", info, type="string")
+                cmds.setAttr(f"{RIG}.notes", lock=True)
+                cmds.select(RIG)
+            except Exception as e:
+                logger.warning(f"{RIG}.notes 를 기록할 수 없습니다. {e}")
+
+        # profile
+        if profile:
+            profiler.log()
+            context["_profile"] = profiler.report()
+            if component["domino_path"]["value"]:
+                profiler.write(component["domino_path"]["value"])
+            else:
+                logger.warning("domino_path 가 없어 profile 을 저장하지 않습니다.")
 
         # rig result logging
         @build_log(logging.DEBUG)
@@ -1838,13 +2431,17 @@ def build(context, component, attach_guide=False):
 # region EXPORT / IMPORT
 def serialize():
     """마야 노드에서 json 으로 저장 할 수 있는 데이터로 직렬화합니다."""
+    # 현재 session 에서 build 된 rig 라면 registry 에서 찾습니다.
     assembly_node = ""
-    for n in cmds.ls(type="transform"):
-        if (
-            cmds.objExists(f"{n}.is_domino_rig_root")
-            and cmds.getAttr(f"{n}.component") == "assembly"
-        ):
-            assembly_node = n
+    for rig_roots in (
+        NODE_REGISTRY.nodes("rig_root"),
+        [x.split(".")[0] for x in cmds.ls("*.is_domino_rig_root", recursive=True)],
+    ):
+        for n in rig_roots:
+            if cmds.getAttr(f"{n}.component") == "assembly":
+                assembly_node = n
+                break
+        if assembly_node:
             break
 
     if not assembly_node:
@@ -1855,41 +2452,16 @@ def serialize():
     while stack:
         node, parent = stack.pop(0)
         module_name = cmds.getAttr(f"{node}.component")
-        module = importlib.import_module(f"domino.component.{module_name}")
-        component = module.Rig()
-
-        attribute_data = module.DATA
-        for attr in attribute_data.copy():
-            if hasattr(attr, "data_type") and attr.data_type == "nurbsCurve":
-                temp_crv = cmds.circle(name="temp1", constructionHistory=False)[0]
-                cmds.connectAttr(f"{node}.{attr.long_name}", f"{temp_crv}.create")
-                ins = NurbsCurve(node=temp_crv)
-                component[attr.long_name]["value"] = ins.data
-                cmds.delete(temp_crv)
-                continue
-            elif hasattr(attr, "data_type") and attr.data_type == "nurbsSurface":
-                temp_surface = cmds.nurbsPlane(name="temp1", constructionHistory=False)[
-                    0
-                ]
-                cmds.connectAttr(f"{node}.{attr.long_name}", f"{temp_surface}.create")
-                ins = NurbsSurface(node=temp_surface)
-                component[attr.long_name]["value"] = ins.data
-                cmds.delete(temp_surface)
-                continue
-            elif hasattr(attr, "data_type") and attr.data_type == "mesh":
-                temp_mesh = cmds.polySphere(name="temp1", constructionHistory=False)[0]
-                cmds.connectAttr(f"{node}.{attr.long_name}", f"{temp_mesh}.inMesh")
-                ins = Mesh(node=temp_mesh)
+        component = REGISTRY.create(module_name)
+
+        attribute_data = REGISTRY.data(module_name)
+        values = attribute.snapshot(node, attribute_data)
+        for attr in attribute_data:
+            if getattr(attr, "data_type", None) in GEOMETRY_CLASSES:
+                ins = GEOMETRY_CLASSES[attr.data_type](plug=f"{node}.{attr.long_name}")
                 component[attr.long_name]["value"] = ins.data
-                cmds.delete(temp_mesh)
                 continue
-            if attr[attr.long_name]["multi"]:
-                value = []
-                for a in cmds.listAttr(f"{node}.{attr.long_name}", multi=True) or []:
-                    value.append(cmds.getAttr(f"{node}.{a}"))
-            else:
-                value = cmds.getAttr(f"{node}.{attr.long_name}")
-            component[attr.long_name]["value"] = value
+            component[attr.long_name]["value"] = values[attr.long_name]
 
         # controller data.
         for ctl in (
@@ -1992,39 +2564,49 @@ def serialize():
     if cmds.objExists(DEFORMER_ORDER_SETS):
         for geo in cmds.sets(DEFORMER_ORDER_SETS, query=True) or []:
             rig["deformer_order"][geo] = rigkit.get_deformer_chain(geo)
+    rig[schema.VERSION_KEY] = schema.SCHEMA_VERSION
     return rig
 
 
-def deserialize(data, create=True):
-    """직렬화 한 데이터를 마야 노드로 변환합니다."""
+def create_component(component_data):
+    """직렬화 한 component 하나를 Rig instance 로 만듭니다. children 은 만들지 않습니다."""
+    module_name = component_data["component"]["value"]
+    component = REGISTRY.create(module_name)
+
+    for attr in REGISTRY.data(module_name):
+        component[attr.long_name]["value"] = component_data[attr.long_name]["value"]
+    # controller
+    for controller_data in component_data["controller"]:
+        ins = component._Controller(
+            description="", parent_controllers=[], rig_instance=component
+        )
+        ins.data = controller_data
+    # output
+    for output_data in component_data["output"]:
+        ins = component._Output(description="", extension="", rig_instance=component)
+        ins.data = output_data
+    # output joint
+    for output_joint_data in component_data["output_joint"]:
+        ins = component._OutputJoint(
+            parent_description=None, description="", rig_instance=component
+        )
+        ins.data = output_joint_data
+    return component
+
+
+def deserialize(data, create=True, fast=False):
+    """직렬화 한 데이터를 마야 노드로 변환합니다.
+
+    v2(sidecar) data 라면 domino_path 옆의 sidecar 에서 array 를 읽습니다.
+    """
+    if sidecar.is_packed(data):
+        data = sidecar.unpack(data, data["domino_path"]["value"])
     stack = [(data, None)]
     rig = None
     while stack:
         component_data, parent = stack.pop(0)
         module_name = component_data["component"]["value"]
-        module = importlib.import_module(f"domino.component.{module_name}")
-        component = module.Rig()
-
-        for attr in module.DATA:
-            component[attr.long_name]["value"] = component_data[attr.long_name]["value"]
-        # controller
-        for controller_data in component_data["controller"]:
-            ins = component._Controller(
-                description="", parent_controllers=[], rig_instance=component
-            )
-            ins.data = controller_data
-        # output
-        for output_data in component_data["output"]:
-            ins = component._Output(
-                description="", extension="", rig_instance=component
-            )
-            ins.data = output_data
-        # output joint
-        for output_joint_data in component_data["output_joint"]:
-            ins = component._OutputJoint(
-                parent_description=None, description="", rig_instance=component
-            )
-            ins.data = output_joint_data
+        component = create_component(component_data)
 
         if parent:
             component.set_parent(parent)
@@ -2042,13 +2624,160 @@ def deserialize(data, create=True):
     rig["break_point"] = data["break_point"]
 
     if create:
-        build({}, component=rig)
+        build({}, component=rig, fast=fast)
     return rig
 
 
+def list_components(file_path):
+    """.domino 의 component tree 를 component instance 를 만들지 않고 구합니다.
+
+    v2 파일은 sidecar 를 읽지 않습니다.
+    path 는 assembly 부터 children index 이며 load_subtree 에 사용합니다.
+
+    Examples:
+        >>> tree = list_components("D:/character_v001.domino")
+        >>> tree["children"][0]["identifier"]
+        ('arm', 'L', 0)
+
+    Returns:
+        dict: {"identifier", "component", "path", "children"}
+    """
+    with open(file_path, "r") as f:
+        data = json.load(f)
+
+    def walk(component_data, path):
+        return {
+            "identifier": (
+                component_data["name"]["value"],
+                Name.side_str_list[component_data["side"]["value"]],
+                component_data["index"]["value"],
+            ),
+            "component": component_data["component"]["value"],
+            "path": path,
+            "children": [
+                walk(child, path + [i])
+                for i, child in enumerate(component_data["children"])
+            ],
+        }
+
+    return walk(data, [])
+
+
+@build_log(logging.INFO)
+def load_subtree(file_path, path, parent, apply_to_output=True):
+    """.domino 의 path 에 있는 component 와 하위 component 를 현재 rig 의 parent 아래에 추가합니다.
+
+    subtree 만 component instance 로 만들며 v2 파일은 subtree 의 array 만 sidecar 에서 읽습니다.
+    duplicate_component 처럼 index 를 다시 구하고 controller, output, output joint 를
+    다시 populate 합니다. controller shape 는 파일의 값을 사용합니다.
+
+    Args:
+        file_path (str): .domino file
+        path (list): list_components 의 path
+        parent (Rig): 현재 rig 의 parent component
+        apply_to_output (bool, optional): rig, skel 까지 생성합니다. Defaults to True.
+
+    Returns:
+        Rig: 추가된 subtree 의 root component
+    """
+    with open(file_path, "r") as f:
+        data = json.load(f)
+    subtree = data
+    for i in path:
+        subtree = subtree["children"][i]
+    if sidecar.is_packed(data):
+        subtree = sidecar.unpack(
+            {**subtree, sidecar.FORMAT_KEY: data[sidecar.FORMAT_KEY]}, file_path
+        )
+    if subtree["component"]["value"] == "assembly":
+        logger.warning("assembly 는 불러올 수 없습니다.")
+        return
+    subtree = schema.migrate(subtree, REGISTRY, version=schema.get_version(data))
+    problems = schema.validate(subtree, REGISTRY, references=False)
+    if problems:
+        for problem in problems:
+            logger.error(problem)
+        return
+
+    root = None
+    stack = [(subtree, parent)]
+    while stack:
+        component_data, parent_component = stack.pop(0)
+        component = create_component(component_data)
+        component["index"]["value"] = parent.get_valid_component_index(
+            component["name"]["value"], component["side"]["value"]
+        )
+        component.set_parent(parent_component)
+
+        shapes = {
+            x["description"]: x["shape"]
+            for x in component["controller"]
+            if "shape" in x
+        }
+        component["controller"] = []
+        component.populate_controller()
+        for controller in component["controller"]:
+            if controller["description"] in shapes:
+                controller["shape"] = shapes[controller["description"]]
+        component["output"] = []
+        component.populate_output()
+        component["output_joint"] = []
+        component.populate_output_joint()
+
+        if apply_to_output:
+            component.rig()
+            output_joints = []
+            name, side, index = component.identifier
+            for output_joint in component["output_joint"]:
+                output_joints.append(
+                    Name.create(
+                        convention=Name.joint_name_convention,
+                        name=name,
+                        side=side,
+                        index=index,
+                        description=output_joint["description"],
+                        extension=Name.joint_extension,
+                    )
+                )
+            component.setup_skel(output_joints)
+
+        if root is None:
+            root = component
+        stack.extend([(child, component) for child in component_data["children"]])
+    logger.info(f"Load subtree {root.identifier} from {file_path}")
+    return root
+
+
+def write_domino(file_path, data, binary=False, log=logger.info):
+    """.domino 파일을 씁니다.
+
+    background save 에서는 thread pool 에서 실행되므로 log 로 SaveHandle.log 를 받습니다.
+    """
+    if binary:
+        _, sidecar_path = sidecar.write(file_path, data)
+        log(f"Save sidecar {sidecar_path}")
+    else:
+        with open(file_path, "w") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        sidecar.remove(file_path)
+    log(f"Save filePath: {file_path}")
+
+
 @build_log(logging.INFO)
-def save(file_path, data=None):
-    """리그를 json 으로 저장합니다."""
+def save(file_path, data=None, binary=False, background=False):
+    """리그를 json 으로 저장합니다.
+
+    binary 가 True 라면 v2 로 저장합니다. matrix, geometry 등 큰 숫자 list 는
+    `{file_path}.bin` sidecar 에 저장되고 json 에는 구조와 scalar 만 남습니다.
+
+    scene 에서 data 를 모으는 작업은 main thread 에서, json encoding 과 파일 쓰기는
+    thread pool 에서 실행합니다. background 가 False 라면 쓰기가 끝날 때까지 기다립니다.
+    thread pool 의 log 는 handle 에 쌓이고 handle.wait 또는 Manager 의 poll_save 에서
+    main thread 로 출력됩니다.
+
+    Returns:
+        SaveHandle: progress, errors 를 확인할 수 있는 handle
+    """
     if not file_path:
         return
 
@@ -2058,6 +2787,10 @@ def save(file_path, data=None):
     if not data:
         return
 
+    # 같은 파일의 이전 save 가 끝나지 않았다면 기다립니다.
+    writer.wait(file_path)
+    handle = writer.SaveHandle(file_path)
+
     # custom scripts 를 버전 업 된 path 로 수정합니다.
     # 수동으로 모든 파일을 버전업 하지 않게 하기 위함입니다.
     path = Path(file_path)
@@ -2065,53 +2798,60 @@ def save(file_path, data=None):
     if not metadata_dir.exists():
         metadata_dir.mkdir()
 
+    # 이전 버전의 metadata 와 source hash 가 같은 artifact 는 export 하지 않습니다.
+    previous_dir = None
+    if data["domino_path"]["value"]:
+        previous_path = Path(data["domino_path"]["value"])
+        previous_dir = previous_path.parent / (
+            f"{previous_path.name.split('.')[0]}.metadata"
+        )
+    metadata_manifest = manifest.Manifest(metadata_dir, previous_dir)
+
     # scripts version up
+    # thread pool 에서 실행되므로 logger 대신 handle.log 를 사용합니다.
     def copy_file(source_path, destination_path):
         try:
             shutil.copy2(source_path, destination_path)
-            logger.info(f"File copied from {source_path} to {destination_path}")
+            handle.log(f"File copied from {source_path} to {destination_path}")
         except FileNotFoundError:
-            logger.info(f"Source file not found: {source_path}")
+            handle.log(f"Source file not found: {source_path}")
         except PermissionError:
-            logger.info(f"Permission denied to copy file to: {destination_path}")
+            handle.log(f"Permission denied to copy file to: {destination_path}")
         except Exception as e:
-            logger.info(f"An error occurred: {e}")
+            handle.log(f"An error occurred: {e}")
 
     scripts_dir = metadata_dir / "scripts"
     if not scripts_dir.exists():
         scripts_dir.mkdir()
-    replace_scripts = []
-    for script_path in data["pre_custom_scripts"]["value"]:
-        if not script_path:
-            continue
-        disable = False
-        if script_path.startswith("*"):
-            script_path = script_path[1:]
-            disable = True
-        source_file = Path(script_path)
-        name = source_file.name
-        destination_file = scripts_dir / name
-        copy_file(source_file.as_posix(), destination_file.as_posix())
-        replace_script = "*" if disable else ""
-        replace_script += destination_file.as_posix()
-        replace_scripts.append(replace_script)
-    data["pre_custom_scripts"]["value"] = replace_scripts
-    replace_scripts = []
-    for script_path in data["post_custom_scripts"]["value"]:
-        if not script_path:
-            continue
-        disable = False
-        if script_path.startswith("*"):
-            script_path = script_path[1:]
-            disable = True
-        source_file = Path(script_path)
-        name = source_file.name
-        destination_file = scripts_dir / name
-        copy_file(source_file.as_posix(), destination_file.as_posix())
-        replace_script = "*" if disable else ""
-        replace_script += destination_file.as_posix()
-        replace_scripts.append(replace_script)
-    data["post_custom_scripts"]["value"] = replace_scripts
+    for attr in ["pre_custom_scripts", "post_custom_scripts"]:
+        replace_scripts = []
+        for script_path in data[attr]["value"]:
+            if not script_path:
+                continue
+            disable = False
+            if script_path.startswith("*"):
+                script_path = script_path[1:]
+                disable = True
+            source_file = Path(script_path)
+            name = source_file.name
+            destination_file = scripts_dir / name
+            metadata_manifest.export(
+                f"scripts/{name}",
+                [f"scripts/{name}"],
+                manifest.hash_file(source_file) if source_file.exists() else None,
+                partial(
+                    handle.submit,
+                    f"scripts/{name}",
+                    copy_file,
+                    source_file.as_posix(),
+                    destination_file.as_posix(),
+                ),
+                link=False,
+            )
+            replace_script = "*" if disable else ""
+            replace_script += destination_file.as_posix()
+            replace_scripts.append(replace_script)
+        data[attr]["value"] = replace_scripts
 
     root = data.rig_root
     if cmds.objExists(data.guide_root):
@@ -2129,35 +2869,94 @@ def save(file_path, data=None):
             blendshape_dir.mkdir()
 
         for bs in data["blendshape"]:
-            rigkit.export_blendshape(blendshape_dir.as_posix(), bs)
+            geo = cmds.deformer(bs, geometry=True, query=True)[0]
+            if cmds.nodeType(geo) == "mesh":
+                files = [f"blendshape/{geo}__{bs}.obj", f"blendshape/{bs}.shp"]
+            else:
+                files = [f"blendshape/{geo}__{bs}.json"]
+            metadata_manifest.export(
+                f"blendshape/{bs}",
+                files,
+                manifest.hash_blendshape(bs),
+                partial(rigkit.export_blendshape, blendshape_dir.as_posix(), bs),
+            )
 
     # space
     if cmds.objExists(SPACE_MANAGER):
         space_dir = metadata_dir / "space"
         if not space_dir.exists():
             space_dir.mkdir()
-        export_space_manager_data((space_dir / "space.smf").as_posix())
+        space_data = get_space_manager_data()
+        metadata_manifest.export(
+            "space",
+            ["space/space.smf"],
+            manifest.hash_data(space_data),
+            partial(
+                handle.submit,
+                "space",
+                writer.write_json,
+                (space_dir / "space.smf").as_posix(),
+                space_data,
+            ),
+        )
 
     # PSD
     if cmds.objExists(PSD_MANAGER):
         pose_dir = metadata_dir / "pose"
         if not pose_dir.exists():
             pose_dir.mkdir()
-        export_psd((pose_dir / "poseSpaceDeformation.psd").as_posix())
+        psd_data = get_psd_data()
+        metadata_manifest.export(
+            "pose",
+            ["pose/poseSpaceDeformation.psd"],
+            manifest.hash_data(psd_data),
+            partial(
+                handle.submit,
+                "pose",
+                writer.write_json,
+                (pose_dir / "poseSpaceDeformation.psd").as_posix(),
+                psd_data,
+            ),
+        )
 
     # SDK
     if cmds.objExists(SDK_MANAGER):
         sdk_dir = metadata_dir / "sdk"
         if not sdk_dir.exists():
             sdk_dir.mkdir()
-        export_sdk((sdk_dir / "setDriven.sdk").as_posix())
+        sdk_data = get_sdk_export_data()
+        metadata_manifest.export(
+            "sdk",
+            ["sdk/setDriven.sdk"],
+            manifest.hash_data(sdk_data),
+            partial(
+                handle.submit,
+                "sdk",
+                writer.write_json,
+                (sdk_dir / "setDriven.sdk").as_posix(),
+                sdk_data,
+                indent=4,
+            ),
+        )
 
     # DYNAMIC
     if cmds.objExists(DYNAMIC_MANAGER):
         dynamic_dir = metadata_dir / "dynamic"
         if not dynamic_dir.exists():
             dynamic_dir.mkdir()
-        export_dynamic((dynamic_dir / "dynamic.dyn").as_posix())
+        dynamic_data = get_dynamic_data()
+        metadata_manifest.export(
+            "dynamic",
+            ["dynamic/dynamic.dyn"],
+            manifest.hash_data(dynamic_data),
+            partial(
+                handle.submit,
+                "dynamic",
+                writer.write_json,
+                (dynamic_dir / "dynamic.dyn").as_posix(),
+                dynamic_data,
+            ),
+        )
 
     # deformerWeights
     if data["deformer_weights"]:
@@ -2165,31 +2964,106 @@ def save(file_path, data=None):
         if not deformer_weights_dir.exists():
             deformer_weights_dir.mkdir()
 
-        rigkit.export_weights_to_directory(
-            deformer_weights_dir.as_posix(), data["deformer_weights"]
-        )
-
-    with open(file_path, "w") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+        for deformer in data["deformer_weights"]:
+            deformer_type = cmds.nodeType(deformer)
+            if deformer_type not in rigkit.DEFORMER_TYPE_TABLE:
+                logger.warning(f"{deformer_type} 을 지원하지 않습니다.")
+                continue
+            files = [f"deformerWeights/{x}" for x in weights.get_file_names(deformer)]
+            metadata_manifest.export(
+                f"deformerWeights/{deformer}",
+                files,
+                manifest.hash_deformer(
+                    deformer, rigkit.DEFORMER_TYPE_TABLE[deformer_type]
+                ),
+                partial(
+                    rigkit.export_weights_to_directory,
+                    deformer_weights_dir.as_posix(),
+                    [deformer],
+                ),
+            )
 
-    logger.info(f"Save filePath: {file_path}")
+    # background 에서 쓰는 동안 ui 가 data 를 수정할 수 있으므로 복사합니다.
+    handle.submit(
+        "domino",
+        write_domino,
+        file_path,
+        writer.snapshot(data) if background else data,
+        binary,
+        log=handle.log,
+    )
+    handle.finalize(metadata_manifest.write)
+    handle.start()
+    if not background:
+        handle.wait()
+    return handle
 
 
 @build_log(logging.INFO)
-def load(file_path, create=True, break_point=BREAK_POINT_POSTCUSTOMSCRIPTS):
-    """json 을 리그로 불러옵니다."""
+def load(
+    file_path,
+    create=True,
+    break_point=BREAK_POINT_POSTCUSTOMSCRIPTS,
+    fast=False,
+    use_cache=False,
+    data=None,
+):
+    """json 을 리그로 불러옵니다. v1, v2(sidecar) 모두 사용할 수 있습니다.
+
+    data 가 주어지면 파일을 다시 읽지 않습니다. (template catalogue 의 cache)
+
+    use_cache 가 True 이고 빈 scene 이라면 build cache 를 사용합니다.
+    .domino, metadata, custom scripts, component source, maya/bifrost version,
+    break point 가 같은 build 결과가 있다면 build 대신 import 합니다.
+    custom script 가 읽는 그 외의 파일(model .mb, import 하는 module 등) 은
+    key 에 포함되지 않으므로 기본값은 False 이며 Manager 의 option 에서만 켭니다.
+    cache miss 라면 build 후 scene 전체를 export 합니다.
+
+    cache hit 은 build 하지 않으므로 profile, build log 가 없습니다.
+    NODE_REGISTRY 는 import 한 scene 에서 다시 기록합니다.
+    """
     if not file_path:
         return
 
-    with open(file_path, "r") as f:
-        data = json.load(f)
+    # background save 가 진행 중이라면 끝난 뒤 읽습니다.
+    writer.wait(file_path)
+    if data is None:
+        data = sidecar.read(file_path)
 
     logger.info(f"Load filePath: {file_path}")
 
+    # scene 작업 전에 data 를 검사합니다.
+    data = schema.migrate(data, REGISTRY)
+    problems = schema.validate(data, REGISTRY)
+    if problems:
+        for problem in problems:
+            logger.error(problem)
+        logger.error(f"{file_path} 의 data 가 올바르지 않아 불러오지 않습니다.")
+        return
+
+    path = Path(file_path)
+    metadata_dir = path.parent / (f"{path.name.split('.')[0]}.metadata")
+    if metadata_dir.exists():
+        for problem in manifest.verify(metadata_dir):
+            logger.warning(problem)
+
     data["domino_path"]["value"] = file_path
     data["break_point"] = break_point
-    rig = deserialize(data, create)
 
+    if not (create and use_cache and buildcache.is_empty_scene()):
+        return deserialize(data, create, fast=fast)
+
+    key = buildcache.get_cache_key(file_path, break_point)
+    rig = deserialize(data, create=False)
+    cache_path = buildcache.get(key)
+    if cache_path:
+        buildcache.restore(cache_path)
+        NODE_REGISTRY.register_scene()
+        return rig
+
+    context = build({}, component=rig, fast=fast)
+    if "_error" not in context:
+        buildcache.store(key)
     return rig
 
 
@@ -1583,49 +1583,53 @@ class Rig(component.Rig):
             count_value = int(count_line_edit.text())
             if count_value < 2:
                 return
-            self["master_layer_count"]["value"] = master_value
-            self["sub_layer_count"]["value"] = sub_value
-            self["chain_count"]["value"] = count_value
-            self["sub_driver_u_values"]["value"] = [
-                v / (sub_value - 1) for v in range(sub_value)
-            ]
-
-            self["guide_matrix"]["value"] = []
-            self["npo_matrix"]["value"] = []
-            for _ in range(1 + (master_value * 2) + sub_value):
-                self["guide_matrix"]["value"].append(
-                    [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1]
-                )
-                self["guide_mirror_type"]["value"].append(1)
-            for _ in range(master_value):
-                self["npo_matrix"]["value"].append(
-                    [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1]
-                )
-            self["sub_driver_matrix"]["value"] = []
-            for _ in range(sub_value):
-                self["sub_driver_matrix"]["value"].append(
-                    [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1]
-                )
-
-            self["main_ik_rotate_x"]["value"] = [0 for _ in range(count_value)]
-            self["main_ik_rotate_y"]["value"] = [0 for _ in range(count_value)]
-            self["main_ik_rotate_z"]["value"] = [0 for _ in range(count_value)]
-            self["up_ik_rotate_x"]["value"] = [0 for _ in range(count_value)]
-            self["up_ik_rotate_y"]["value"] = [0 for _ in range(count_value)]
-            self["up_ik_rotate_z"]["value"] = [0 for _ in range(count_value)]
-            self["dyn_ik_rotate_x"]["value"] = [0 for _ in range(count_value)]
-            self["dyn_ik_rotate_y"]["value"] = [0 for _ in range(count_value)]
-            self["dyn_ik_rotate_z"]["value"] = [0 for _ in range(count_value)]
-            self["initialize_output_matrix"]["value"] = [
-                list(ORIGINMATRIX) for _ in range(count_value)
-            ]
-            self["initialize_output_inverse_matrix"]["value"] = [
-                list(ORIGINMATRIX) for _ in range(count_value)
-            ]
+            self.set_count(master_value, sub_value, count_value)
         except:
             return False
         return result
 
+    def set_count(self, master_layer_count, sub_layer_count, chain_count):
+        """layer, chain 개수에 맞게 데이터를 초기화합니다. input_data 에서 사용됩니다."""
+        self["master_layer_count"]["value"] = master_layer_count
+        self["sub_layer_count"]["value"] = sub_layer_count
+        self["chain_count"]["value"] = chain_count
+        self["sub_driver_u_values"]["value"] = [
+            v / (sub_layer_count - 1) for v in range(sub_layer_count)
+        ]
+
+        self["guide_matrix"]["value"] = []
+        self["npo_matrix"]["value"] = []
+        for _ in range(1 + (master_layer_count * 2) + sub_layer_count):
+            self["guide_matrix"]["value"].append(
+                [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1]
+            )
+            self["guide_mirror_type"]["value"].append(1)
+        for _ in range(master_layer_count):
+            self["npo_matrix"]["value"].append(
+                [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1]
+            )
+        self["sub_driver_matrix"]["value"] = []
+        for _ in range(sub_layer_count):
+            self["sub_driver_matrix"]["value"].append(
+                [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1]
+            )
+
+        self["main_ik_rotate_x"]["value"] = [0 for _ in range(chain_count)]
+        self["main_ik_rotate_y"]["value"] = [0 for _ in range(chain_count)]
+        self["main_ik_rotate_z"]["value"] = [0 for _ in range(chain_count)]
+        self["up_ik_rotate_x"]["value"] = [0 for _ in range(chain_count)]
+        self["up_ik_rotate_y"]["value"] = [0 for _ in range(chain_count)]
+        self["up_ik_rotate_z"]["value"] = [0 for _ in range(chain_count)]
+        self["dyn_ik_rotate_x"]["value"] = [0 for _ in range(chain_count)]
+        self["dyn_ik_rotate_y"]["value"] = [0 for _ in range(chain_count)]
+        self["dyn_ik_rotate_z"]["value"] = [0 for _ in range(chain_count)]
+        self["initialize_output_matrix"]["value"] = [
+            list(ORIGINMATRIX) for _ in range(chain_count)
+        ]
+        self["initialize_output_inverse_matrix"]["value"] = [
+            list(ORIGINMATRIX) for _ in range(chain_count)
+        ]
+
     def __init__(self):
         super().__init__(DATA)
 
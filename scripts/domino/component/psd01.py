@@ -113,6 +113,8 @@ class Rig(component.Rig):
             cmds.addAttr(
                 ctl, longName="is_psd_controller", attributeType="bool", keyable=False
             )
+            # psd controller 는 controller sets 에 추가하지 않습니다.
+            component.NODE_REGISTRY.unregister("controller", ctl)
             cmds.setAttr(f"{ctl}.tx", channelBox=True)
             cmds.setAttr(f"{ctl}.ty", channelBox=True)
             cmds.setAttr(f"{ctl}.tz", channelBox=True)
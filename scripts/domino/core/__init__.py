@@ -4,6 +4,7 @@ from maya.api import OpenMaya as om
 
 # domino
 from domino.core import nurbscurve, matrix
+from domino.core.modifier import BatchModifier, get_mobject
 
 ORIGINMATRIX = om.MMatrix()
 
@@ -212,6 +213,9 @@ class Transform:
         Returns:
             str: node
         """
+        modifier = BatchModifier.current()
+        if modifier is not None and not modifier.exists(self._node):
+            return self._create_batch(modifier)
         if not cmds.objExists(self._node):
             self._node = cmds.createNode("transform", name=self._node)
             cmds.addAttr(self._node, longName="description", dataType="string")
@@ -227,6 +231,24 @@ class Transform:
             self._node = cmds.parent(self._node, self._parent)[0]
         return self._node
 
+    def _create_batch(self, modifier):
+        """BatchModifier 로 transform 을 생성합니다.
+
+        parent 아래에 바로 생성한 뒤 worldMatrix 를 적용하므로
+        create 와 같은 결과를 가집니다.
+        """
+        parent = self._parent if self._parent and modifier.exists(self._parent) else ""
+        obj = modifier.create_node("transform", self._node, parent)
+        modifier.add_string_attribute(obj, "description")
+        modifier.add_string_attribute(obj, "extension")
+        modifier.flush()
+        modifier.set_string(obj, "description", self._description)
+        modifier.set_string(obj, "extension", self._extension)
+        modifier.lock(obj, ["rotateAxis", "scale", "shear"])
+        modifier.set_world_matrix(obj, self._m)
+        self._node = modifier.name(obj)
+        return self._node
+
     def get_parent(self):
         """get parent node
 
@@ -396,6 +418,9 @@ class Joint(Transform):
         Returns:
             str: node
         """
+        modifier = BatchModifier.current()
+        if modifier is not None and not modifier.exists(self._node):
+            return self._create_batch(modifier)
         if not cmds.objExists(self._node):
             self._node = cmds.createNode("joint", parent=self._parent, name=self._node)
             cmds.addAttr(self._node, longName="description", dataType="string")
@@ -414,6 +439,33 @@ class Joint(Transform):
         self.set_label(*self.label_args)
         return self._node
 
+    def _create_batch(self, modifier):
+        """BatchModifier 로 joint 를 생성합니다.
+
+        makeIdentity 대신 rotate 를 jointOrient 로 직접 옮깁니다.
+        """
+        parent = self._parent if self._parent and modifier.exists(self._parent) else ""
+        obj = modifier.create_node("joint", self._node, parent)
+        modifier.add_string_attribute(obj, "description")
+        modifier.add_string_attribute(obj, "extension")
+        modifier.flush()
+        modifier.set_string(obj, "description", self._description)
+        modifier.set_string(obj, "extension", self._extension)
+        self._m = list(self._m)
+        modifier.set_world_matrix(obj, self._m, joint_orient=True)
+        modifier.plug(obj, "segmentScaleCompensate").setBool(False)
+        modifier.lock(obj, ["segmentScaleCompensate", "rotateAxis"])
+        inverse_scale = modifier.plug(obj, "inverseScale")
+        if inverse_scale.isDestination:
+            modifier.disconnect(inverse_scale.source(), inverse_scale)
+            modifier.flush()
+        side, label = self.label_args
+        modifier.set_int(obj, "type", 18)
+        modifier.set_int(obj, "side", side)
+        modifier.set_string(obj, "otherType", label)
+        self._node = modifier.name(obj)
+        return self._node
+
     def set_initialize_matrix(self, m):
         """set matrix, set jointOrient
 
@@ -609,6 +661,9 @@ class Controller(Transform):
                 m=ORIGINMATRIX,
             )
             self._npo = ins.create()
+        modifier = BatchModifier.current()
+        if modifier is not None and not modifier.exists(self._node):
+            return self._create_batch(modifier)
         if not cmds.objExists(self._node):
             ins = Transform(
                 parent=self._npo,
@@ -678,6 +733,58 @@ class Controller(Transform):
         [self.add_parent_controller(c) for c in self._parent_controllers]
         return self._npo, self._node
 
+    def _create_batch(self, modifier):
+        """BatchModifier 로 ctl 을 생성합니다.
+
+        shape 교체와 controller tag 는 cmds 를 그대로 사용합니다.
+        """
+        ins = Transform(
+            parent=self._npo,
+            name=self._name,
+            side=self._side,
+            index=self._index,
+            description=self._description,
+            extension=self._extension,
+            m=ORIGINMATRIX,
+        )
+        self._node = ins.create()
+        self.replace_shape(shape=self._shape, color=self._color)
+
+        obj = get_mobject(self._node)
+        npo = get_mobject(self._npo)
+        modifier.plug(obj, "visibility").isKeyable = False
+        modifier.add_bool_attribute(obj, "is_domino_controller")
+        modifier.add_string_attribute(obj, "mirror_controller_name")
+        modifier.add_enum_attribute(
+            obj,
+            "mirror_type",
+            ["orientation", "behavior", "inverseScale"],
+            default_value=1,
+        )
+        modifier.add_message_attribute(obj, "npo")
+        modifier.add_message_attribute(obj, "parent_controllers", multi=True)
+        modifier.add_message_attribute(obj, "child_controllers")
+        modifier.flush()
+        modifier.set_string(obj, "mirror_controller_name", self._mirror_controller)
+        modifier.plug(obj, "rotateOrder").isChannelBox = True
+        for attr in ["translate", "rotate"]:
+            plug = modifier.plug(obj, attr)
+            for i in range(3):
+                plug.child(i).setDouble(0)
+        self._m = list(self._m)
+        modifier.set_world_matrix(npo, self._m)
+        modifier.connect(modifier.plug(npo, "message"), modifier.plug(obj, "npo"))
+        modifier.flush()
+
+        cmds.controller(self._node)
+        if self._parent_controllers:
+            cmds.controller(
+                self._node, self._parent_controllers[0], edit=True, parent=True
+            )
+        cmds.setAttr(f"{self._node}_tag.isHistoricallyInteresting", 0)
+        [self.add_parent_controller(c) for c in self._parent_controllers]
+        return self._npo, self._node
+
     def get_parent(self):
         """get npo parent
 
@@ -828,6 +935,32 @@ class Controller(Transform):
 # endregion
 
 
+# region Geometry data
+# temp node 로 plug 를 읽었을 때의 이름.
+TEMP_GEOMETRY_NAME = "temp1"
+
+
+def get_plug_data(plug):
+    """nurbsCurve, nurbsSurface, mesh 타입 plug 의 data MObject.
+
+    Args:
+        plug (str): node.attr
+
+    Returns:
+        om.MObject: 값이 없다면 None
+    """
+    selection_list = om.MSelectionList()
+    selection_list.add(plug)
+    try:
+        mobj = selection_list.getPlug(0).asMObject()
+    except RuntimeError:
+        return None
+    return None if mobj.isNull() else mobj
+
+
+# endregion
+
+
 # region Curve
 class NurbsCurve:
     """nurbscurve data
@@ -842,19 +975,23 @@ class NurbsCurve:
         >>> newCurve.createFromData()
     """
 
-    def __init__(self, node=None, data=None):
+    def __init__(self, node=None, data=None, plug=None):
         """
 
         Args:
             node (str, optional): curve node. Defaults to None.
             data (dict, optional): curve data. Defaults to None.
+            plug (str, optional): nurbsCurve attribute. Defaults to None.
         """
         self._data = {}
         self._node = ""
+        self._plug = None
         if node:
             self.node = node
         elif data:
             self.data = data
+        elif plug:
+            self.plug = plug
 
     @staticmethod
     def get_fn_curve(shape):
@@ -933,6 +1070,49 @@ class NurbsCurve:
             }
         self._node = n
 
+    @property
+    def plug(self):
+        return self._plug
+
+    @plug.setter
+    def plug(self, p):
+        """nurbsCurve attribute 에서 data 를 구합니다.
+
+        temp node 를 만들지 않고 plug 의 MObject 를 읽습니다.
+        data 는 temp curve 를 연결해서 읽은 것과 같은 형식입니다.
+
+        Args:
+            p (str): node.attr
+        """
+        self._plug = p
+        self._data = {}
+        mobj = get_plug_data(p)
+        if mobj is None:
+            return
+        fn_curve = om.MFnNurbsCurve(mobj)
+        self._data = {
+            "parent_name": "",
+            "curve_name": TEMP_GEOMETRY_NAME,
+            "curve_matrix": list(ORIGINMATRIX),
+            "shapes": {
+                f"{TEMP_GEOMETRY_NAME}Shape": {
+                    "form": fn_curve.form,
+                    "knots": list(fn_curve.knots()),
+                    "degree": fn_curve.degree,
+                    "point": [
+                        list(x)[:-1] for x in fn_curve.cvPositions(om.MSpace.kObject)
+                    ],
+                    "override": False,
+                    "use_rgb": False,
+                    "color_rgb": (0.0, 0.0, 0.0),
+                    "color_index": 0,
+                    "always_draw_on_top": False,
+                    "visibility": True,
+                }
+            },
+            "visibility": True,
+        }
+
     def create_from_data(self):
         """create curve from data
 
@@ -997,13 +1177,16 @@ class NurbsCurve:
 # region Surface
 class NurbsSurface:
 
-    def __init__(self, node=None, data=None):
+    def __init__(self, node=None, data=None, plug=None):
         self._data = {}
         self._node = ""
+        self._plug = None
         if node:
             self.node = node
         elif data:
             self.data = data
+        elif plug:
+            self.plug = plug
 
     @staticmethod
     def get_fn_surface(shape):
@@ -1047,6 +1230,35 @@ class NurbsSurface:
         }
         self._node = n
 
+    @property
+    def plug(self):
+        return self._plug
+
+    @plug.setter
+    def plug(self, p):
+        """nurbsSurface attribute 에서 temp node 없이 data 를 구합니다."""
+        self._plug = p
+        self._data = {}
+        mobj = get_plug_data(p)
+        if mobj is None:
+            return
+        fn_surface = om.MFnNurbsSurface(mobj)
+        self._data = {
+            "parent_name": "",
+            "surface_name": TEMP_GEOMETRY_NAME,
+            "surface_matrix": list(ORIGINMATRIX),
+            "visibility": True,
+            "surface": {
+                "form_u": fn_surface.formInU - 1,
+                "form_v": fn_surface.formInV - 1,
+                "knot_u": list(fn_surface.knotsInU()),
+                "knot_v": list(fn_surface.knotsInV()),
+                "degree_u": fn_surface.degreeInU,
+                "degree_v": fn_surface.degreeInV,
+                "cvs": [tuple(x) for x in fn_surface.cvPositions(om.MSpace.kObject)],
+            },
+        }
+
     def create_from_data(self):
         form = ["open", "closed", "periodic"]
 
@@ -1076,13 +1288,38 @@ class NurbsSurface:
 # region Polygon
 class Mesh:
 
-    def __init__(self, node=None, data=None):
+    def __init__(self, node=None, data=None, plug=None):
         self._data = {}
         self._node = ""
+        self._plug = None
         if node:
             self.node = node
         elif data:
             self.data = data
+        elif plug:
+            self.plug = plug
+
+    @staticmethod
+    def get_mesh_data(fn_mesh):
+        # 꼭짓점 좌표
+        vertices = [list(x) for x in fn_mesh.getPoints(space=om.MSpace.kObject)]
+
+        # face 정의
+        polygon_counts, polygon_connects = fn_mesh.getVertices()
+
+        # UV 좌표 (각 index 별 uvs)
+        u_array, v_array = fn_mesh.getUVs()
+        uv_counts, uv_ids = fn_mesh.getAssignedUVs()
+
+        return {
+            "vertices": vertices,
+            "polygon_counts": list(polygon_counts),
+            "polygon_connects": list(polygon_connects),
+            "u_array": list(u_array),
+            "v_array": list(v_array),
+            "uv_counts": list(uv_counts),
+            "uv_ids": list(uv_ids),
+        }
 
     @staticmethod
     def get_fn_mesh(shape):
@@ -1119,26 +1356,28 @@ class Mesh:
             0
         ]
         fn_mesh = self.get_fn_mesh(shape)
-        # 꼭짓점 좌표
-        vertices = [list(x) for x in fn_mesh.getPoints(space=om.MSpace.kObject)]
-
-        # face 정의
-        polygon_counts, polygon_connects = fn_mesh.getVertices()
+        self._data["mesh"] = self.get_mesh_data(fn_mesh)
+        self._node = n
 
-        # UV 좌표 (각 index 별 uvs)
-        u_array, v_array = fn_mesh.getUVs()
-        uv_counts, uv_ids = fn_mesh.getAssignedUVs()
+    @property
+    def plug(self):
+        return self._plug
 
-        self._data["mesh"] = {
-            "vertices": vertices,
-            "polygon_counts": list(polygon_counts),
-            "polygon_connects": list(polygon_connects),
-            "u_array": list(u_array),
-            "v_array": list(v_array),
-            "uv_counts": list(uv_counts),
-            "uv_ids": list(uv_ids),
+    @plug.setter
+    def plug(self, p):
+        """mesh attribute 에서 temp node 없이 data 를 구합니다."""
+        self._plug = p
+        self._data = {}
+        mobj = get_plug_data(p)
+        if mobj is None:
+            return
+        self._data = {
+            "parent_name": "",
+            "mesh_name": TEMP_GEOMETRY_NAME,
+            "mesh_matrix": list(ORIGINMATRIX),
+            "visibility": True,
+            "mesh": self.get_mesh_data(om.MFnMesh(mobj)),
         }
-        self._node = n
 
     def create_from_data(self):
         data = self._data["mesh"]
@@ -736,3 +736,109 @@ TYPETABLE = {
     "nurbsSurface": NurbsSurface,
     "mesh": Mesh,
 }
+
+
+# region Snapshot
+# GEOMETRY_CLASSES 로 읽는 type.
+GEOMETRY_DATA_TYPES = ("nurbsCurve", "nurbsSurface", "mesh")
+
+
+def get_plug_value(plug, _type):
+    """cmds.getAttr 과 같은 값을 MPlug 에서 읽습니다.
+
+    Args:
+        plug (om.MPlug): multi 가 아닌 plug
+        _type (str): TYPETABLE 의 key
+
+    Returns:
+        int, float, bool, str, list
+    """
+    if _type in ("long", "enum"):
+        return plug.asInt()
+    if _type == "bool":
+        return plug.asBool()
+    if _type == "float":
+        return plug.asDouble()
+    if _type == "doubleAngle":
+        return plug.asMAngle().asUnits(om.MAngle.uiUnit())
+    if _type == "string":
+        # cmds.getAttr 은 값이 없는 string 을 None 으로 돌려줍니다.
+        try:
+            if plug.asMObject().isNull():
+                return None
+        except RuntimeError:
+            return None
+        return plug.asString()
+    if _type == "matrix":
+        try:
+            mobj = plug.asMObject()
+        except RuntimeError:
+            return list(ORIGINMATRIX)
+        if mobj.isNull():
+            return list(ORIGINMATRIX)
+        return list(om.MFnMatrixData(mobj).matrix())
+    return cmds.getAttr(plug.name())
+
+
+def get_matrix_array(plug):
+    """multi matrix plug 의 모든 element 를 MArrayDataHandle 로 한번에 읽습니다.
+
+    element 마다 elementByPhysicalIndex, asMObject 를 호출하지 않습니다.
+    순서는 physical index 순서입니다.
+
+    Args:
+        plug (om.MPlug): multi matrix plug
+
+    Returns:
+        list: [[16 float], ...]
+    """
+    result = []
+    handle = plug.asMDataHandle()
+    try:
+        array = om.MArrayDataHandle(handle)
+        for _ in range(len(array)):
+            result.append(list(array.inputValue().asMatrix()))
+            array.next()
+    finally:
+        plug.destructHandle(handle)
+    return result
+
+
+def snapshot(node, attributes):
+    """node 의 attributes 값을 MFnDependencyNode 하나로 한 번에 읽습니다.
+
+    attribute 마다 cmds.getAttr, multi element 마다 cmds.listAttr, cmds.getAttr 을
+    호출하는 것과 같은 값을 돌려줍니다. nurbsCurve, nurbsSurface, mesh 는 제외합니다.
+    multi matrix 는 get_matrix_array 로 element 를 한번에 읽습니다.
+
+    Args:
+        node (str): rig root
+        attributes (list): component 의 DATA
+
+    Returns:
+        dict: {long_name: value}
+    """
+    selection_list = om.MSelectionList()
+    selection_list.add(node)
+    fn_node = om.MFnDependencyNode(selection_list.getDependNode(0))
+
+    result = {}
+    for attr in attributes:
+        data = attr[attr.long_name]
+        _type = data.get("dataType") or data.get("attributeType")
+        if _type in GEOMETRY_DATA_TYPES:
+            continue
+        plug = fn_node.findPlug(attr.long_name, False)
+        if data["multi"] and _type == "matrix":
+            result[attr.long_name] = get_matrix_array(plug)
+        elif data["multi"]:
+            result[attr.long_name] = [
+                get_plug_value(plug.elementByPhysicalIndex(i), _type)
+                for i in range(plug.numElements())
+            ]
+        else:
+            result[attr.long_name] = get_plug_value(plug, _type)
+    return result
+
+
+# endregion
@@ -0,0 +1,190 @@
+# maya
+from maya import cmds
+
+# domino
+from domino.core import sidecar
+from domino.core.utils import logger, maya_version, bifrost_version
+
+# built-ins
+from pathlib import Path
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+# eviction 기준.
+MAX_CACHE_SIZE = 10 * 1024**3  # 10GB
+MAX_CACHE_AGE = 30 * 24 * 60 * 60  # 30 days
+
+CACHE_EXTENSION = ".mb"
+
+
+def get_cache_dir():
+    """DOMINO_BUILD_CACHE_DIR 또는 temp 디렉토리 아래의 domino_build_cache."""
+    cache_dir = os.getenv("DOMINO_BUILD_CACHE_DIR", None)
+    if not cache_dir:
+        cache_dir = Path(tempfile.gettempdir()) / "domino_build_cache"
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def is_empty_scene():
+    """startup camera 를 제외한 dag node 가 없는지 확인합니다.
+
+    cache 는 빈 scene 에서 build 한 결과만 저장, 사용합니다.
+    """
+    for node in cmds.ls(assemblies=True):
+        cameras = cmds.listRelatives(node, shapes=True, type="camera") or []
+        if cameras and cmds.camera(cameras[0], query=True, startupCamera=True):
+            continue
+        return False
+    return True
+
+
+# region KEY
+def _update_file(h, file_path):
+    h.update(Path(file_path).name.encode("utf-8"))
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+
+
+def get_cache_key(file_path, break_point):
+    """build 결과에 영향을 주는 입력으로 cache key 를 구합니다.
+
+    - .domino 파일, v2 sidecar
+    - .metadata 디렉토리의 모든 파일
+    - custom scripts 파일
+    - domino.component, domino.core 의 source (ui 제외)
+    - maya, bifrost version
+    - break point
+
+    Returns:
+        str: sha256 hex digest
+    """
+    h = hashlib.sha256()
+    path = Path(file_path)
+    _update_file(h, path)
+    sidecar_path = sidecar.get_sidecar_path(path)
+    if sidecar_path.exists():
+        _update_file(h, sidecar_path)
+
+    metadata_dir = path.parent / f"{path.name.split('.')[0]}.metadata"
+    if metadata_dir.exists():
+        for f in sorted(metadata_dir.rglob("*")):
+            if f.is_file():
+                h.update(f.relative_to(metadata_dir).as_posix().encode("utf-8"))
+                _update_file(h, f)
+
+    with open(path, "r") as f:
+        data = json.load(f)
+    for attr in ["pre_custom_scripts", "post_custom_scripts"]:
+        for script in data.get(attr, {}).get("value", []):
+            if script.startswith("*"):
+                script = script[1:]
+            if script and Path(script).exists():
+                _update_file(h, script)
+
+    domino_dir = Path(__file__).parent.parent
+    for package in ["component", "core"]:
+        for source in sorted((domino_dir / package).glob("*.py")):
+            if source.stem.endswith("ui"):
+                continue
+            _update_file(h, source)
+
+    h.update(maya_version().encode("utf-8"))
+    h.update(bifrost_version().encode("utf-8"))
+    h.update(str(break_point).encode("utf-8"))
+    return h.hexdigest()
+
+
+# endregion
+
+
+# region CACHE
+def get(key):
+    """cache 된 scene 파일을 구합니다. 사용한 파일은 mtime 을 갱신합니다.
+
+    Returns:
+        str: file path, 없다면 None
+    """
+    path = get_cache_dir() / f"{key}{CACHE_EXTENSION}"
+    if not path.exists():
+        return
+    os.utime(path, None)
+    return path.as_posix()
+
+
+def store(key):
+    """현재 scene 을 cache 에 저장하고 evict 합니다.
+
+    Returns:
+        str: file path
+    """
+    cache_dir = get_cache_dir()
+    path = cache_dir / f"{key}{CACHE_EXTENSION}"
+    temp_path = cache_dir / f"{key}.{os.getpid()}.tmp{CACHE_EXTENSION}"
+    cmds.file(
+        temp_path.as_posix(),
+        exportAll=True,
+        type="mayaBinary",
+        preserveReferences=True,
+        force=True,
+    )
+    os.replace(temp_path, path)
+    logger.info(f"Store build cache {path.as_posix()}")
+    evict()
+    return path.as_posix()
+
+
+def restore(file_path):
+    """cache 된 scene 을 현재 scene 에 import 합니다."""
+    cmds.file(
+        file_path,
+        i=True,
+        type="mayaBinary",
+        defaultNamespace=True,
+        preserveReferences=True,
+        force=True,
+    )
+    logger.info(f"Restore build cache {file_path}")
+
+
+def evict(max_size=MAX_CACHE_SIZE, max_age=MAX_CACHE_AGE):
+    """오래된 cache 를 지우고 전체 크기가 max_size 를 넘으면 오래 사용하지 않은 순서로 지웁니다.
+
+    Returns:
+        list: 삭제된 file path
+    """
+    now = time.time()
+    files = []
+    removed = []
+    for f in get_cache_dir().glob(f"*{CACHE_EXTENSION}"):
+        stat = f.stat()
+        if now - stat.st_mtime > max_age:
+            f.unlink()
+            removed.append(f.as_posix())
+            continue
+        files.append((stat.st_mtime, stat.st_size, f))
+
+    total_size = sum(x[1] for x in files)
+    for _, size, f in sorted(files):
+        if total_size <= max_size:
+            break
+        f.unlink()
+        total_size -= size
+        removed.append(f.as_posix())
+
+    for f in removed:
+        logger.info(f"Evict build cache {f}")
+    return removed
+
+
+def clear():
+    """모든 cache 를 지웁니다."""
+    return evict(max_size=0, max_age=0)
+
+
+# endregion
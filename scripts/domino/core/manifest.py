@@ -0,0 +1,347 @@
+# maya
+from maya import cmds
+from maya.api import OpenMaya as om
+
+# domino
+from domino.core import weights
+from domino.core.utils import logger
+
+# built-ins
+from pathlib import Path
+import hashlib
+import json
+import os
+import shutil
+import struct
+
+import numpy as np
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+# region HASH
+def hash_file(file_path):
+    h = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def hash_data(data):
+    """json 으로 저장되는 data 의 hash."""
+    return hashlib.sha1(
+        json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def _data_bytes(mobj):
+    """typed attribute data 를 hash 할 bytes 로 변환합니다."""
+    if mobj.hasFn(om.MFn.kPointArrayData):
+        values = [tuple(p) for p in om.MFnPointArrayData(mobj).array()]
+    elif mobj.hasFn(om.MFn.kComponentListData):
+        fn_components = om.MFnComponentListData(mobj)
+        values = []
+        for i in range(fn_components.length()):
+            component = fn_components.get(i)
+            if component.hasFn(om.MFn.kSingleIndexedComponent):
+                values.append(
+                    list(om.MFnSingleIndexedComponent(component).getElements())
+                )
+            elif component.hasFn(om.MFn.kDoubleIndexedComponent):
+                values.append(
+                    list(om.MFnDoubleIndexedComponent(component).getElements())
+                )
+    elif mobj.hasFn(om.MFn.kDoubleArrayData):
+        values = list(om.MFnDoubleArrayData(mobj).array())
+    elif mobj.hasFn(om.MFn.kIntArrayData):
+        values = list(om.MFnIntArrayData(mobj).array())
+    elif mobj.hasFn(om.MFn.kMeshData):
+        fn_mesh = om.MFnMesh(mobj)
+        counts, connects = fn_mesh.getVertices()
+        values = [
+            [tuple(p) for p in fn_mesh.getPoints()],
+            list(counts),
+            list(connects),
+        ]
+    elif mobj.hasFn(om.MFn.kNurbsSurfaceData):
+        values = [tuple(p) for p in om.MFnNurbsSurface(mobj).cvPositions()]
+    elif mobj.hasFn(om.MFn.kNurbsCurveData):
+        values = [tuple(p) for p in om.MFnNurbsCurve(mobj).cvPositions()]
+    else:
+        return b""
+    return repr(values).encode("utf-8")
+
+
+def _update_plug(h, plug):
+    """plug 와 하위 element, child 의 값을 hash 에 추가합니다."""
+    if plug.isArray:
+        for i in plug.getExistingArrayAttributeIndices():
+            h.update(f"[{i}]".encode("utf-8"))
+            _update_plug(h, plug.elementByLogicalIndex(i))
+        return
+    if plug.isCompound:
+        for i in range(plug.numChildren()):
+            _update_plug(h, plug.child(i))
+        return
+    attr = plug.attribute()
+    if attr.hasFn(om.MFn.kMessageAttribute):
+        return
+    if attr.hasFn(om.MFn.kTypedAttribute) or attr.hasFn(om.MFn.kGenericAttribute):
+        try:
+            mobj = plug.asMObject()
+        except RuntimeError:
+            return
+        if not mobj.isNull():
+            h.update(_data_bytes(mobj))
+        return
+    try:
+        h.update(struct.pack("<d", plug.asDouble()))
+    except RuntimeError:
+        pass
+
+
+def update_plug(h, plug_name):
+    """이름으로 plug 를 찾아 hash 에 추가합니다. plug 가 없다면 무시합니다."""
+    selection_list = om.MSelectionList()
+    try:
+        selection_list.add(plug_name)
+    except RuntimeError:
+        return
+    h.update(plug_name.encode("utf-8"))
+    _update_plug(h, selection_list.getPlug(0))
+
+
+def update_weights(h, deformer, obj):
+    """obj 의 weight 를 배열로 한번에 읽어 hash 에 추가합니다.
+
+    element 마다 MPlug 를 만들지 않으므로 dense skinCluster 에서도 빠릅니다.
+    """
+    try:
+        index = weights.get_geometry_index(deformer, obj)
+    except RuntimeError:
+        return
+    if cmds.nodeType(deformer) == "skinCluster":
+        if cmds.nodeType(obj) not in weights.SUPPORTED_TYPES:
+            # getWeights 의 component 를 만들 수 없는 geometry 는 plug 로 읽습니다.
+            return update_plug(h, f"{deformer}.weightList[{index}]")
+        values, blend_weights = weights.read_skin_weights(deformer, obj)
+        h.update(values.tobytes())
+        h.update(blend_weights.tobytes())
+        return
+    for layer, plug in weights.get_layer_plugs(deformer, index).items():
+        existing = plug.getExistingArrayAttributeIndices()
+        count = max(existing) + 1 if existing else 0
+        h.update(layer.encode("utf-8"))
+        h.update(weights.read_plug_weights(plug, count).tobytes())
+
+
+def hash_blendshape(bs):
+    """export_blendshape 결과에 영향을 주는 원본 geometry, target 의 hash.
+
+    nurbsSurface 는 deform 된 cv 위치를 export 하므로 hash 하지 않습니다.
+
+    Returns:
+        str: hash, 계산할 수 없다면 None
+    """
+    geo = cmds.deformer(bs, geometry=True, query=True)[0]
+    if cmds.nodeType(geo) != "mesh":
+        return None
+    h = hashlib.sha1()
+    h.update(geo.encode("utf-8"))
+    h.update(repr(cmds.aliasAttr(bs, query=True)).encode("utf-8"))
+    for attr in ["originalGeometry", "inputTarget", "weight", "envelope"]:
+        update_plug(h, f"{bs}.{attr}")
+    return h.hexdigest()
+
+
+def hash_deformer(deformer, attributes):
+    """export_weight 결과에 영향을 주는 geometry topology, weights, attributes 의 hash.
+
+    .npz 로 export 하는 deformer 는 .npz 에 저장되는 입력 geometry 의 point, triangle 과
+    weights.FORMAT_VERSION 도 포함합니다. topology 가 같은 modeling 수정이나
+    이전 format 의 파일을 그대로 사용하지 않습니다.
+    weight 는 update_weights 로, attributes 는 update_plug 로 hash 합니다.
+
+    Args:
+        deformer (str): deformer
+        attributes (list): deformerWeights 로 export 하는 attribute
+
+    Returns:
+        str: hash
+    """
+    h = hashlib.sha1()
+    deformer_type = cmds.nodeType(deformer)
+    h.update(deformer_type.encode("utf-8"))
+    is_supported = weights.is_supported(deformer)
+    if is_supported:
+        h.update(f"npz{weights.FORMAT_VERSION}".encode("utf-8"))
+    for obj in cmds.deformer(deformer, geometry=True, query=True) or []:
+        h.update(obj.encode("utf-8"))
+        if cmds.nodeType(obj) == "mesh":
+            selection_list = om.MSelectionList()
+            selection_list.add(obj)
+            counts, connects = om.MFnMesh(selection_list.getDagPath(0)).getVertices()
+            h.update(repr((list(counts), list(connects))).encode("utf-8"))
+        if is_supported:
+            points, triangles = weights.get_input_points(deformer, obj)
+            h.update(np.ascontiguousarray(points, dtype=np.float32).tobytes())
+            if triangles is not None:
+                h.update(np.ascontiguousarray(triangles, dtype=np.int32).tobytes())
+        update_weights(h, deformer, obj)
+    if deformer_type == "skinCluster":
+        influences = cmds.skinCluster(deformer, query=True, influence=True) or []
+        h.update(repr(influences).encode("utf-8"))
+    for attr in attributes:
+        update_plug(h, f"{deformer}.{attr}")
+    if deformer_type == "blendShape":
+        update_plug(h, f"{deformer}.inputTarget")
+    return h.hexdigest()
+
+
+# endregion
+
+
+# region MANIFEST
+def read(metadata_dir):
+    path = Path(metadata_dir) / MANIFEST_NAME
+    if not path.exists():
+        return {"version": MANIFEST_VERSION, "artifacts": {}}
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (ValueError, OSError):
+        logger.warning(f"{path} 를 읽을 수 없습니다.")
+        return {"version": MANIFEST_VERSION, "artifacts": {}}
+
+
+def verify(metadata_dir, full=False):
+    """manifest 에 기록된 파일이 존재하고 크기가 같은지 확인합니다.
+
+    Args:
+        metadata_dir (str): .metadata 디렉토리
+        full (bool, optional): True 라면 sha1 까지 비교합니다. Defaults to False.
+
+    Returns:
+        list: 문제가 있는 파일의 메세지
+    """
+    metadata_dir = Path(metadata_dir)
+    problems = []
+    for key, artifact in read(metadata_dir)["artifacts"].items():
+        for rel, info in artifact["files"].items():
+            path = metadata_dir / rel
+            if not path.exists():
+                problems.append(f"{key}: {rel} 가 없습니다.")
+            elif path.stat().st_size != info["size"]:
+                problems.append(f"{key}: {rel} 의 크기가 다릅니다.")
+            elif full and hash_file(path) != info["sha1"]:
+                problems.append(f"{key}: {rel} 의 hash 가 다릅니다.")
+    return problems
+
+
+class Manifest:
+    """metadata artifact 별 source hash 와 파일 hash 를 기록합니다.
+
+    source hash 가 이전 manifest 와 같다면 export 하지 않고 이전 파일을 사용합니다.
+    이전 버전 디렉토리의 파일은 hard link(불가능하다면 copy) 합니다.
+
+    Examples:
+        >>> manifest = Manifest("D:/rig_v002.metadata", "D:/rig_v001.metadata")
+        >>> manifest.export(
+        >>>     "space", ["space/space.smf"], hash_data(data), partial(export, path)
+        >>> )
+        >>> manifest.write()
+    """
+
+    def __init__(self, metadata_dir, previous_dir=None):
+        self.metadata_dir = Path(metadata_dir)
+        self.source_dir = self.metadata_dir
+        previous = read(self.metadata_dir)
+        if previous_dir and Path(previous_dir) != self.metadata_dir:
+            if (Path(previous_dir) / MANIFEST_NAME).exists():
+                self.source_dir = Path(previous_dir)
+                previous = read(previous_dir)
+        self.previous = previous["artifacts"]
+        self.artifacts = {}
+        self._pending = {}
+
+    def _reuse(self, artifact, link):
+        for rel, info in artifact["files"].items():
+            source = self.source_dir / rel
+            if not source.exists() or source.stat().st_size != info["size"]:
+                return False
+        if self.source_dir == self.metadata_dir:
+            return True
+        for rel in artifact["files"]:
+            source = self.source_dir / rel
+            target = self.metadata_dir / rel
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if target.exists():
+                target.unlink()
+            try:
+                if not link:
+                    raise OSError
+                os.link(source, target)
+            except OSError:
+                shutil.copy2(source, target)
+        return True
+
+    def export(self, key, files, source_hash, export_func, link=True):
+        """source hash 가 같다면 이전 파일을 사용하고 다르다면 export_func 를 실행합니다.
+
+        Args:
+            key (str): artifact key
+            files (list): export_func 가 만드는 파일. metadata 디렉토리 기준 상대 경로.
+            source_hash (str): source data 의 hash. None 이라면 항상 export 합니다.
+            export_func (callable): export 함수
+            link (bool, optional): 이전 버전 파일을 hard link 합니다.
+                직접 수정하는 파일(custom scripts)은 False 로 copy 합니다. Defaults to True.
+
+        Returns:
+            bool: export 했다면 True
+        """
+        previous = self.previous.get(key)
+        if (
+            source_hash is not None
+            and previous
+            and previous["source_hash"] == source_hash
+            and sorted(previous["files"]) == sorted(files)
+            and self._reuse(previous, link)
+        ):
+            self.artifacts[key] = previous
+            logger.info(f"Skip export {key}, unchanged")
+            return False
+
+        # hard link 된 이전 버전 파일을 덮어쓰지 않도록 link 를 끊습니다.
+        for rel in files:
+            path = self.metadata_dir / rel
+            if path.exists() and path.stat().st_nlink > 1:
+                path.unlink()
+        export_func()
+        # export_func 가 background 에서 파일을 쓸 수 있으므로 파일 hash 는 write 에서 구합니다.
+        self.artifacts[key] = {"source_hash": source_hash, "files": {}}
+        self._pending[key] = files
+        return True
+
+    def write(self):
+        """export 된 파일의 hash 를 구하고 manifest 를 저장합니다."""
+        for key, files in self._pending.items():
+            for rel in files:
+                path = self.metadata_dir / rel
+                if not path.exists():
+                    continue
+                self.artifacts[key]["files"][rel] = {
+                    "sha1": hash_file(path),
+                    "size": path.stat().st_size,
+                }
+        self._pending = {}
+        path = self.metadata_dir / MANIFEST_NAME
+        with open(path, "w") as f:
+            json.dump(
+                {"version": MANIFEST_VERSION, "artifacts": self.artifacts}, f, indent=2
+            )
+        return path.as_posix()
+
+
+# endregion
@@ -0,0 +1,183 @@
+# maya
+from maya.api import OpenMaya as om
+
+# built-ins
+import contextlib
+
+
+def get_mobject(name):
+    """이름으로 MObject 를 구합니다. 존재하지 않으면 None 을 return 합니다."""
+    selection_list = om.MSelectionList()
+    try:
+        selection_list.add(name)
+    except RuntimeError:
+        return None
+    return selection_list.getDependNode(0)
+
+
+class BatchModifier:
+    """Transform, Joint, Controller 생성을 OpenMaya modifier 로 모아서 실행합니다.
+
+    cmds.createNode / addAttr / setAttr / connectAttr 를 하나씩 호출하는 대신
+    node 생성, attribute 추가, connection 을 MDagModifier 에 모아두고
+    flush 할 때 한번에 실행합니다.
+    값 설정과 lock 은 command 를 거치지 않고 MPlug 로 직접 적용합니다.
+
+    modifier 는 batch() 블럭 하나(보통 component 하나)가 공유합니다.
+    MDagModifier.doIt 은 이전 doIt 이후에 추가된 operation 만 실행하므로
+    생성 직후 이름으로 node 에 접근해야 하는 create() 들은 flush 로
+    중간 결과를 반영하고, 블럭이 끝날 때 남은 operation 을 commit 합니다.
+
+    modifier 로 실행된 operation 은 maya undo queue 에 기록되지 않습니다.
+    rollback 이 필요하면 undo() 를 사용합니다.
+
+    Examples:
+        >>> with batch():
+        >>>     component.rig()
+    """
+
+    _current = None
+
+    def __init__(self):
+        self._modifier = om.MDagModifier()
+        self._pending = False
+
+    @classmethod
+    def current(cls):
+        return cls._current
+
+    # region -    BatchModifier / query
+    @staticmethod
+    def exists(name):
+        return get_mobject(name) is not None
+
+    @staticmethod
+    def name(obj):
+        if obj.hasFn(om.MFn.kDagNode):
+            return om.MFnDagNode(obj).partialPathName()
+        return om.MFnDependencyNode(obj).name()
+
+    @staticmethod
+    def plug(obj, attr):
+        return om.MFnDependencyNode(obj).findPlug(attr, False)
+
+    # endregion
+
+    # region -    BatchModifier / modifier operation
+    def create_node(self, node_type, name, parent=""):
+        parent_obj = get_mobject(parent) if parent else None
+        if parent_obj is None:
+            obj = self._modifier.createNode(node_type)
+        else:
+            obj = self._modifier.createNode(node_type, parent_obj)
+        self._modifier.renameNode(obj, name)
+        self._pending = True
+        return obj
+
+    def add_string_attribute(self, obj, long_name):
+        fn_attr = om.MFnTypedAttribute()
+        attr = fn_attr.create(long_name, long_name, om.MFnData.kString)
+        self._modifier.addAttribute(obj, attr)
+        self._pending = True
+
+    def add_bool_attribute(self, obj, long_name, keyable=False, default_value=0):
+        fn_attr = om.MFnNumericAttribute()
+        attr = fn_attr.create(
+            long_name, long_name, om.MFnNumericData.kBoolean, default_value
+        )
+        fn_attr.keyable = keyable
+        self._modifier.addAttribute(obj, attr)
+        self._pending = True
+
+    def add_enum_attribute(
+        self, obj, long_name, enum_names, keyable=False, default_value=0
+    ):
+        fn_attr = om.MFnEnumAttribute()
+        attr = fn_attr.create(long_name, long_name, default_value)
+        for i, enum_name in enumerate(enum_names):
+            fn_attr.addField(enum_name, i)
+        fn_attr.keyable = keyable
+        self._modifier.addAttribute(obj, attr)
+        self._pending = True
+
+    def add_message_attribute(self, obj, long_name, multi=False):
+        fn_attr = om.MFnMessageAttribute()
+        attr = fn_attr.create(long_name, long_name)
+        fn_attr.array = multi
+        self._modifier.addAttribute(obj, attr)
+        self._pending = True
+
+    def connect(self, source, destination):
+        self._modifier.connect(source, destination)
+        self._pending = True
+
+    def disconnect(self, source, destination):
+        self._modifier.disconnect(source, destination)
+        self._pending = True
+
+    def flush(self):
+        if self._pending:
+            self._modifier.doIt()
+            self._pending = False
+
+    def undo(self):
+        self.flush()
+        self._modifier.undoIt()
+
+    # endregion
+
+    # region -    BatchModifier / direct plug
+    def set_string(self, obj, attr, value):
+        self.plug(obj, attr).setString(str(value))
+
+    def set_int(self, obj, attr, value):
+        self.plug(obj, attr).setInt(int(value))
+
+    def lock(self, obj, attrs):
+        for attr in attrs:
+            self.plug(obj, attr).isLocked = True
+
+    def set_world_matrix(self, obj, m, joint_orient=False):
+        """cmds.xform(matrix=m, worldSpace=True) 와 같은 결과를 적용합니다.
+
+        joint_orient 가 True 라면 makeIdentity(apply=True) 처럼
+        rotate 를 jointOrient 로 옮기고 scale 을 1 로 초기화 합니다.
+        """
+        dag_path = om.MDagPath.getAPathTo(obj)
+        local_m = om.MMatrix(list(m)) * dag_path.exclusiveMatrixInverse()
+        transformation = om.MTransformationMatrix(local_m)
+        if joint_orient:
+            fn_joint = om.MFnTransform(dag_path)
+            fn_joint.setTranslation(
+                transformation.translation(om.MSpace.kTransform),
+                om.MSpace.kTransform,
+            )
+            fn_joint.setRotation(om.MQuaternion(), om.MSpace.kTransform)
+            fn_joint.setScale([1, 1, 1])
+            rotation = transformation.rotation(asQuaternion=False)
+            self.plug(obj, "jointOrientX").setMAngle(om.MAngle(rotation.x))
+            self.plug(obj, "jointOrientY").setMAngle(om.MAngle(rotation.y))
+            self.plug(obj, "jointOrientZ").setMAngle(om.MAngle(rotation.z))
+            return
+        om.MFnTransform(dag_path).setTransformation(transformation)
+
+    # endregion
+
+
+@contextlib.contextmanager
+def batch():
+    """블럭 안의 Transform, Joint, Controller 생성을 BatchModifier 로 실행합니다.
+
+    이미 batch 블럭 안이라면 바깥 modifier 를 그대로 사용합니다.
+    """
+    if BatchModifier._current is not None:
+        yield BatchModifier._current
+        return
+
+    modifier = BatchModifier()
+    BatchModifier._current = modifier
+    try:
+        yield modifier
+        modifier.flush()
+    finally:
+        BatchModifier._current = None
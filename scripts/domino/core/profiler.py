@@ -0,0 +1,187 @@
+# maya
+from maya import cmds
+from maya.api import OpenMaya as om
+
+# domino
+from domino.core.utils import logger, maya_version
+
+# built-ins
+from pathlib import Path
+import contextlib
+import datetime
+import functools
+import json
+import time
+
+# profile.json 에 남길 build 기록 수.
+HISTORY_COUNT = 20
+
+
+class Profiler:
+    """build 의 stage 별 시간, cmds 호출 수, 생성된 node 수를 기록합니다.
+
+    start 시 maya.cmds 의 command 를 호출 수를 세는 wrapper 로 교체하고
+    node added callback 을 추가합니다. stop 시 원래대로 되돌립니다.
+    stage 는 중첩될 수 있으며 상위 stage 의 값은 하위 stage 를 포함합니다.
+
+    Examples:
+        >>> profiler = Profiler()
+        >>> profiler.start()
+        >>> with profiler.stage("rig", category="component"):
+        >>>     component.rig()
+        >>> profiler.stop()
+        >>> profiler.write("D:/test.domino")
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.events = []
+        self.cmds_calls = 0
+        self.nodes_created = 0
+        self._depth = 0
+        self._origin = 0.0
+        self._originals = {}
+        self._callback_id = None
+
+    # region -    Profiler / hook
+    def _wrap(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            self.cmds_calls += 1
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    def _cb_node_added(self, *args):
+        self.nodes_created += 1
+
+    def start(self):
+        if not self.enabled or self._callback_id is not None:
+            return
+        self._origin = time.perf_counter()
+        for name in dir(cmds):
+            if name.startswith("_"):
+                continue
+            func = getattr(cmds, name)
+            if not callable(func):
+                continue
+            self._originals[name] = func
+            setattr(cmds, name, self._wrap(func))
+        self._callback_id = om.MDGMessage.addNodeAddedCallback(
+            self._cb_node_added, "dependNode"
+        )
+
+    def stop(self):
+        if self._callback_id is None:
+            return
+        for name, func in self._originals.items():
+            setattr(cmds, name, func)
+        self._originals = {}
+        om.MMessage.removeCallback(self._callback_id)
+        self._callback_id = None
+        self.events.append(
+            {
+                "name": "build",
+                "category": "build",
+                "start": 0.0,
+                "duration": time.perf_counter() - self._origin,
+                "depth": 0,
+                "cmds_calls": self.cmds_calls,
+                "nodes_created": self.nodes_created,
+            }
+        )
+
+    # endregion
+
+    @contextlib.contextmanager
+    def stage(self, name, category="stage"):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        cmds_calls = self.cmds_calls
+        nodes_created = self.nodes_created
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.events.append(
+                {
+                    "name": name,
+                    "category": category,
+                    "start": start - self._origin,
+                    "duration": time.perf_counter() - start,
+                    "depth": self._depth + 1,
+                    "cmds_calls": self.cmds_calls - cmds_calls,
+                    "nodes_created": self.nodes_created - nodes_created,
+                }
+            )
+
+    # region -    Profiler / report
+    def report(self):
+        return {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "maya_version": maya_version(),
+            "stages": sorted(self.events, key=lambda x: (x["start"], x["depth"])),
+        }
+
+    def chrome_trace(self):
+        """chrome://tracing, perfetto 에서 열 수 있는 trace event 형식."""
+        trace_events = []
+        for event in self.events:
+            trace_events.append(
+                {
+                    "name": event["name"],
+                    "cat": event["category"],
+                    "ph": "X",
+                    "ts": event["start"] * 1e6,
+                    "dur": event["duration"] * 1e6,
+                    "pid": 0,
+                    "tid": 0,
+                    "args": {
+                        "cmds_calls": event["cmds_calls"],
+                        "nodes_created": event["nodes_created"],
+                    },
+                }
+            )
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def log(self):
+        stages = [x for x in self.events if x["category"] != "build"]
+        for event in sorted(stages, key=lambda x: x["duration"], reverse=True)[:10]:
+            logger.info(
+                f"{event['name']:<40}{event['duration']:>10.4f}s"
+                f"{event['cmds_calls']:>10} cmds{event['nodes_created']:>10} nodes"
+            )
+
+    def write(self, file_path):
+        """.domino 파일 옆에 profile.json, trace.json 을 저장합니다.
+
+        profile.json 은 최근 HISTORY_COUNT 번의 build 기록을 유지합니다.
+
+        Returns:
+            tuple: profile path, trace path
+        """
+        path = Path(file_path)
+        name = path.name.split(".")[0]
+        profile_path = path.parent / f"{name}.profile.json"
+        trace_path = path.parent / f"{name}.trace.json"
+
+        history = []
+        if profile_path.exists():
+            try:
+                with open(profile_path, "r") as f:
+                    history = json.load(f).get("history", [])
+            except (ValueError, OSError):
+                logger.warning(f"{profile_path} 를 읽을 수 없습니다. 새로 저장합니다.")
+        history.append(self.report())
+        with open(profile_path, "w") as f:
+            json.dump({"history": history[-HISTORY_COUNT:]}, f, indent=2)
+        with open(trace_path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+        logger.info(f"Profile {profile_path.as_posix()}")
+        logger.info(f"Trace {trace_path.as_posix()}")
+        return profile_path.as_posix(), trace_path.as_posix()
+
+    # endregion
@@ -0,0 +1,305 @@
+"""topology 가 다른 geometry 로 point 별 값(weight) 을 옮깁니다.
+
+maya 에 의존하지 않으며 numpy 배열만 사용합니다.
+저장된 point 로 KDTree 를 만들고 새 point 마다 가장 가까운 point(nearest) 를 찾거나
+가까운 point 에 연결된 triangle 중 가장 가까운 triangle 의 barycentric 좌표로
+보간(barycentric) 합니다.
+
+    indices, weights = get_mapping(source_points, target_points, triangles)
+    values = remap(source_values, indices, weights)
+
+Examples:
+    >>> tree = KDTree(points)
+    >>> distances, indices = tree.query(other_points)
+"""
+
+# built-ins
+import numpy as np
+
+NEAREST = "nearest"
+BARYCENTRIC = "barycentric"
+MODES = (NEAREST, BARYCENTRIC)
+
+
+# region KDTREE
+class KDTree:
+    """point 배열의 정적 KDTree.
+
+    node 는 배열로 저장하며 query 는 (query, node) 쌍의 frontier 를 level 마다
+    한번에 처리합니다. 가장 가까운 point 하나만 찾습니다.
+
+    Args:
+        points (np.ndarray): (n, dimension) 배열
+        leaf_size (int, optional): leaf 의 최대 point 수. Defaults to 16.
+    """
+
+    def __init__(self, points, leaf_size=16):
+        self.points = np.asarray(points, dtype=np.float64)
+        if self.points.ndim != 2 or not len(self.points):
+            raise ValueError(
+                "points 는 비어있지 않은 (n, dimension) 배열이어야 합니다."
+            )
+        self.leaf_size = leaf_size
+        self._build()
+
+    def _build(self):
+        points = self.points
+        order = np.arange(len(points))
+        lower, upper, axes, splits, lefts, rights, leaves = [], [], [], [], [], [], []
+        ranges = [(0, len(points))]
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            start, stop = ranges[node]
+            members = order[start:stop]
+            node_points = points[members]
+            low, high = node_points.min(axis=0), node_points.max(axis=0)
+            for values, value in ((lower, low), (upper, high)):
+                if len(values) <= node:
+                    values.extend([None] * (node + 1 - len(values)))
+                values[node] = value
+            for values in (axes, splits, lefts, rights, leaves):
+                if len(values) <= node:
+                    values.extend([-1] * (node + 1 - len(values)))
+            if stop - start <= self.leaf_size:
+                leaves[node] = start
+                continue
+            axis = int(np.argmax(high - low))
+            mid = (start + stop) // 2
+            partition = np.argpartition(node_points[:, axis], mid - start)
+            order[start:stop] = members[partition]
+            axes[node] = axis
+            splits[node] = points[order[mid], axis]
+            lefts[node], rights[node] = len(ranges), len(ranges) + 1
+            ranges.extend([(start, mid), (mid, stop)])
+            stack.extend([lefts[node], rights[node]])
+
+        self.order = order
+        self.lower = np.array(lower)
+        self.upper = np.array(upper)
+        self.axis = np.array(axes, dtype=np.int64)
+        self.split = np.array(splits, dtype=np.float64)
+        self.left = np.array(lefts, dtype=np.int64)
+        self.right = np.array(rights, dtype=np.int64)
+        # leaf node -> (leaf_size,) point index, 빈 자리는 -1
+        self.leaf_row = np.full(len(ranges), -1, dtype=np.int64)
+        leaf_nodes = [i for i, x in enumerate(leaves) if x >= 0]
+        self.leaf_points = np.full((len(leaf_nodes), self.leaf_size), -1, np.int64)
+        for row, node in enumerate(leaf_nodes):
+            start, stop = ranges[node]
+            self.leaf_row[node] = row
+            self.leaf_points[row, : stop - start] = order[start:stop]
+
+    def _search_leaves(self, queries, q, nodes, best_d, best_i):
+        members = self.leaf_points[self.leaf_row[nodes]]
+        valid = members >= 0
+        candidates = self.points[np.where(valid, members, 0)]
+        d = ((candidates - queries[q][:, None, :]) ** 2).sum(axis=-1)
+        d[~valid] = np.inf
+        column = d.argmin(axis=1)
+        rows = np.arange(len(q))
+        d_min, i_min = d[rows, column], members[rows, column]
+        # 같은 query 의 여러 leaf 중 가장 가까운 것만 사용합니다.
+        order = np.lexsort((d_min, q))
+        first = np.r_[True, q[order][1:] != q[order][:-1]]
+        order = order[first]
+        better = d_min[order] < best_d[q[order]]
+        order = order[better]
+        best_d[q[order]] = d_min[order]
+        best_i[q[order]] = i_min[order]
+
+    def _query(self, queries):
+        count = len(queries)
+        best_d = np.full(count, np.inf)
+        best_i = np.full(count, -1, dtype=np.int64)
+
+        # query 가 속한 leaf 로 내려가 거리의 상한을 구합니다.
+        node = np.zeros(count, dtype=np.int64)
+        internal = np.flatnonzero(self.left[node] >= 0)
+        while len(internal):
+            n = node[internal]
+            go_right = queries[internal, self.axis[n]] >= self.split[n]
+            node[internal] = np.where(go_right, self.right[n], self.left[n])
+            internal = internal[self.left[node[internal]] >= 0]
+        self._search_leaves(queries, np.arange(count), node, best_d, best_i)
+
+        # 상한보다 가까울 수 있는 node 만 방문합니다.
+        q = np.arange(count)
+        nodes = np.zeros(count, dtype=np.int64)
+        while len(q):
+            p = queries[q]
+            gap = np.maximum(self.lower[nodes] - p, 0.0) + np.maximum(
+                p - self.upper[nodes], 0.0
+            )
+            keep = (gap**2).sum(axis=1) < best_d[q]
+            q, nodes = q[keep], nodes[keep]
+            leaf = self.left[nodes] < 0
+            if leaf.any():
+                self._search_leaves(queries, q[leaf], nodes[leaf], best_d, best_i)
+            q, nodes = q[~leaf], nodes[~leaf]
+            q = np.concatenate([q, q])
+            nodes = np.concatenate([self.left[nodes], self.right[nodes]])
+        return np.sqrt(best_d), best_i
+
+    def query(self, points, chunk_size=16384):
+        """가장 가까운 point.
+
+        Args:
+            points (np.ndarray): (m, dimension) 배열
+            chunk_size (int, optional): 한번에 검색하는 query 수. Defaults to 16384.
+
+        Returns:
+            tuple: (distances (m,), indices (m,))
+        """
+        points = np.asarray(points, dtype=np.float64)
+        distances = np.empty(len(points))
+        indices = np.empty(len(points), dtype=np.int64)
+        for start in range(0, len(points), chunk_size):
+            stop = start + chunk_size
+            distances[start:stop], indices[start:stop] = self._query(points[start:stop])
+        return distances, indices
+
+
+# endregion
+
+
+# region TRIANGLE
+def get_adjacency(triangles, point_count):
+    """point 에 연결된 triangle 의 CSR (indptr, triangle index)."""
+    flat = triangles.ravel()
+    indptr = np.zeros(point_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(flat, minlength=point_count), out=indptr[1:])
+    order = np.argsort(flat, kind="stable")
+    return indptr, (order // 3).astype(np.int64)
+
+
+def closest_point_on_triangles(points, a, b, c):
+    """point 마다 triangle (a, b, c) 위의 가장 가까운 점의 barycentric 좌표.
+
+    Real-Time Collision Detection(Ericson) 의 ClosestPtPointTriangle 을 배열로 계산합니다.
+
+    Returns:
+        np.ndarray: (n, 3) barycentric 좌표
+    """
+    ab, ac = b - a, c - a
+    ap, bp, cp = points - a, points - b, points - c
+    d1, d2 = (ab * ap).sum(1), (ac * ap).sum(1)
+    d3, d4 = (ab * bp).sum(1), (ac * bp).sum(1)
+    d5, d6 = (ab * cp).sum(1), (ac * cp).sum(1)
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        denom = va + vb + vc
+        v = np.where(denom != 0, vb / denom, 0.0)
+        w = np.where(denom != 0, vc / denom, 0.0)
+        bary = np.stack([1.0 - v - w, v, w], axis=1)
+
+        # Ericson 의 검사 순서의 역순으로 덮어써 앞의 검사가 우선합니다.
+        t = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        mask = (va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0)
+        bary[mask] = np.stack([np.zeros_like(t), 1.0 - t, t], axis=1)[mask]
+
+        t = d2 / (d2 - d6)
+        mask = (vb <= 0) & (d2 >= 0) & (d6 <= 0)
+        bary[mask] = np.stack([1.0 - t, np.zeros_like(t), t], axis=1)[mask]
+
+        bary[(d6 >= 0) & (d5 <= d6)] = (0.0, 0.0, 1.0)
+
+        t = d1 / (d1 - d3)
+        mask = (vc <= 0) & (d1 >= 0) & (d3 <= 0)
+        bary[mask] = np.stack([1.0 - t, t, np.zeros_like(t)], axis=1)[mask]
+
+    bary[(d3 >= 0) & (d4 <= d3)] = (0.0, 1.0, 0.0)
+    bary[(d1 <= 0) & (d2 <= 0)] = (1.0, 0.0, 0.0)
+    return np.nan_to_num(bary)
+
+
+def get_triangle_mapping(points, source_points, triangles, nearest):
+    """nearest point 에 연결된 triangle 중 가장 가까운 triangle 의 barycentric 좌표.
+
+    연결된 triangle 이 없는 point 는 nearest point 를 사용합니다.
+
+    Returns:
+        tuple: (indices (n, 3), weights (n, 3))
+    """
+    count = len(points)
+    indices = np.repeat(nearest[:, None], 3, axis=1)
+    weights = np.zeros((count, 3))
+    weights[:, 0] = 1.0
+
+    indptr, adjacency = get_adjacency(triangles, len(source_points))
+    counts = indptr[nearest + 1] - indptr[nearest]
+    pair_point = np.repeat(np.arange(count), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    pair_triangle = adjacency[np.repeat(indptr[nearest], counts) + offsets]
+    if not len(pair_point):
+        return indices, weights
+
+    corners = triangles[pair_triangle]
+    a, b, c = (source_points[corners[:, i]] for i in range(3))
+    p = points[pair_point]
+    bary = closest_point_on_triangles(p, a, b, c)
+    closest = bary[:, :1] * a + bary[:, 1:2] * b + bary[:, 2:] * c
+    distances = ((closest - p) ** 2).sum(axis=1)
+
+    # point 마다 가장 가까운 triangle 하나
+    order = np.lexsort((distances, pair_point))
+    first = np.r_[True, pair_point[order][1:] != pair_point[order][:-1]]
+    order = order[first]
+    indices[pair_point[order]] = corners[order]
+    weights[pair_point[order]] = bary[order]
+    return indices, weights
+
+
+# endregion
+
+
+# region REMAP
+def get_mapping(source_points, target_points, triangles=None, mode=BARYCENTRIC):
+    """target point 마다 source point 3개의 index 와 weight.
+
+    Args:
+        source_points (np.ndarray): (n, 3) 저장된 point
+        target_points (np.ndarray): (m, 3) 새 point
+        triangles (np.ndarray, optional): (t, 3) source 의 triangle.
+            없다면 nearest 를 사용합니다. Defaults to None.
+        mode (str, optional): "nearest" 또는 "barycentric". Defaults to "barycentric".
+
+    Returns:
+        tuple: (indices (m, 3), weights (m, 3)) weight 의 합은 1 입니다.
+    """
+    if mode not in MODES:
+        raise ValueError(f"{mode} 는 {MODES} 중 하나여야 합니다.")
+    source_points = np.asarray(source_points, dtype=np.float64)
+    target_points = np.asarray(target_points, dtype=np.float64)
+    _, nearest = KDTree(source_points).query(target_points)
+    if mode == BARYCENTRIC and triangles is not None and len(triangles):
+        return get_triangle_mapping(
+            target_points, source_points, np.asarray(triangles, np.int64), nearest
+        )
+    indices = np.repeat(nearest[:, None], 3, axis=1)
+    weights = np.zeros((len(target_points), 3))
+    weights[:, 0] = 1.0
+    return indices, weights
+
+
+def remap(values, indices, weights):
+    """source 값을 target point 로 보간합니다.
+
+    Args:
+        values (np.ndarray): (n,) 또는 (n, layer) source 값
+        indices (np.ndarray): (m, 3) get_mapping 의 index
+        weights (np.ndarray): (m, 3) get_mapping 의 weight
+
+    Returns:
+        np.ndarray: (m,) 또는 (m, layer)
+    """
+    values = np.asarray(values)
+    if values.ndim == 1:
+        return (values[indices] * weights).sum(axis=1)
+    return (values[indices] * weights[:, :, None]).sum(axis=1)
+
+
+# endregion
@@ -2283,77 +2283,182 @@ def bind_skincluster(geometry, joints, name=""):
     return sc
 
 
-def export_weight(path, deformer):
-    directory = Path(path).parent.as_posix()
-    file_name = Path(path).name
+def create_skincluster(shape_name, joints, deformer_name):
+    """deformer_name 의 namespace 가 없다면 만들고 skinCluster 를 bind 합니다."""
+    if ":" in deformer_name:
+        namespaces = deformer_name.split(":")[:-1]
+        deformer_name = deformer_name.split(":")[-1]
+        for ns in namespaces:
+            # 이미 존재하는 네임스페이스인지 확인 후 없으면 생성
+            if not cmds.namespace(exists=ns):
+                cmds.namespace(add=ns)
+
+            # 다음 중첩 네임스페이스 생성을 위해 안으로 이동
+            cmds.namespace(setNamespace=ns)
+    try:
+        deformer_name = bind_skincluster(shape_name, joints, deformer_name)
+    finally:
+        cmds.namespace(setNamespace=":")
+    logger.info(f"Create {deformer_name}")
+    return deformer_name
+
+
+def get_export_flags(deformer):
+    """deformer 의 geometry 마다 deformerWeights export flag 를 한번에 구합니다.
+
+    Returns:
+        dict: {shape: flags}
+    """
     deformer_type = cmds.nodeType(deformer)
-    if deformer_type not in DEFORMER_TYPE_TABLE:
-        return logger.warning(f"{deformer_type} 을 지원하지 않습니다.")
     objs = cmds.deformer(deformer, geometry=True, query=True) or []
+    attributes = DEFORMER_TYPE_TABLE.get(deformer_type, [])
+    flags = {}
     for obj in objs:
-        all_deformer = cmds.deformableShape(obj) or []
-        all_deformer.remove(deformer)
-        skip_objs = objs.copy()
-        skip_objs.remove(obj)
-        flags = {
+        other_deformers = [x for x in cmds.deformableShape(obj) or [] if x != deformer]
+        flags[obj] = {
             "export": True,
             "deformer": deformer,
             "shape": obj,
-            "skip": skip_objs + all_deformer,
+            "skip": [x for x in objs if x != obj] + other_deformers,
             "format": "JSON",
-            "path": directory,
-            "vertexConnections": True if cmds.nodeType(obj) == "mesh" else False,
+            "vertexConnections": cmds.nodeType(obj) == "mesh",
             "weightTolerance": 0.0,
-            "attribute": (
-                DEFORMER_TYPE_TABLE[deformer_type]
-                if deformer_type in DEFORMER_TYPE_TABLE
-                else []
-            ),
+            "attribute": attributes,
             "defaultValue": 0 if deformer_type == "skinCluster" else 1,
         }
-        cmds.deformerWeights(file_name, **flags)
-        with open(path, "r") as f:
-            data = json.load(f)
+    return flags
+
+
+def has_painted_weights(deformer, shape):
+    """default(1) 가 아닌 weight 가 있는지 확인합니다.
 
-        # weight 수정을 하지않는 경우 제대로 export 되지 않음. 수동으로 추가.
-        if "weights" not in data["deformerWeight"]:
-            data["deformerWeight"]["weights"] = [
-                {
-                    "deformer": deformer,
-                    "source": "baseLayer",
-                    "shape": obj,
-                    "layer": 0,
-                    "defaultValue": 1.0,
-                    "size": 0,
-                    "max": 0,
-                }
-            ]
+    없다면 deformerWeights 가 weights 를 export 하지 않습니다. skinCluster 는 항상 True.
+    """
+    if cmds.nodeType(deformer) == "skinCluster":
+        return True
+    from domino.core import weights
+
+    try:
+        index = weights.get_geometry_index(deformer, shape)
+        plugs = weights.get_layer_plugs(deformer, index)
+    except RuntimeError:
+        return False
+    for plug in plugs.values():
+        existing = plug.getExistingArrayAttributeIndices()
+        if not existing:
+            continue
+        values = weights.read_plug_weights(plug, max(existing) + 1)
+        if (values != 1.0).any():
+            return True
+    return False
+
+
+def export_weight(path, deformer, shape=None, flags=None):
+    """deformer 의 geometry 하나의 weight 를 path 에 export 합니다.
+
+    deformerWeights 가 파일을 한번 씁니다. weight 가 없는 경우에만 다시 읽고 수정합니다.
+
+    Args:
+        path (str): json 파일
+        deformer (str): deformer
+        shape (str, optional): geometry. Defaults to 첫번째 geometry.
+        flags (dict, optional): get_export_flags 의 결과. Defaults to None.
+    """
+    deformer_type = cmds.nodeType(deformer)
+    if deformer_type not in DEFORMER_TYPE_TABLE:
+        return logger.warning(f"{deformer_type} 을 지원하지 않습니다.")
+    flags = flags or get_export_flags(deformer)
+    if not flags:
+        return logger.warning(f"{deformer} 의 geometry 가 없습니다.")
+    shape = shape or next(iter(flags))
+    path = Path(path)
+    painted = has_painted_weights(deformer, shape)
+    cmds.deformerWeights(path.name, path=path.parent.as_posix(), **flags[shape])
+    if painted:
+        return path.as_posix()
+
+    # weight 수정을 하지않는 경우 제대로 export 되지 않음. 수동으로 추가.
+    with open(path, "r") as f:
+        data = json.load(f)
+    if "weights" not in data["deformerWeight"]:
+        data["deformerWeight"]["weights"] = [
+            {
+                "deformer": deformer,
+                "source": "baseLayer",
+                "shape": shape,
+                "layer": 0,
+                "defaultValue": 1.0,
+                "size": 0,
+                "max": 0,
+            }
+        ]
         with open(path, "w") as f:
-            json.dump(data, f, indent=2)
+            json.dump(data, f, separators=(",", ":"))
+    return path.as_posix()
+
+
+def get_weight_file_name(obj, deformer, deformer_type):
+    return f"{obj}__{deformer}__{deformer_type}.json".replace(":", "_")
+
 
+def export_weights_to_directory(directory, deformers, prune=None, max_influences=None):
+    """mesh, nurbsCurve, nurbsSurface 의 deformer 는 sparse .npz(weights),
+    나머지는 geometry 마다 deformerWeights json 으로 export 합니다.
+
+    Args:
+        directory (str): export 디렉토리
+        deformers (list): deformer
+        prune (float, optional): Defaults to weights.PRUNE_THRESHOLD.
+        max_influences (int, optional): skinCluster vertex 당 최대 influence 수.
+            Defaults to weights.MAX_INFLUENCES.
+
+    Returns:
+        list: export 된 파일 경로
+    """
+    from domino.core import weights
+
+    if prune is None:
+        prune = weights.PRUNE_THRESHOLD
+    if max_influences is None:
+        max_influences = weights.MAX_INFLUENCES
 
-def export_weights_to_directory(directory, deformers):
     if not Path(directory).exists():
         logger.info(f"{directory} 가 존재하지 않습니다.")
 
+    paths = []
     for deformer in deformers:
         deformer_type = cmds.nodeType(deformer)
         if deformer_type not in DEFORMER_TYPE_TABLE:
             logger.warning(f"{deformer_type} 을 지원하지 않습니다.")
             continue
-        objs = cmds.deformer(deformer, geometry=True, query=True) or []
-        for obj in objs:
-            file_name = f"{obj}__{deformer}__{deformer_type}.json"
-            if ":" in file_name:
-                file_name = file_name.replace(":", "_")
-            export_weight((Path(directory) / file_name).as_posix(), deformer)
+        if weights.is_supported(deformer):
+            paths.extend(
+                weights.export_weights(directory, deformer, prune, max_influences)
+            )
+            continue
+        flags = get_export_flags(deformer)
+        for obj in flags:
+            path = Path(directory) / get_weight_file_name(obj, deformer, deformer_type)
+            # 이전 .npz 가 있다면 import 시 .npz 를 사용하므로 지웁니다.
+            stale = path.with_suffix(weights.WEIGHT_EXTENSION)
+            if stale.exists():
+                stale.unlink()
+            paths.append(export_weight(path.as_posix(), deformer, obj, flags))
+    return paths
 
 
-def import_weight(file_path):
+def import_weight(file_path, data=None):
+    """deformerWeights json 을 import 합니다.
+
+    Args:
+        file_path (str): json 파일
+        data (dict, optional): 미리 읽은 json data. Defaults to None.
+    """
     directory = Path(file_path).parent
     file_name = Path(file_path).name
-    with open(file_path, "r") as f:
-        data = json.load(f)
+    if data is None:
+        with open(file_path, "r") as f:
+            data = json.load(f)
 
     deformer_name = data["deformerWeight"]["deformers"][0]["name"]
     deformer_type = data["deformerWeight"]["deformers"][0]["type"]
@@ -2375,22 +2480,7 @@ def import_weight(file_path):
     try:
         if deformer_type == "skinCluster" and not cmds.objExists(deformer_name):
             joints = [d["source"] for d in data["deformerWeight"]["weights"]]
-
-            if ":" in deformer_name:
-                namespaces = deformer_name.split(":")[:-1]
-                deformer_name = deformer_name.split(":")[-1]
-                current_ns = ""
-                for ns in namespaces:
-                    # 이미 존재하는 네임스페이스인지 확인 후 없으면 생성
-                    if not cmds.namespace(exists=ns):
-                        cmds.namespace(add=ns)
-
-                    # 다음 중첩 네임스페이스 생성을 위해 안으로 이동
-                    cmds.namespace(setNamespace=ns)
-                    current_ns += f"{ns}:"
-            deformer_name = bind_skincluster(shape_name, joints, deformer_name)
-            cmds.namespace(setNamespace=":")
-            logger.info(f"Create {deformer_name}")
+            deformer_name = create_skincluster(shape_name, joints, deformer_name)
     except Exception as e:
         return logger.warning(
             f"skinCluster 생성 실패: `{deformer_name}` {joints + [shape_name]}"
@@ -2415,15 +2505,26 @@ def import_weight(file_path):
     )
 
 
-def import_weights_from_directory(directory):
-    path = Path(directory)
-    if not path.exists():
-        logger.info(f"{directory} 가 존재하지 않습니다.")
+def import_weights_from_directory(directory, remap=None):
+    """.npz(weights) 가 있다면 같은 이름의 json 대신 사용합니다.
 
-    for f in path.iterdir():
-        if f.suffix != ".json":
-            continue
-        import_weight(f.as_posix())
+    background thread 가 다음 파일을 읽는 동안 main thread 가 weight 를 적용합니다.
+    weights.import_directory 참고.
+
+    Args:
+        directory (str): weight 디렉토리
+        remap (str, optional): .npz 의 remap mode. weights.import_weights 참고.
+            Defaults to None.
+
+    Returns:
+        list: 파일별 시간 [{"file", "size", "decode", "wait", "apply"}]
+    """
+    from domino.core import weights
+
+    if not Path(directory).exists():
+        logger.info(f"{directory} 가 존재하지 않습니다.")
+        return []
+    return weights.import_directory(directory, remap=remap)
 
 
 # endregion
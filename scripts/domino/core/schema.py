@@ -0,0 +1,411 @@
+""".domino data 를 build 전에 검사하고 이전 버전 data 를 migration 합니다.
+
+component module 의 DATA 로 attribute 별 검사 함수를 한번 만들고(compile)
+cache 합니다. scene 에 접근하지 않으므로 build 전에 파일 전체를 빠르게 검사할 수 있습니다.
+
+    data = migrate(data, REGISTRY)
+    problems = validate(data, REGISTRY)
+
+migration 은 `schema_version` 을 하나씩 올리는 함수이며 MIGRATIONS 에 등록합니다.
+
+    @migration(1)
+    def migrate_0_to_1(data, registry): ...
+"""
+
+# domino
+from domino.core.utils import logger
+
+# built-ins
+import copy
+import numbers
+
+SCHEMA_VERSION = 1
+VERSION_KEY = "schema_version"
+
+# component data 에 항상 있어야 하는 list.
+COMPONENT_KEYS = ("children", "controller", "output", "output_joint")
+# assembly(root) data 에 있어야 하는 key 와 기본값.
+ROOT_KEYS = {
+    "custom_nurbscurve_data": [],
+    "custom_nurbssurface_data": [],
+    "custom_mesh_data": [],
+    "blendshape": [],
+    "deformer_weights": [],
+    "deformer_order": {},
+}
+# 길이가 같아야 하는 multi attribute.
+# component 의 guide, rig 에서 길이를 맞추므로(uicontainer01 의 guide_mirror_type 등)
+# build 를 막지 않고 warning 으로 알립니다.
+LENGTH_GROUPS = (
+    ("guide_matrix", "guide_mirror_type"),
+    ("initialize_output_matrix", "initialize_output_inverse_matrix"),
+)
+
+# from version -> data 를 from version + 1 로 바꾸는 함수
+MIGRATIONS = {}
+# component 이름 -> compile 된 (error 검사 함수 list, warning 검사 함수 list)
+_VALIDATORS = {}
+
+
+# region CHECK
+def is_integer(value):
+    return isinstance(value, numbers.Integral) and not isinstance(value, bool)
+
+
+def is_number(value):
+    return isinstance(value, numbers.Real) and not isinstance(value, bool)
+
+
+def check_integer(value, data):
+    if not is_integer(value):
+        return f"int 가 아닙니다. {value!r}"
+    min_value = data.get("minValue")
+    max_value = data.get("maxValue")
+    if min_value is not None and value < min_value:
+        return f"{value} 가 minValue {min_value} 보다 작습니다."
+    if max_value is not None and value > max_value:
+        return f"{value} 가 maxValue {max_value} 보다 큽니다."
+
+
+def check_float(value, data):
+    if not is_number(value):
+        return f"숫자가 아닙니다. {value!r}"
+    min_value = data.get("minValue")
+    max_value = data.get("maxValue")
+    if min_value is not None and value < min_value:
+        return f"{value} 가 minValue {min_value} 보다 작습니다."
+    if max_value is not None and value > max_value:
+        return f"{value} 가 maxValue {max_value} 보다 큽니다."
+
+
+def check_enum(value, data):
+    if not is_integer(value):
+        return f"int 가 아닙니다. {value!r}"
+    if not 0 <= value < len(data["enumName"]):
+        return f"{value} 가 enum 범위(0 ~ {len(data['enumName']) - 1})를 벗어났습니다."
+
+
+def check_bool(value, data):
+    if not isinstance(value, (bool, numbers.Integral)):
+        return f"bool 이 아닙니다. {value!r}"
+
+
+def check_string(value, data):
+    if value is not None and not isinstance(value, str):
+        return f"str 이 아닙니다. {value!r}"
+
+
+def check_matrix(value, data):
+    if not isinstance(value, list) or len(value) != 16:
+        return "길이 16 의 list 가 아닙니다."
+    if not all(is_number(x) for x in value):
+        return "숫자가 아닌 값이 있습니다."
+
+
+def check_geometry(value, data):
+    if value is not None and not isinstance(value, dict):
+        return f"dict 가 아닙니다. {type(value).__name__}"
+
+
+def check_message(value, data):
+    return None
+
+
+CHECKS = {
+    "long": check_integer,
+    "float": check_float,
+    "doubleAngle": check_float,
+    "enum": check_enum,
+    "bool": check_bool,
+    "string": check_string,
+    "matrix": check_matrix,
+    "message": check_message,
+    "nurbsCurve": check_geometry,
+    "nurbsSurface": check_geometry,
+    "mesh": check_geometry,
+}
+
+
+# endregion
+
+
+# region COMPILE
+def compile_attribute(attr):
+    """attribute 하나의 검사 함수.
+
+    Returns:
+        callable: (component_data) -> 문제 메세지 list
+    """
+    long_name = attr.long_name
+    data = attr[long_name]
+    _type = data.get("dataType") or data.get("attributeType")
+    check = CHECKS.get(_type, check_message)
+    multi = data.get("multi", False)
+    # DATA 에 value 가 없는 attribute(geometry) 는 value 가 없어도 됩니다.
+    optional = "value" not in data
+
+    def validate_attribute(component_data):
+        attr_data = component_data.get(long_name)
+        if not isinstance(attr_data, dict):
+            return [f"{long_name} 가 없습니다."]
+        if "value" not in attr_data:
+            return [] if optional else [f"{long_name} 의 value 가 없습니다."]
+        value = attr_data["value"]
+        if multi:
+            if not isinstance(value, list):
+                return [f"{long_name} 가 list 가 아닙니다."]
+            problems = []
+            for i, v in enumerate(value):
+                problem = check(v, data)
+                if problem:
+                    problems.append(f"{long_name}[{i}] {problem}")
+            return problems
+        problem = check(value, data)
+        return [f"{long_name} {problem}"] if problem else []
+
+    return validate_attribute
+
+
+def compile_component(attributes):
+    """component DATA 의 검사 함수 list 를 만듭니다.
+
+    Returns:
+        tuple: (error 검사 함수 list, warning 검사 함수 list)
+    """
+    validators = [compile_attribute(attr) for attr in attributes]
+    warnings = []
+    long_names = {attr.long_name for attr in attributes}
+    for group in LENGTH_GROUPS:
+        group = [x for x in group if x in long_names]
+        if len(group) < 2:
+            continue
+
+        def validate_length(component_data, group=group):
+            lengths = []
+            for long_name in group:
+                value = component_data.get(long_name, {}).get("value")
+                if not isinstance(value, list):
+                    return []
+                lengths.append(len(value))
+            if len(set(lengths)) > 1:
+                return [f"{', '.join(group)} 의 길이가 다릅니다. {lengths}"]
+            return []
+
+        warnings.append(validate_length)
+    return validators, warnings
+
+
+def get_validators(registry, name):
+    validators = _VALIDATORS.get(name)
+    if validators is None:
+        validators = compile_component(registry.data(name))
+        _VALIDATORS[name] = validators
+    return validators
+
+
+def clear_cache():
+    """component DATA 를 수정한 뒤(reload) 호출합니다."""
+    _VALIDATORS.clear()
+
+
+# endregion
+
+
+# region VALIDATE
+def get_component_name(component_data):
+    component = component_data.get("component")
+    return component.get("value") if isinstance(component, dict) else None
+
+
+def get_identifier(registry, component_data):
+    """instance 를 만들지 않고 Rig.identifier 를 구합니다."""
+    rig_class = registry.rig_class(component_data["component"]["value"])
+    try:
+        return tuple(rig_class.identifier.fget(component_data))
+    except (KeyError, IndexError, TypeError):
+        return None
+
+
+def validate(data, registry, references=True, warnings=None):
+    """.domino data 를 검사합니다.
+
+    Args:
+        data (dict): component data. 보통 assembly(root)
+        registry (ComponentRegistry): component registry
+        references (bool, optional): identifier 중복, parent_controllers 를 검사합니다.
+            subtree 처럼 일부만 검사할 때 False. Defaults to True.
+        warnings (list, optional): build 를 막지 않는 문제(LENGTH_GROUPS) 를 추가할 list.
+            None 이라면 logger.warning 으로 출력합니다. Defaults to None.
+
+    Returns:
+        list: 문제 메세지 list. 비어 있다면 문제가 없습니다.
+    """
+    problems = []
+    log_warnings = warnings is None
+    if log_warnings:
+        warnings = []
+    if not isinstance(data, dict):
+        return ["component data 가 dict 가 아닙니다."]
+
+    if references and get_component_name(data) == "assembly":
+        for key in ROOT_KEYS:
+            if key not in data:
+                problems.append(f"{key} 가 없습니다.")
+
+    names = set(registry.names())
+    identifiers = {}
+    controllers = []
+    stack = [(data, "assembly" if references else "root")]
+    while stack:
+        component_data, path = stack.pop(0)
+        if not isinstance(component_data, dict):
+            problems.append(f"{path}: component data 가 dict 가 아닙니다.")
+            continue
+        name = get_component_name(component_data)
+        if name not in names:
+            problems.append(f"{path}: 등록되지 않은 component 입니다. {name!r}")
+            continue
+        missing = [
+            x for x in COMPONENT_KEYS if not isinstance(component_data.get(x), list)
+        ]
+        if missing:
+            problems.append(f"{path}: {', '.join(missing)} 가 없습니다.")
+            continue
+
+        identifier = get_identifier(registry, component_data)
+        label = path
+        if identifier:
+            label = "_".join(str(x) for x in identifier if str(x)) or path
+
+        validators, warners = get_validators(registry, name)
+        for validator in validators:
+            problems.extend(f"{label}: {x}" for x in validator(component_data))
+        for warner in warners:
+            warnings.extend(f"{label}: {x}" for x in warner(component_data))
+
+        if references and identifier:
+            if identifier in identifiers:
+                problems.append(
+                    f"{label}: identifier {identifier} 가 중복됩니다. "
+                    f"{identifiers[identifier][0]}, {path}"
+                )
+            else:
+                descriptions = {
+                    x.get("description")
+                    for x in component_data["controller"]
+                    if isinstance(x, dict)
+                }
+                identifiers[identifier] = (path, descriptions)
+            controllers.extend((label, x) for x in component_data["controller"])
+
+        stack.extend(
+            (child, f"{path}/{i}") for i, child in enumerate(component_data["children"])
+        )
+
+    if log_warnings:
+        for warning in warnings:
+            logger.warning(warning)
+
+    if not references:
+        return problems
+
+    for path, controller in controllers:
+        if not isinstance(controller, dict) or "description" not in controller:
+            problems.append(f"{path}: controller data 가 올바르지 않습니다.")
+            continue
+        for parent_controller in controller.get("parent_controllers", []):
+            try:
+                identifier, description = parent_controller
+                identifier = tuple(identifier)
+            except (TypeError, ValueError):
+                problems.append(
+                    f"{path}: {controller['description']!r} 의 parent_controllers 가 "
+                    f"올바르지 않습니다. {parent_controller!r}"
+                )
+                continue
+            if identifier not in identifiers:
+                problems.append(
+                    f"{path}: {controller['description']!r} 의 parent controller "
+                    f"component {identifier} 가 없습니다."
+                )
+            elif description not in identifiers[identifier][1]:
+                problems.append(
+                    f"{path}: {controller['description']!r} 의 parent controller "
+                    f"{identifier} {description!r} 가 없습니다."
+                )
+    return problems
+
+
+# endregion
+
+
+# region MIGRATION
+def migration(version):
+    """version 의 data 를 version + 1 로 바꾸는 함수를 등록합니다."""
+
+    def decorator(func):
+        MIGRATIONS[version] = func
+        return func
+
+    return decorator
+
+
+def get_version(data):
+    return data.get(VERSION_KEY, 0)
+
+
+def migrate(data, registry, version=None):
+    """data 를 SCHEMA_VERSION 으로 migration 합니다. data 를 직접 수정합니다.
+
+    Args:
+        data (dict): component data
+        registry (ComponentRegistry): component registry
+        version (int, optional): data 의 version. subtree 처럼 root 가 아닌
+            data 는 파일의 version 을 넘겨줍니다. Defaults to data 의 version.
+
+    Returns:
+        dict: migration 된 data
+    """
+    is_root = version is None
+    version = get_version(data) if is_root else version
+    if version > SCHEMA_VERSION:
+        logger.warning(
+            f"schema version {version} 이 현재 version {SCHEMA_VERSION} 보다 높습니다."
+        )
+        return data
+    while version < SCHEMA_VERSION:
+        data = MIGRATIONS[version](data, registry)
+        version += 1
+        logger.info(f"Migrate schema version {version - 1} -> {version}")
+    if is_root:
+        data[VERSION_KEY] = SCHEMA_VERSION
+    return data
+
+
+@migration(0)
+def migrate_0_to_1(data, registry):
+    """schema version 이 없는 파일.
+
+    이후 component 에 추가된 attribute 는 DATA 의 기본값으로 채웁니다.
+    """
+    if get_component_name(data) == "assembly":
+        for key, value in ROOT_KEYS.items():
+            data.setdefault(key, copy.deepcopy(value))
+    names = set(registry.names())
+    stack = [data]
+    while stack:
+        component_data = stack.pop(0)
+        if not isinstance(component_data, dict):
+            continue
+        for key in COMPONENT_KEYS:
+            component_data.setdefault(key, [])
+        name = get_component_name(component_data)
+        if name in names:
+            for attr in registry.data(name):
+                if attr.long_name not in component_data:
+                    component_data[attr.long_name] = copy.deepcopy(attr[attr.long_name])
+        stack.extend(component_data["children"])
+    return data
+
+
+# endregion
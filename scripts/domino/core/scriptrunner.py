@@ -0,0 +1,152 @@
+# domino
+from domino.core.utils import logger
+
+# built-ins
+from pathlib import Path
+import ast
+import fnmatch
+import os
+import re
+import sys
+import time
+import types
+
+# path -> (mtime_ns, size, code object)
+_CODE_CACHE = {}
+# path -> (mtime_ns, size, READS)
+_READS_CACHE = {}
+
+MODULE_PREFIX = "domino_custom_scripts"
+
+
+def is_disabled(script_path):
+    """assembly ui 에서 비활성화한 script 는 `*` 로 시작합니다."""
+    return script_path.startswith("*")
+
+
+def get_namespace(domino_path):
+    """rig 별 module namespace. .domino 파일 이름을 사용합니다."""
+    name = Path(domino_path).name.split(".")[0] if domino_path else "untitled"
+    return re.sub(r"\W", "_", name)
+
+
+def compile_script(script_path):
+    """script 를 compile 합니다. path, mtime, size 가 같다면 cache 를 사용합니다."""
+    stat = os.stat(script_path)
+    cached = _CODE_CACHE.get(script_path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    with open(script_path, "r", encoding="utf-8") as f:
+        source = f.read()
+    code = compile(source, script_path, "exec")
+    _CODE_CACHE[script_path] = (stat.st_mtime_ns, stat.st_size, code)
+    return code
+
+
+def load_script(script_path, namespace):
+    """compile 된 script 를 `domino_custom_scripts.{namespace}.{name}` module 로 실행합니다.
+
+    같은 이름의 script 라도 rig 가 다르면 sys.modules 에서 충돌하지 않습니다.
+    """
+    name = re.sub(r"\W", "_", Path(script_path).name.split(".")[0])
+    module_name = f"{MODULE_PREFIX}.{namespace}.{name}"
+    module = types.ModuleType(module_name)
+    module.__file__ = script_path
+    sys.modules[module_name] = module
+    exec(compile_script(script_path), module.__dict__)
+    return module
+
+
+def get_reads(script_path):
+    """script 를 실행하지 않고 module level 의 READS 를 읽습니다.
+
+    READS 를 선언하지 않았다면 None 입니다.
+
+    READS 는 script 가 사용하는 context key list 이며 fnmatch pattern 을 사용할 수 있습니다.
+    ast 로 읽으므로 literal(str, list, tuple) 이어야 합니다.
+    path, mtime, size 가 같다면 cache 를 사용합니다.
+
+    Examples:
+        >>> READS = ["arm_L0", "leg_*"]
+    """
+    stat = os.stat(script_path)
+    cached = _READS_CACHE.get(script_path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return None if cached[2] is None else list(cached[2])
+    with open(script_path, "r", encoding="utf-8") as f:
+        source = f.read()
+
+    reads = None
+    for node in ast.parse(source, script_path).body:
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            targets = [node.target]
+        else:
+            continue
+        if not any(isinstance(x, ast.Name) and x.id == "READS" for x in targets):
+            continue
+        try:
+            reads = ast.literal_eval(node.value)
+        except ValueError:
+            logger.warning(f"READS 는 literal 이어야 합니다. {script_path}")
+            reads = None
+    if isinstance(reads, str):
+        reads = [reads]
+    if reads is not None:
+        reads = list(reads)
+    _READS_CACHE[script_path] = (stat.st_mtime_ns, stat.st_size, reads)
+    return None if reads is None else list(reads)
+
+
+def is_dependent(reads, changed_keys):
+    return any(
+        fnmatch.fnmatchcase(key, pattern) for pattern in reads for key in changed_keys
+    )
+
+
+def run_scripts(script_paths, context, namespace, profiler=None, changed_keys=None):
+    """custom scripts 를 순서대로 실행합니다.
+
+    changed_keys 가 주어지면(incremental build) READS 를 선언하고
+    changed_keys 중 하나라도 읽는 script 만 실행합니다.
+    READS 는 script 를 실행하기 전에 source 에서 읽습니다.
+    READS 가 없는 script 는 의존성을 알 수 없으므로 실행하지 않습니다.
+
+    Args:
+        script_paths (list): script path list
+        context (dict): build context
+        namespace (str): rig namespace
+        profiler (Profiler, optional): stage 를 기록할 profiler. Defaults to None.
+        changed_keys (list, optional): 다시 build 된 context key. Defaults to None.
+
+    Returns:
+        list: [{"path", "time", "skipped"}]
+    """
+    results = []
+    for script_path in script_paths:
+        if not script_path:
+            continue
+        if is_disabled(script_path):
+            logger.info(f"Skip disabled script {script_path[1:]}")
+            continue
+        # skip 하는 script 는 실행(import) 하지 않습니다.
+        if changed_keys is not None:
+            reads = get_reads(script_path)
+            if reads is None or not is_dependent(reads, changed_keys):
+                logger.info(f"Skip {Path(script_path).name} {script_path}")
+                results.append({"path": script_path, "time": 0.0, "skipped": True})
+                continue
+
+        module = load_script(script_path, namespace)
+        name = module.__name__.split(".")[-1]
+        start_time = time.perf_counter()
+        if profiler is not None:
+            with profiler.stage(name, category="script"):
+                module.run(context=context)
+        else:
+            module.run(context=context)
+        execution_time = time.perf_counter() - start_time
+        logger.info(f"Run {name} {script_path} {execution_time:.4f}s")
+        results.append({"path": script_path, "time": execution_time, "skipped": False})
+    return results
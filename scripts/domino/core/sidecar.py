@@ -0,0 +1,196 @@
+""".domino v2
+
+json 에는 구조와 scalar 를 남기고 큰 숫자 list(matrix, cv, vertex, uv ...)는
+{"__array__": index} 로 바꿔 sidecar 파일에 little-endian raw 로 저장합니다.
+
+    rig_v001.domino      json, "domino_format": {"version", "sidecar", "arrays"}
+    rig_v001.domino.bin  array 들을 ALIGNMENT 단위로 이어 붙인 파일
+
+load 시 sidecar 는 한번에 읽고 array 를 list 로 되돌립니다.
+schema, deserialize, maya 의 setAttr 은 list 를 사용하므로 array 를 memory map 으로
+남겨두지 않습니다.
+"domino_format" 이 없는 json 은 v1 로 그대로 사용합니다.
+"""
+
+# built-ins
+from pathlib import Path
+import json
+import os
+
+import numpy as np
+
+FORMAT_VERSION = 2
+FORMAT_KEY = "domino_format"
+ARRAY_KEY = "__array__"
+SIDECAR_EXTENSION = ".bin"
+
+# 원소 수가 이보다 작은 list 는 json 에 그대로 둡니다.
+MIN_ARRAY_SIZE = 32
+ALIGNMENT = 8
+
+
+def get_sidecar_path(file_path):
+    path = Path(file_path)
+    return path.parent / f"{path.name}{SIDECAR_EXTENSION}"
+
+
+def is_packed(data):
+    return isinstance(data, dict) and FORMAT_KEY in data
+
+
+# region PACK
+def to_array(value):
+    """숫자 list 또는 길이가 같은 숫자 list 의 list 라면 ndarray, 아니라면 None."""
+    if not value:
+        return None
+    if isinstance(value[0], (list, tuple)):
+        width = len(value[0])
+        if not width:
+            return None
+        items = []
+        for row in value:
+            if not isinstance(row, (list, tuple)) or len(row) != width:
+                return None
+            items.extend(row)
+    else:
+        items = value
+    if len(items) < MIN_ARRAY_SIZE:
+        return None
+    is_float = False
+    for x in items:
+        if isinstance(x, bool) or not isinstance(x, (int, float)):
+            return None
+        if isinstance(x, float):
+            is_float = True
+    return np.array(value, dtype="<f8" if is_float else "<i8")
+
+
+def pack(data):
+    """data 의 큰 숫자 list 를 {ARRAY_KEY: index} 로 바꿉니다.
+
+    Returns:
+        tuple: packed data, array list
+    """
+    arrays = []
+
+    def walk(value):
+        if isinstance(value, dict):
+            return {k: walk(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            array = to_array(value)
+            if array is not None:
+                arrays.append(array)
+                return {ARRAY_KEY: len(arrays) - 1}
+            return [walk(x) for x in value]
+        return value
+
+    return walk(data), arrays
+
+
+def unpack(data, file_path):
+    """{ARRAY_KEY: index} 를 sidecar 의 값으로 되돌립니다.
+
+    Args:
+        data (dict): packed data
+        file_path (str): .domino file path. sidecar 는 이 파일 옆에서 찾습니다.
+
+    Returns:
+        dict: v1 과 같은 data
+    """
+    data = dict(data)
+    info = data.pop(FORMAT_KEY)
+    if info["version"] > FORMAT_VERSION:
+        raise ValueError(
+            f"지원하지 않는 .domino format 입니다. version {info['version']}"
+        )
+    arrays = info["arrays"]
+    buffer = None
+    if arrays:
+        sidecar_path = Path(file_path).parent / info["sidecar"]
+        buffer = np.fromfile(sidecar_path, dtype=np.uint8)
+
+    def walk(value):
+        if isinstance(value, dict):
+            if len(value) == 1 and ARRAY_KEY in value:
+                item = arrays[value[ARRAY_KEY]]
+                array = np.frombuffer(
+                    buffer,
+                    dtype=np.dtype(item["dtype"]),
+                    count=int(np.prod(item["shape"])),
+                    offset=item["offset"],
+                )
+                return array.reshape(item["shape"]).tolist()
+            return {k: walk(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [walk(x) for x in value]
+        return value
+
+    return walk(data)
+
+
+# endregion
+
+
+# region FILE
+def write(file_path, data):
+    """data 를 v2 로 저장합니다.
+
+    sidecar 와 json 을 모두 임시 파일에 쓴 뒤 교체하므로 쓰는 도중 실패해도
+    이전 파일이 그대로 남습니다. json 은 sidecar 다음에 마지막으로 교체합니다.
+    background save 의 thread pool 에서 실행되므로 log 를 남기지 않습니다.
+
+    Returns:
+        tuple: json path, sidecar path
+    """
+    path = Path(file_path)
+    sidecar_path = get_sidecar_path(path)
+    packed, arrays = pack(data)
+
+    index = []
+    offset = 0
+    temp_sidecar_path = sidecar_path.parent / f"{sidecar_path.name}.{os.getpid()}.tmp"
+    temp_path = path.parent / f"{path.name}.{os.getpid()}.tmp"
+    with open(temp_sidecar_path, "wb") as f:
+        for array in arrays:
+            padding = -offset % ALIGNMENT
+            f.write(b"\0" * padding)
+            offset += padding
+            f.write(array.tobytes())
+            index.append(
+                {
+                    "offset": offset,
+                    "dtype": array.dtype.str,
+                    "shape": list(array.shape),
+                }
+            )
+            offset += array.nbytes
+
+    packed[FORMAT_KEY] = {
+        "version": FORMAT_VERSION,
+        "sidecar": sidecar_path.name,
+        "arrays": index,
+    }
+    with open(temp_path, "w") as f:
+        json.dump(packed, f, indent=2, ensure_ascii=False)
+    os.replace(temp_sidecar_path, sidecar_path)
+    os.replace(temp_path, path)
+    return path.as_posix(), sidecar_path.as_posix()
+
+
+def read(file_path):
+    """v1, v2 .domino 파일을 읽습니다."""
+    with open(file_path, "r") as f:
+        data = json.load(f)
+    if is_packed(data):
+        data = unpack(data, file_path)
+    return data
+
+
+def remove(file_path):
+    """v1 으로 저장할 때 이전 v2 의 sidecar 를 지웁니다."""
+    sidecar_path = get_sidecar_path(file_path)
+    if sidecar_path.exists():
+        sidecar_path.unlink()
+
+
+# endregion
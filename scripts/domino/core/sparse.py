@@ -0,0 +1,101 @@
+"""(point, layer) weight 행렬의 prune 과 CSR 변환.
+
+maya 에 의존하지 않으며 numpy 배열만 사용합니다. weights 의 .npz 는
+default 값이 아닌 weight 만 CSR (indptr, indices, data) 로 저장합니다.
+
+Examples:
+    >>> indptr, indices, data = to_csr(weights, default_value=0.0)
+    >>> weights = from_csr(indptr, indices, data, weights.shape)
+"""
+
+# built-ins
+import numpy as np
+
+# 이보다 작은 weight(default 와의 차이) 는 저장하지 않습니다.
+PRUNE_THRESHOLD = 1e-4
+
+
+# region SPARSE
+def prune_weights(weights, threshold=PRUNE_THRESHOLD, max_influences=None):
+    """skin weight 를 prune 하고 vertex 마다 normalize 합니다. weights 를 직접 수정합니다.
+
+    vertex weight 의 합은 prune 전과 같습니다.
+
+    Args:
+        weights (np.ndarray): (vertex, influence) 배열
+        threshold (float, optional): 이보다 작은 weight 는 0. Defaults to PRUNE_THRESHOLD.
+        max_influences (int, optional): vertex 당 남길 가장 큰 weight 수. Defaults to None.
+
+    Returns:
+        np.ndarray: weights
+    """
+    total = weights.sum(axis=1, keepdims=True)
+    weights[weights < threshold] = 0.0
+    if max_influences and weights.shape[1] > max_influences:
+        # vertex 마다 max_influences 개의 큰 weight 를 제외하고 버립니다.
+        drop = np.argpartition(weights, -max_influences, axis=1)[:, :-max_influences]
+        np.put_along_axis(weights, drop, 0.0, axis=1)
+    pruned = weights.sum(axis=1, keepdims=True)
+    np.divide(weights * total, pruned, out=weights, where=pruned > 0)
+    return weights
+
+
+def to_csr(weights, default_value=0.0):
+    """(point, layer) 배열에서 default 가 아닌 값의 CSR (indptr, indices, data)."""
+    rows, columns = np.nonzero(weights != default_value)
+    indptr = np.zeros(weights.shape[0] + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=weights.shape[0]), out=indptr[1:])
+    data = weights[rows, columns].astype(np.float32)
+    return indptr, columns.astype(np.int32), data
+
+
+def from_csr(indptr, indices, data, shape, default_value=0.0, rows=None):
+    """CSR 을 dense 배열로 변환합니다.
+
+    Args:
+        rows (slice, optional): 일부 point 만 변환합니다. Defaults to 모든 point.
+    """
+    rows = rows or slice(0, shape[0])
+    start, stop = rows.start, min(rows.stop, shape[0])
+    weights = np.full((stop - start, shape[1]), default_value, dtype=np.float64)
+    begin, end = indptr[start], indptr[stop]
+    row_index = np.repeat(np.arange(stop - start), np.diff(indptr[start : stop + 1]))
+    weights[row_index, indices[begin:end]] = data[begin:end]
+    return weights
+
+
+def take_rows(indptr, indices, data, rows, layer_count, default_value=0.0):
+    """CSR 의 임의의 row 를 dense (len(rows), layer) 배열로 변환합니다."""
+    counts = indptr[rows + 1] - indptr[rows]
+    weights = np.full((len(rows), layer_count), default_value, dtype=np.float64)
+    row_index = np.repeat(np.arange(len(rows)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    flat = np.repeat(indptr[rows], counts) + offsets
+    weights[row_index, indices[flat]] = data[flat]
+    return weights
+
+
+def concatenate_csr(chunks):
+    """row 순서대로 나눈 CSR 들을 하나로 합칩니다."""
+    indptr = [np.zeros(1, dtype=np.int64)]
+    offset = 0
+    for chunk_indptr, chunk_indices, _ in chunks:
+        indptr.append(chunk_indptr[1:] + offset)
+        offset += len(chunk_indices)
+    return (
+        np.concatenate(indptr),
+        np.concatenate([x[1] for x in chunks]),
+        np.concatenate([x[2] for x in chunks]),
+    )
+
+
+def get_column(indptr, indices, data, count, column, default_value=1.0):
+    """CSR 의 column(layer) 하나를 dense 배열로 변환합니다."""
+    values = np.full(count, default_value, dtype=np.float64)
+    mask = indices == column
+    rows = np.repeat(np.arange(count), np.diff(indptr))[mask]
+    values[rows] = data[mask]
+    return values
+
+
+# endregion
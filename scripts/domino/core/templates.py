@@ -0,0 +1,250 @@
+"""DOMINO_RIG_TEMPLATE_DIR 의 .domino template catalogue.
+
+template 의 component 수, type 을 path, mtime, size 로 cache 합니다.
+network 경로의 template 디렉토리를 refresh 마다 다시 읽지 않도록
+바뀐 파일만 background thread 에서 다시 읽습니다.
+catalogue 는 local temp 디렉토리에 저장되어 maya 를 다시 시작해도 사용합니다.
+scan 의 message 는 쌓아두고 main thread 의 flush_log 에서 출력합니다.
+
+Examples:
+    >>> from domino.core.templates import TEMPLATES
+    >>> TEMPLATES.refresh()
+    >>> TEMPLATES.entries()
+    >>> data = TEMPLATES.read(path)
+"""
+
+# domino
+from domino.core import sidecar
+from domino.core.utils import logger
+
+# built-ins
+from pathlib import Path
+import copy
+import json
+import logging
+import os
+import tempfile
+import threading
+
+CATALOGUE_NAME = "domino_template_catalogue.json"
+CATALOGUE_VERSION = 1
+
+
+def get_template_dir():
+    return os.getenv("DOMINO_RIG_TEMPLATE_DIR", None)
+
+
+def get_catalogue_path():
+    return Path(tempfile.gettempdir()) / CATALOGUE_NAME
+
+
+def get_signature(path):
+    """.domino 와 v2 sidecar 의 (mtime, size)."""
+    signature = []
+    for p in (Path(path), sidecar.get_sidecar_path(path)):
+        if p.exists():
+            stat = p.stat()
+            signature.extend([stat.st_mtime, stat.st_size])
+    return tuple(signature)
+
+
+def read_info(path):
+    """template 의 component 수, type 별 수. v2 파일은 sidecar 를 읽지 않습니다."""
+    with open(path, "r") as f:
+        data = json.load(f)
+    components = {}
+    stack = [data]
+    while stack:
+        component_data = stack.pop(0)
+        name = component_data["component"]["value"]
+        components[name] = components.get(name, 0) + 1
+        stack.extend(component_data["children"])
+    return {
+        "count": sum(components.values()),
+        "components": dict(sorted(components.items())),
+    }
+
+
+class TemplateCatalogue:
+    """template metadata 와 parsed data 의 cache.
+
+    entry 는 {"path", "name", "mtime", "size", "count", "components"} 입니다.
+    version 은 entry 가 바뀔 때마다 증가하므로 ui 는 version 이 다를 때만 menu 를 다시 만듭니다.
+    """
+
+    def __init__(self, cache_data=True):
+        self.cache_data = cache_data
+        self.version = 0
+        self._entries = {}
+        # path -> (signature, data)
+        self._data = {}
+        # background thread 의 (level, message)
+        self._messages = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._template_dir = None
+        self.load_catalogue()
+
+    # region -    catalogue file
+    def load_catalogue(self):
+        path = get_catalogue_path()
+        if not path.exists():
+            return
+        try:
+            with open(path, "r") as f:
+                catalogue = json.load(f)
+        except (ValueError, OSError):
+            return
+        if catalogue.get("version") != CATALOGUE_VERSION:
+            return
+        self._template_dir = catalogue["template_dir"]
+        self._entries = {x["path"]: x for x in catalogue["entries"]}
+        self.version += 1
+
+    def save_catalogue(self):
+        path = get_catalogue_path()
+        temp_path = path.parent / f"{path.name}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump(
+                    {
+                        "version": CATALOGUE_VERSION,
+                        "template_dir": self._template_dir,
+                        "entries": list(self._entries.values()),
+                    },
+                    f,
+                    indent=2,
+                )
+            os.replace(temp_path, path)
+        except OSError as e:
+            self.log(f"template catalogue 를 저장할 수 없습니다. {e}", logging.WARNING)
+
+    # endregion
+
+    # region -    log
+    def log(self, message, level=logging.INFO):
+        """logger 의 MayaGuiLogHandler 는 main thread 에서만 사용하므로 message 를 쌓아둡니다."""
+        with self._lock:
+            self._messages.append((level, message))
+
+    def flush_log(self):
+        """쌓인 message 를 출력합니다. main thread 에서 호출합니다."""
+        with self._lock:
+            messages, self._messages = self._messages, []
+        for level, message in messages:
+            logger.log(level, message)
+
+    # endregion
+
+    def entries(self):
+        """이름 순서의 entry list. 현재 template 디렉토리의 entry 만 돌려줍니다."""
+        template_dir = get_template_dir()
+        with self._lock:
+            if not template_dir or Path(template_dir).as_posix() != self._template_dir:
+                return []
+            return sorted(self._entries.values(), key=lambda x: x["name"])
+
+    def scan(self, template_dir=None):
+        """template 디렉토리를 stat 하고 mtime, size 가 바뀐 파일만 다시 읽습니다.
+
+        background thread 에서 실행되므로 message 는 log 로 남깁니다.
+
+        Returns:
+            bool: entry 가 바뀌었다면 True
+        """
+        template_dir = template_dir or get_template_dir()
+        if not template_dir or not Path(template_dir).exists():
+            return False
+        template_dir = Path(template_dir).as_posix()
+
+        with self._lock:
+            previous = dict(self._entries) if template_dir == self._template_dir else {}
+
+        entries = {}
+        changed = template_dir != self._template_dir
+        for template in Path(template_dir).iterdir():
+            if not template.is_file() or template.suffix != ".domino":
+                continue
+            path = template.as_posix()
+            stat = template.stat()
+            entry = previous.get(path)
+            if (
+                entry
+                and entry["mtime"] == stat.st_mtime
+                and entry["size"] == stat.st_size
+            ):
+                entries[path] = entry
+                continue
+            try:
+                info = read_info(path)
+            except (ValueError, KeyError, TypeError, OSError) as e:
+                self.log(f"template {path} 를 읽을 수 없습니다. {e}", logging.WARNING)
+                continue
+            entries[path] = {
+                "path": path,
+                "name": template.name.split(".")[0],
+                "mtime": stat.st_mtime,
+                "size": stat.st_size,
+                **info,
+            }
+            changed = True
+        if set(entries) != set(previous):
+            changed = True
+
+        if changed:
+            with self._lock:
+                self._template_dir = template_dir
+                self._entries = entries
+                for path in list(self._data):
+                    if path not in entries:
+                        self._data.pop(path)
+                self.version += 1
+            self.save_catalogue()
+            self.log(f"Update template catalogue {template_dir} ({len(entries)})")
+        return changed
+
+    def refresh(self, template_dir=None):
+        """background thread 에서 scan 합니다. 이미 scan 중이라면 무시합니다."""
+        if self.is_refreshing():
+            return self._thread
+        self._thread = threading.Thread(
+            target=self._scan, args=(template_dir,), daemon=True
+        )
+        self._thread.start()
+        return self._thread
+
+    def _scan(self, template_dir):
+        try:
+            self.scan(template_dir)
+        except Exception as e:
+            self.log(f"template catalogue scan 에 실패했습니다. {e}", logging.WARNING)
+
+    def is_refreshing(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def read(self, path):
+        """template data. mtime, size 가 같다면 cache 의 data 를 사용합니다.
+
+        load 가 data 를 수정하므로 cache 의 복사본을 돌려줍니다.
+        """
+        key = Path(path).as_posix()
+        signature = get_signature(key)
+        with self._lock:
+            cached = self._data.get(key)
+        if cached and cached[0] == signature:
+            return copy.deepcopy(cached[1])
+        data = sidecar.read(key)
+        if self.cache_data:
+            with self._lock:
+                self._data[key] = (signature, copy.deepcopy(data))
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            self._data = {}
+            self._template_dir = None
+            self.version += 1
+
+
+TEMPLATES = TemplateCatalogue()
@@ -0,0 +1,796 @@
+"""deformer weight 를 sparse 배열로 압축해 저장하는 .npz I/O.
+
+cmds.deformerWeights 는 모든 point, influence 의 weight 를 text 로 저장하므로
+influence 가 많은 skinCluster 의 json 은 대부분 0 입니다.
+weight 는 (point, layer) 행렬이며 default 값이 아닌 weight 만 CSR 로 저장합니다.
+
+    skinCluster     layer 는 influence, default 0
+                    getWeights, setWeights 로 한번에 읽고 vertex chunk 단위로 씁니다.
+    blendShape      layer 는 baseWeights, target:<alias>, default 1
+    그 외           layer 는 weights (weightList), default 1
+                    MArrayDataHandle 로 읽고 MArrayDataBuilder 로 한번에 씁니다.
+
+export 할 때 prune 보다 작은 skin weight 는 버리고 max_influences 개의 큰 weight 만
+남긴 뒤 normalize 합니다. skinCluster 가 아닌 deformer 는 default 와의 차이가
+prune 보다 작으면 default 로 저장합니다.
+
+.npz 의 배열
+
+    version                       format version
+    deformer, deformer_type, shape
+    layers                        layer 이름
+    shape_info                    (point 수) nurbsSurface 는 (u, v)
+    default_value                 저장되지 않은 weight 의 값
+    indptr, indices, data         CSR (point, layer) float32
+    blend_weights                 skinCluster dual quaternion blend weight
+    attributes                    DEFORMER_TYPE_TABLE attribute 의 json
+    points                        deformer 입력 geometry 의 object space point
+    triangles                     mesh 의 triangle (point index)
+
+vertex 수가 다르거나 remap 을 지정하면 저장된 points 로 weight 를 새 vertex 로
+옮깁니다(core.remap). topology 가 바뀐 mesh 에도 weight 를 적용할 수 있습니다.
+
+Examples:
+    >>> export_weights("D:/rig.metadata/deformerWeights", "skinCluster1")
+    >>> import_weights("D:/.../body__skinCluster1__skinCluster.npz")
+    >>> import_weights(path, remap="nearest")
+"""
+
+# maya
+from maya import cmds
+from maya.api import OpenMaya as om
+from maya.api import OpenMayaAnim as oma
+
+# domino
+from domino.core import remap as remap_
+from domino.core import rigkit, sparse
+from domino.core.modifier import get_mobject
+from domino.core.utils import logger
+
+# built-ins
+from concurrent import futures
+from pathlib import Path
+import collections
+import json
+import os
+import time
+
+import numpy as np
+
+WEIGHT_EXTENSION = ".npz"
+FORMAT_VERSION = 2
+SUPPORTED_TYPES = ("mesh", "nurbsCurve", "nurbsSurface")
+# 이보다 작은 weight(default 와의 차이) 는 저장하지 않습니다.
+PRUNE_THRESHOLD = sparse.PRUNE_THRESHOLD
+# skinCluster vertex 당 최대 influence 수. None 이라면 skinCluster 의
+# maintainMaxInfluences 가 켜져 있을 때 maxInfluences 를 사용합니다.
+MAX_INFLUENCES = None
+# setWeights 한번에 쓰는 vertex 수. (vertex, influence) dense 배열의 크기를 제한합니다.
+CHUNK_SIZE = 20000
+# vertex 수가 다를 때 사용하는 remap mode. None 이라면 remap 하지 않습니다.
+REMAP_MODE = remap_.BARYCENTRIC
+# import_directory 가 미리 읽는 파일 수와 thread 수.
+PREFETCH = 4
+DECODE_WORKERS = 2
+# remap 후 default 와의 차이가 이보다 작다면 default 로 저장합니다.
+REMAP_TOLERANCE = 1e-6
+
+
+# region UTILS
+def get_file_name(obj, deformer, deformer_type):
+    file_name = f"{obj}__{deformer}__{deformer_type}{WEIGHT_EXTENSION}"
+    return file_name.replace(":", "_")
+
+
+def get_file_names(deformer):
+    """export_weights_to_directory 가 deformer 에 대해 만드는 파일 이름."""
+    deformer_type = cmds.nodeType(deformer)
+    objs = cmds.deformer(deformer, geometry=True, query=True) or []
+    if is_supported(deformer):
+        return [get_file_name(obj, deformer, deformer_type) for obj in objs]
+    return [rigkit.get_weight_file_name(obj, deformer, deformer_type) for obj in objs]
+
+
+def is_supported(deformer):
+    """.npz 로 export 할 수 있는 deformer 인지 확인합니다."""
+    if cmds.nodeType(deformer) not in rigkit.DEFORMER_TYPE_TABLE:
+        return False
+    objs = cmds.deformer(deformer, geometry=True, query=True) or []
+    return bool(objs) and all(cmds.nodeType(x) in SUPPORTED_TYPES for x in objs)
+
+
+def get_dag_path(node):
+    selection_list = om.MSelectionList()
+    selection_list.add(node)
+    return selection_list.getDagPath(0)
+
+
+def get_skin_cluster(deformer):
+    return oma.MFnSkinCluster(get_mobject(deformer))
+
+
+def get_shape_info(dag_path):
+    if dag_path.hasFn(om.MFn.kMesh):
+        return (om.MFnMesh(dag_path).numVertices,)
+    if dag_path.hasFn(om.MFn.kNurbsCurve):
+        return (om.MFnNurbsCurve(dag_path).numCVs,)
+    if dag_path.hasFn(om.MFn.kNurbsSurface):
+        fn_surface = om.MFnNurbsSurface(dag_path)
+        return (fn_surface.numCVsInU, fn_surface.numCVsInV)
+    raise RuntimeError(f"{dag_path.partialPathName()} 을 지원하지 않습니다.")
+
+
+def get_component(dag_path, elements=None):
+    """geometry 의 vertex(cv) component.
+
+    Args:
+        dag_path (MDagPath): shape
+        elements (range, optional): vertex index. nurbsSurface 는 무시합니다.
+            Defaults to 모든 vertex.
+
+    Returns:
+        MObject: component
+    """
+    shape_info = get_shape_info(dag_path)
+    if len(shape_info) == 2:
+        fn_component = om.MFnDoubleIndexedComponent()
+        component = fn_component.create(om.MFn.kSurfaceCVComponent)
+        fn_component.setCompleteData(*shape_info)
+        return component
+    fn_component = om.MFnSingleIndexedComponent()
+    component_type = (
+        om.MFn.kMeshVertComponent
+        if dag_path.hasFn(om.MFn.kMesh)
+        else om.MFn.kCurveCVComponent
+    )
+    component = fn_component.create(component_type)
+    if elements is None:
+        fn_component.setCompleteData(shape_info[0])
+    else:
+        fn_component.addElements(list(elements))
+    return component
+
+
+def get_influences(fn_skin):
+    return [x.partialPathName() for x in fn_skin.influenceObjects()]
+
+
+def get_geometry_index(deformer, shape):
+    fn_filter = oma.MFnGeometryFilter(get_mobject(deformer))
+    return fn_filter.indexForOutputShape(get_dag_path(shape).node())
+
+
+def get_target_names(deformer):
+    """blendShape 의 {weight index: alias}."""
+    aliases = cmds.aliasAttr(deformer, query=True) or []
+    return {
+        int(attr.split("[")[-1][:-1]): alias
+        for alias, attr in zip(aliases[::2], aliases[1::2])
+        if attr.startswith("weight[")
+    }
+
+
+def get_layer_plugs(deformer, index):
+    """skinCluster 가 아닌 deformer 의 weight array plug.
+
+    Returns:
+        dict: {layer 이름: MPlug}
+    """
+    fn_node = om.MFnDependencyNode(get_mobject(deformer))
+    if fn_node.typeName != "blendShape":
+        weight_list = fn_node.findPlug("weightList", False)
+        element = weight_list.elementByLogicalIndex(index)
+        return {"weights": element.child(fn_node.attribute("weights"))}
+
+    input_target = fn_node.findPlug("inputTarget", False).elementByLogicalIndex(index)
+    layers = {"baseWeights": input_target.child(fn_node.attribute("baseWeights"))}
+    names = get_target_names(deformer)
+    group = input_target.child(fn_node.attribute("inputTargetGroup"))
+    for i in group.getExistingArrayAttributeIndices():
+        plug = group.elementByLogicalIndex(i).child(fn_node.attribute("targetWeights"))
+        layers[f"target:{names.get(i, i)}"] = plug
+    return layers
+
+
+def get_target_plug(deformer, index, layer):
+    """scene 에 weight 가 없는 blendShape target layer 의 plug.
+
+    alias 또는 weight index 로 찾습니다. 찾을 수 없다면 None.
+    """
+    name = layer.split(":", 1)[1]
+    targets = {v: k for k, v in get_target_names(deformer).items()}
+    if name in targets:
+        target_index = targets[name]
+    elif name.isdigit():
+        target_index = int(name)
+    else:
+        return None
+    fn_node = om.MFnDependencyNode(get_mobject(deformer))
+    input_target = fn_node.findPlug("inputTarget", False).elementByLogicalIndex(index)
+    group = input_target.child(fn_node.attribute("inputTargetGroup"))
+    return group.elementByLogicalIndex(target_index).child(
+        fn_node.attribute("targetWeights")
+    )
+
+
+def get_points(mobject):
+    """geometry(shape, data) 의 object space point 와 mesh 의 triangle.
+
+    Returns:
+        tuple: (points (n, 3), triangles (t, 3) 또는 None)
+    """
+    if mobject.hasFn(om.MFn.kMesh):
+        fn_mesh = om.MFnMesh(mobject)
+        points = np.array(fn_mesh.getPoints(om.MSpace.kObject))[:, :3]
+        triangles = np.array(fn_mesh.getTriangles()[1], dtype=np.int32)
+        return points, triangles.reshape(-1, 3)
+    if mobject.hasFn(om.MFn.kNurbsCurve):
+        return np.array(om.MFnNurbsCurve(mobject).cvPositions())[:, :3], None
+    if mobject.hasFn(om.MFn.kNurbsSurface):
+        return np.array(om.MFnNurbsSurface(mobject).cvPositions())[:, :3], None
+    raise RuntimeError(f"{mobject.apiTypeStr} 을 지원하지 않습니다.")
+
+
+def get_input_points(deformer, shape):
+    """deformer 의 입력 geometry 의 point. deformer 가 없다면 shape 의 point 입니다.
+
+    deform 되기 전의 point 를 사용하므로 pose 에 영향을 받지 않습니다.
+    """
+    mobject = get_dag_path(shape).node()
+    if cmds.objExists(deformer):
+        try:
+            index = get_geometry_index(deformer, shape)
+            fn_filter = oma.MFnGeometryFilter(get_mobject(deformer))
+            mobject = fn_filter.inputShapeAtIndex(index)
+        except RuntimeError:
+            pass
+    return get_points(mobject)
+
+
+def get_attributes(deformer, attributes):
+    """DEFORMER_TYPE_TABLE attribute 값. multi attribute 는 {index: value} 입니다."""
+    values = {}
+    for attr in attributes:
+        if not cmds.attributeQuery(attr, node=deformer, exists=True):
+            continue
+        if cmds.attributeQuery(attr, node=deformer, multi=True):
+            indices = cmds.getAttr(f"{deformer}.{attr}", multiIndices=True) or []
+            values[attr] = {
+                str(i): float(cmds.getAttr(f"{deformer}.{attr}[{i}]")) for i in indices
+            }
+        else:
+            value = cmds.getAttr(f"{deformer}.{attr}")
+            if isinstance(value, (bool, int, float)):
+                values[attr] = float(value)
+    return values
+
+
+def set_attributes(deformer, values):
+    for attr, value in values.items():
+        try:
+            if isinstance(value, dict):
+                for i, v in value.items():
+                    cmds.setAttr(f"{deformer}.{attr}[{i}]", v)
+            else:
+                cmds.setAttr(f"{deformer}.{attr}", value)
+        except RuntimeError as e:
+            logger.warning(f"{deformer}.{attr} 를 설정할 수 없습니다. {e}")
+
+
+# endregion
+
+
+# region WEIGHT MAP
+def read_plug_weights(plug, count, default_value=1.0):
+    """weight array plug(weightList[i].weights 등) 를 MArrayDataHandle 로 한번에 읽습니다.
+
+    element 마다 plug 를 만들지 않으므로 painted map 이 많은 deformer 에서 빠릅니다.
+
+    Returns:
+        np.ndarray: (count,) 없는 element 는 default_value
+    """
+    values = np.full(count, default_value, dtype=np.float64)
+    handle = plug.asMDataHandle()
+    try:
+        array = om.MArrayDataHandle(handle)
+        element_count = len(array)
+        indices = np.empty(element_count, dtype=np.int64)
+        elements = np.empty(element_count, dtype=np.float64)
+        for i in range(element_count):
+            indices[i] = array.elementLogicalIndex()
+            elements[i] = array.inputValue().asFloat()
+            array.next()
+    finally:
+        plug.destructHandle(handle)
+    mask = indices < count
+    values[indices[mask]] = elements[mask]
+    return values
+
+
+def write_plug_weights(plug, values, default_value=1.0):
+    """default 가 아닌 weight 만 MArrayDataBuilder 로 한번에 씁니다.
+
+    기존 element 는 지우므로 저장되지 않은 weight 는 default 가 됩니다.
+    setMDataHandle 한번으로 적용하므로 element 마다 dirty 를 전파하지 않습니다.
+    """
+    indices = np.flatnonzero(values != default_value)
+    existing = plug.getExistingArrayAttributeIndices()
+    handle = plug.asMDataHandle()
+    try:
+        array = om.MArrayDataHandle(handle)
+        builder = array.builder()
+        for i in existing:
+            builder.removeElement(i)
+        for i, value in zip(indices.tolist(), values[indices].tolist()):
+            builder.addElement(i).setFloat(value)
+        array.set(builder)
+        plug.setMDataHandle(handle)
+    finally:
+        plug.destructHandle(handle)
+
+
+def write_plug_weights_by_element(plug, values, default_value=1.0):
+    """data handle 을 만들 수 없는 plug(새 blendShape target 등) 에 element 마다 씁니다."""
+    existing = plug.getExistingArrayAttributeIndices()
+    existing = [i for i in existing if i < len(values)]
+    indices = np.union1d(existing, np.flatnonzero(values != default_value))
+    for i in indices.astype(np.int64).tolist():
+        plug.elementByLogicalIndex(i).setDouble(values[i])
+
+
+# endregion
+
+
+# region EXPORT
+def read_skin_weights(deformer, shape):
+    """Returns: tuple: (weights (vertex, influence) 배열, blend weights)"""
+    fn_skin = get_skin_cluster(deformer)
+    dag_path = get_dag_path(shape)
+    component = get_component(dag_path)
+    values, influence_count = fn_skin.getWeights(dag_path, component)
+    weights = np.array(values, dtype=np.float64).reshape(-1, influence_count)
+    blend_weights = np.array(
+        fn_skin.getBlendWeights(dag_path, component), dtype=np.float32
+    )
+    return weights, blend_weights
+
+
+def export_weights(
+    directory, deformer, prune=PRUNE_THRESHOLD, max_influences=MAX_INFLUENCES
+):
+    """deformer 의 geometry 마다 .npz 를 export 합니다.
+
+    Args:
+        directory (str): export 디렉토리
+        deformer (str): DEFORMER_TYPE_TABLE 의 deformer
+        prune (float, optional): Defaults to PRUNE_THRESHOLD.
+        max_influences (int, optional): skinCluster 만 사용합니다. Defaults to MAX_INFLUENCES.
+
+    Returns:
+        list: export 된 파일 경로
+    """
+    start_time = time.perf_counter()
+    directory = Path(directory)
+    deformer_type = cmds.nodeType(deformer)
+    attributes = get_attributes(deformer, rigkit.DEFORMER_TYPE_TABLE[deformer_type])
+    is_skin = deformer_type == "skinCluster"
+    if is_skin:
+        layers = get_influences(get_skin_cluster(deformer))
+        default_value = 0.0
+        if max_influences is None and cmds.getAttr(f"{deformer}.maintainMaxInfluences"):
+            max_influences = cmds.getAttr(f"{deformer}.maxInfluences")
+    else:
+        default_value = 1.0
+
+    paths = []
+    for obj in cmds.deformer(deformer, geometry=True, query=True) or []:
+        shape_info = get_shape_info(get_dag_path(obj))
+        count = int(np.prod(shape_info))
+        arrays = {}
+        points, triangles = get_input_points(deformer, obj)
+        arrays["points"] = points.astype(np.float32)
+        if triangles is not None:
+            arrays["triangles"] = triangles
+        if is_skin:
+            weights, arrays["blend_weights"] = read_skin_weights(deformer, obj)
+            sparse.prune_weights(weights, prune, max_influences)
+        else:
+            plugs = get_layer_plugs(deformer, get_geometry_index(deformer, obj))
+            layers = list(plugs)
+            weights = np.stack(
+                [read_plug_weights(plugs[x], count, default_value) for x in layers],
+                axis=1,
+            )
+            weights[np.abs(weights - default_value) < prune] = default_value
+        arrays["indptr"], arrays["indices"], arrays["data"] = sparse.to_csr(
+            weights, default_value
+        )
+
+        path = directory / get_file_name(obj, deformer, deformer_type)
+        # np.savez 는 확장자가 없으면 .npz 를 붙이므로 임시 파일도 .npz 로 끝냅니다.
+        temp_path = path.parent / f"{path.stem}.{os.getpid()}.tmp{WEIGHT_EXTENSION}"
+        np.savez_compressed(
+            temp_path,
+            version=np.array(FORMAT_VERSION),
+            deformer=np.array(deformer),
+            deformer_type=np.array(deformer_type),
+            shape=np.array(obj),
+            layers=np.array(layers, dtype=str),
+            shape_info=np.array(shape_info, dtype=np.int64),
+            default_value=np.array(default_value),
+            attributes=np.array(json.dumps(attributes)),
+            **arrays,
+        )
+        os.replace(temp_path, path)
+        # 같은 이름의 deformerWeights json 은 더 이상 사용하지 않습니다.
+        json_path = path.with_suffix(".json")
+        if json_path.exists():
+            json_path.unlink()
+        paths.append(path.as_posix())
+    logger.info(f"Export {deformer} weights {time.perf_counter() - start_time:.3f}s")
+    return paths
+
+
+# endregion
+
+
+# region IMPORT
+def read_weights(file_path):
+    """.npz 를 읽습니다. weight 는 CSR 그대로 돌려줍니다.
+
+    Returns:
+        dict: deformer, deformer_type, shape, layers, shape_info, default_value,
+            indptr, indices, data, blend_weights, attributes, points, triangles
+    """
+    with np.load(file_path) as f:
+        version = int(f["version"])
+        data = {
+            "version": version,
+            "deformer": str(f["deformer"]),
+            "shape": str(f["shape"]),
+            "shape_info": tuple(int(x) for x in f["shape_info"]),
+            "blend_weights": f["blend_weights"] if "blend_weights" in f else None,
+            "points": f["points"] if "points" in f else None,
+            "triangles": f["triangles"] if "triangles" in f else None,
+        }
+        if version < 2:
+            # skinCluster 만 지원하던 format. dense 또는 CSR float64.
+            data["deformer_type"] = "skinCluster"
+            data["layers"] = [str(x) for x in f["influences"]]
+            data["default_value"] = 0.0
+            data["attributes"] = dict(
+                zip(
+                    [str(x) for x in f["attribute_names"]],
+                    [float(x) for x in f["attribute_values"]],
+                )
+            )
+            if "weights" in f:
+                indptr, indices, values = sparse.to_csr(f["weights"])
+            else:
+                indptr, indices, values = f["indptr"], f["indices"], f["data"]
+        else:
+            data["deformer_type"] = str(f["deformer_type"])
+            data["layers"] = [str(x) for x in f["layers"]]
+            data["default_value"] = float(f["default_value"])
+            data["attributes"] = json.loads(str(f["attributes"]))
+            indptr, indices, values = f["indptr"], f["indices"], f["data"]
+        data["indptr"] = indptr
+        data["indices"] = indices
+        data["data"] = values
+    return data
+
+
+def remap_weights(data, points, shape_info, mode=REMAP_MODE):
+    """저장된 points 의 weight 를 새 points 로 옮긴 data 를 돌려줍니다.
+
+    CHUNK_SIZE point 씩 필요한 row 만 dense 로 풀어 remap 합니다.
+
+    Args:
+        data (dict): read_weights 의 data
+        points (np.ndarray): (n, 3) 새 point
+        shape_info (tuple): 새 geometry 의 shape info
+        mode (str, optional): "nearest" 또는 "barycentric". mesh 가 아니라면
+            nearest 를 사용합니다. Defaults to REMAP_MODE.
+
+    Returns:
+        dict: data
+    """
+    start_time = time.perf_counter()
+    indices, weights = remap_.get_mapping(
+        data["points"], points, data["triangles"], mode
+    )
+    layer_count = len(data["layers"])
+    default_value = data["default_value"]
+    chunks = []
+    for start in range(0, len(points), CHUNK_SIZE):
+        chunk_indices = indices[start : start + CHUNK_SIZE]
+        rows, local = np.unique(chunk_indices, return_inverse=True)
+        values = sparse.take_rows(
+            data["indptr"],
+            data["indices"],
+            data["data"],
+            rows,
+            layer_count,
+            default_value,
+        )
+        values = remap_.remap(
+            values,
+            local.reshape(chunk_indices.shape),
+            weights[start : start + CHUNK_SIZE],
+        )
+        values[np.abs(values - default_value) < REMAP_TOLERANCE] = default_value
+        chunks.append(sparse.to_csr(values, default_value))
+
+    data = dict(data)
+    data["indptr"], data["indices"], data["data"] = sparse.concatenate_csr(chunks)
+    if data["blend_weights"] is not None:
+        data["blend_weights"] = remap_.remap(data["blend_weights"], indices, weights)
+    data["shape_info"] = shape_info
+    data["points"] = points
+    data["triangles"] = None
+    logger.info(
+        f"Remap {data['deformer']} weights {len(indices)} points ({mode}) "
+        f"{time.perf_counter() - start_time:.3f}s"
+    )
+    return data
+
+
+def import_skin_weights(data):
+    """CSR 을 CHUNK_SIZE vertex 씩 dense 로 풀어 setWeights 합니다.
+
+    skinCluster 가 없다면 만들고 없는 influence 는 추가합니다.
+    scene 에 없는 joint 의 weight 는 버리고 normalize 합니다.
+    """
+    deformer_name = data["deformer"]
+    shape_name = data["shape"]
+    influences = data["layers"]
+    exists = [cmds.objExists(x) for x in influences]
+    missing = [x for x, e in zip(influences, exists) if not e]
+    if missing:
+        logger.warning(f"{deformer_name} 의 influence {missing} 가 존재하지 않습니다.")
+
+    try:
+        if not cmds.objExists(deformer_name):
+            joints = [x for x, e in zip(influences, exists) if e]
+            deformer_name = rigkit.create_skincluster(shape_name, joints, deformer_name)
+    except Exception as e:
+        return logger.warning(f"{deformer_name} 를 생성할 수 없습니다. {e}")
+
+    fn_skin = get_skin_cluster(deformer_name)
+    current = get_influences(fn_skin)
+    long_names = cmds.ls(current, long=True)
+    file_long_names = {
+        x: cmds.ls(x, long=True)[0] for x, e in zip(influences, exists) if e
+    }
+    add = [x for x, name in file_long_names.items() if name not in long_names]
+    if add:
+        cmds.skinCluster(deformer_name, edit=True, addInfluence=add, weight=0.0)
+        current = get_influences(fn_skin)
+        long_names = cmds.ls(current, long=True)
+
+    # file 의 influence column -> skinCluster 의 influence index
+    columns = [
+        (column, long_names.index(file_long_names[x]))
+        for column, x in enumerate(influences)
+        if x in file_long_names
+    ]
+    dag_path = get_dag_path(shape_name)
+    count = int(np.prod(data["shape_info"]))
+    shape = (count, len(influences))
+    # nurbsSurface component 는 나눌 수 없으므로 한번에 씁니다.
+    chunk_size = CHUNK_SIZE if len(data["shape_info"]) == 1 else count
+    influence_indices = om.MIntArray(list(range(len(current))))
+    for start in range(0, count, chunk_size):
+        rows = slice(start, start + chunk_size)
+        chunk = sparse.from_csr(
+            data["indptr"], data["indices"], data["data"], shape, rows=rows
+        )
+        weights = np.zeros((chunk.shape[0], len(current)), dtype=np.float64)
+        for column, index in columns:
+            weights[:, index] += chunk[:, column]
+        # float32 로 저장된 weight 를 다시 normalize 합니다.
+        if data["attributes"].get("normalizeWeights", 1):
+            total = weights.sum(axis=1, keepdims=True)
+            np.divide(weights, total, out=weights, where=total > 0)
+        component = get_component(dag_path, range(start, start + chunk.shape[0]))
+        fn_skin.setWeights(
+            dag_path,
+            component,
+            influence_indices,
+            om.MDoubleArray(weights.ravel().tolist()),
+            normalize=False,
+        )
+    if data["blend_weights"] is not None:
+        fn_skin.setBlendWeights(
+            dag_path,
+            get_component(dag_path),
+            om.MDoubleArray(data["blend_weights"].astype(np.float64).tolist()),
+        )
+    return deformer_name
+
+
+def import_plug_weights(data):
+    """layer 마다 default 가 아닌 weight 만 write_plug_weights 로 씁니다."""
+    deformer_name = data["deformer"]
+    if not cmds.objExists(deformer_name):
+        return logger.warning(f"{deformer_name} 가 존재하지 않습니다.")
+    index = get_geometry_index(deformer_name, data["shape"])
+    plugs = get_layer_plugs(deformer_name, index)
+    count = int(np.prod(data["shape_info"]))
+    default_value = data["default_value"]
+    for column, layer in enumerate(data["layers"]):
+        plug = plugs.get(layer)
+        if plug is None and layer.startswith("target:"):
+            plug = get_target_plug(deformer_name, index, layer)
+        if plug is None:
+            logger.warning(f"{deformer_name} 의 {layer} 가 존재하지 않습니다.")
+            continue
+        values = sparse.get_column(
+            data["indptr"], data["indices"], data["data"], count, column, default_value
+        )
+        try:
+            write_plug_weights(plug, values, default_value)
+        except RuntimeError:
+            write_plug_weights_by_element(plug, values, default_value)
+    return deformer_name
+
+
+def import_weights(file_path, remap=None, data=None):
+    """.npz 의 weight 를 deformer 에 적용합니다. MPlug, setWeights 는 undo 되지 않습니다.
+
+    Args:
+        file_path (str): .npz 파일
+        remap (str, optional): "nearest" 또는 "barycentric". vertex 순서와 관계없이
+            저장된 point 위치로 weight 를 옮깁니다. None 이라면 vertex 수가 다를 때만
+            REMAP_MODE 로 remap 합니다. Defaults to None.
+        data (dict, optional): 미리 읽은 read_weights 의 data. Defaults to None.
+    """
+    start_time = time.perf_counter()
+    if data is None:
+        data = read_weights(file_path)
+    if data["version"] > FORMAT_VERSION:
+        return logger.warning(
+            f"{file_path} 의 version {data['version']} 을 지원하지 않습니다."
+        )
+    shape_name = data["shape"]
+    if not cmds.objExists(shape_name):
+        return logger.warning(f"{shape_name} 가 존재하지 않습니다.")
+    shape_info = get_shape_info(get_dag_path(shape_name))
+    if remap is None and shape_info != data["shape_info"]:
+        remap = REMAP_MODE
+        logger.info(
+            f"{shape_name} 의 vertex 수가 다릅니다. {data['shape_info']} -> {shape_info}"
+        )
+    if remap:
+        if data["points"] is None:
+            return logger.warning(
+                f"{file_path} 에 point 가 없으므로 {shape_name} 에 remap 할 수 없습니다."
+            )
+        points, _ = get_input_points(data["deformer"], shape_name)
+        data = remap_weights(data, points, shape_info, remap)
+    elif shape_info != data["shape_info"]:
+        return logger.warning(
+            f"{shape_name} 의 vertex 수가 다릅니다. {data['shape_info']} -> {shape_info}"
+        )
+
+    if data["deformer_type"] == "skinCluster":
+        deformer_name = import_skin_weights(data)
+    else:
+        deformer_name = import_plug_weights(data)
+    if not deformer_name:
+        return
+    set_attributes(deformer_name, data["attributes"])
+    logger.info(
+        f"Import {deformer_name} weights {time.perf_counter() - start_time:.3f}s"
+    )
+    return deformer_name
+
+
+# endregion
+
+
+# region PIPELINE
+def decode(file_path):
+    """weight 파일을 읽습니다. scene 에 접근하지 않으므로 background 에서 실행합니다.
+
+    Returns:
+        tuple: (data, 읽은 시간)
+    """
+    start_time = time.perf_counter()
+    path = Path(file_path)
+    if path.suffix == WEIGHT_EXTENSION:
+        data = read_weights(path.as_posix())
+    else:
+        with open(path, "r") as f:
+            data = json.load(f)
+    return data, time.perf_counter() - start_time
+
+
+def get_weight_files(directory):
+    """import 할 weight 파일. 큰 파일부터 정렬합니다.
+
+    같은 이름의 .npz 가 있는 json 은 제외합니다.
+    """
+    files = [x for x in Path(directory).iterdir() if x.is_file()]
+    fast = {x.stem for x in files if x.suffix == WEIGHT_EXTENSION}
+    files = [
+        x
+        for x in files
+        if x.suffix == WEIGHT_EXTENSION or (x.suffix == ".json" and x.stem not in fast)
+    ]
+    return sorted(files, key=lambda x: (-x.stat().st_size, x.name))
+
+
+def import_directory(directory, remap=None, prefetch=PREFETCH):
+    """background thread 가 다음 prefetch 개의 파일을 읽는 동안 main thread 가 적용합니다.
+
+    큰 파일을 먼저 읽고 적용하므로 작은 파일의 decode 는 큰 파일의 apply 와 겹칩니다.
+    wait 은 main thread 가 decode 를 기다린 시간입니다.
+
+    Args:
+        directory (str): weight 디렉토리
+        remap (str, optional): .npz 의 remap mode. Defaults to None.
+        prefetch (int, optional): 미리 읽는 파일 수. Defaults to PREFETCH.
+
+    Returns:
+        list: 파일별 시간 [{"file", "size", "decode", "wait", "apply"}]
+    """
+    start_time = time.perf_counter()
+    files = iter(get_weight_files(directory))
+    pending = collections.deque()
+    results = []
+    with futures.ThreadPoolExecutor(
+        max_workers=DECODE_WORKERS, thread_name_prefix="domino_weights"
+    ) as executor:
+
+        def fill():
+            while len(pending) <= prefetch:
+                path = next(files, None)
+                if path is None:
+                    return
+                pending.append((path, executor.submit(decode, path)))
+
+        fill()
+        while pending:
+            path, future = pending.popleft()
+            fill()
+            wait_time = time.perf_counter()
+            try:
+                data, decode_time = future.result()
+            except Exception as e:
+                logger.warning(f"{path.name} 를 읽을 수 없습니다. {e}")
+                continue
+            wait_time = time.perf_counter() - wait_time
+
+            apply_time = time.perf_counter()
+            if path.suffix == WEIGHT_EXTENSION:
+                import_weights(path.as_posix(), remap=remap, data=data)
+            else:
+                rigkit.import_weight(path.as_posix(), data=data)
+            apply_time = time.perf_counter() - apply_time
+
+            result = {
+                "file": path.name,
+                "size": path.stat().st_size / 1024 / 1024,
+                "decode": decode_time,
+                "wait": wait_time,
+                "apply": apply_time,
+            }
+            results.append(result)
+            logger.info(
+                f"\t{result['file']} {result['size']:.2f}MB "
+                f"decode {decode_time:.3f}s wait {wait_time:.3f}s "
+                f"apply {apply_time:.3f}s"
+            )
+
+    if results:
+        logger.info(
+            f"Import {len(results)} weight files {time.perf_counter() - start_time:.3f}s "
+            f"(decode {sum(x['decode'] for x in results):.3f}s, "
+            f"wait {sum(x['wait'] for x in results):.3f}s, "
+            f"apply {sum(x['apply'] for x in results):.3f}s)"
+        )
+    return results
+
+
+# endregion
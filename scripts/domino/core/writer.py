@@ -0,0 +1,179 @@
+"""save 의 파일 쓰기를 background thread 에서 처리합니다.
+
+scene query 는 main thread 에서 data 를 모으고 json encoding, 파일 쓰기는
+thread pool 에 넘깁니다. save 는 SaveHandle 을 돌려주며 ui 는 progress, error 를
+polling 합니다.
+
+logger 의 MayaGuiLogHandler 는 main thread 에서만 사용할 수 있으므로 thread pool 의
+함수는 logger 대신 SaveHandle.log 로 message 를 남기고 main thread 의
+flush_log (poll, wait) 에서 출력합니다.
+
+    handle = SaveHandle(file_path)
+    handle.submit("space", write_json, path, data)   # thread pool
+    handle.finalize(manifest.write)                  # 모든 쓰기가 끝난 뒤
+    handle.start()
+"""
+
+# domino
+from domino.core.utils import logger
+
+# built-ins
+from concurrent import futures
+from pathlib import Path
+import json
+import logging
+import os
+import threading
+import traceback
+
+MAX_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+_EXECUTOR = None
+_LOCK = threading.Lock()
+# file path -> 진행 중인 SaveHandle
+_HANDLES = {}
+
+
+def get_executor():
+    global _EXECUTOR
+    with _LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = futures.ThreadPoolExecutor(
+                max_workers=MAX_WORKERS, thread_name_prefix="domino_writer"
+            )
+    return _EXECUTOR
+
+
+def write_json(file_path, data, indent=2):
+    """임시 파일에 쓴 뒤 교체하므로 쓰는 중인 파일을 읽지 않습니다."""
+    path = Path(file_path)
+    temp_path = path.parent / f"{path.name}.{threading.get_ident()}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(data, f, indent=indent)
+    os.replace(temp_path, path)
+    return path.as_posix()
+
+
+def snapshot(data):
+    """background 에서 쓸 data 의 dict, list 구조를 복사합니다."""
+    if isinstance(data, dict):
+        return {k: snapshot(v) for k, v in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [snapshot(x) for x in data]
+    return data
+
+
+def wait(file_path=None, timeout=None):
+    """진행 중인 save 가 끝날 때까지 기다립니다.
+
+    Args:
+        file_path (str, optional): None 이라면 모든 save. Defaults to None.
+        timeout (float, optional): Defaults to None.
+    """
+    with _LOCK:
+        if file_path is None:
+            handles = list(_HANDLES.values())
+        else:
+            handle = _HANDLES.get(Path(file_path).as_posix())
+            handles = [handle] if handle else []
+    for handle in handles:
+        handle.wait(timeout)
+
+
+class SaveHandle:
+    """save 하나의 background 작업.
+
+    Examples:
+        >>> handle = save(file_path, background=True)
+        >>> handle.progress()
+        (3, 12)
+        >>> handle.done(), handle.errors()
+    """
+
+    def __init__(self, file_path):
+        self.file_path = Path(file_path).as_posix()
+        self._futures = {}
+        self._finalizers = []
+        self._errors = []
+        self._messages = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._done = threading.Event()
+
+    def submit(self, key, func, *args, **kwargs):
+        """func 를 thread pool 에서 실행합니다. scene 에 접근하지 않는 함수만 사용합니다."""
+        future = get_executor().submit(func, *args, **kwargs)
+        self._futures[future] = key
+        return future
+
+    def finalize(self, func, *args, **kwargs):
+        """모든 submit 이 끝난 뒤 background 에서 순서대로 실행합니다."""
+        self._finalizers.append((func, args, kwargs))
+
+    def start(self):
+        with _LOCK:
+            _HANDLES[self.file_path] = self
+        self._thread = threading.Thread(
+            target=self._run, name="domino_writer_finalize", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def log(self, message, level=logging.INFO):
+        """thread pool 에서 남기는 message. flush_log 에서 main thread 로 출력됩니다."""
+        with self._lock:
+            self._messages.append((level, message))
+
+    def flush_log(self):
+        """쌓인 message 를 출력합니다. main thread 에서 호출합니다."""
+        with self._lock:
+            messages, self._messages = self._messages, []
+        for level, message in messages:
+            logger.log(level, message)
+
+    def _add_error(self, key, e):
+        message = "".join(traceback.format_exception_only(type(e), e)).strip()
+        with self._lock:
+            self._errors.append((key, message))
+
+    def _run(self):
+        try:
+            for future in futures.as_completed(list(self._futures)):
+                e = future.exception()
+                if e is not None:
+                    self._add_error(self._futures[future], e)
+            for func, args, kwargs in self._finalizers:
+                try:
+                    func(*args, **kwargs)
+                except Exception as e:
+                    self._add_error(getattr(func, "__name__", "finalize"), e)
+        finally:
+            with _LOCK:
+                if _HANDLES.get(self.file_path) is self:
+                    _HANDLES.pop(self.file_path)
+            self._done.set()
+
+    def progress(self):
+        """Returns: tuple: (끝난 작업 수, 전체 작업 수)"""
+        total = len(self._futures) + len(self._finalizers)
+        count = sum(1 for future in self._futures if future.done())
+        if self._done.is_set():
+            count = total
+        return count, total
+
+    def done(self):
+        return self._done.is_set()
+
+    def errors(self):
+        """Returns: list: [(key, message)]"""
+        with self._lock:
+            return list(self._errors)
+
+    def wait(self, timeout=None):
+        """Returns: bool: timeout 전에 끝났다면 True"""
+        finished = self._done.wait(timeout)
+        self.flush_log()
+        if finished:
+            for key, message in self.errors():
+                logger.error(f"Save {key} 실패했습니다. {message}")
+        return finished
@@ -11,11 +11,13 @@ from domino.component import (
     RIG,
     GUIDE,
     RIG_SETS,
-    COMPONENTLIST,
+    REGISTRY,
     build,
     serialize,
     save,
     load,
+    list_components,
+    load_subtree,
     Name,
     SKEL,
     BREAK_POINT_RIG,
@@ -29,13 +31,14 @@ from domino.component import (
     BREAK_POINT_DEFORMERORDER,
     BREAK_POINT_POSTCUSTOMSCRIPTS,
 )
+from domino.core import get_mobject
+from domino.core.templates import TEMPLATES
 from domino.core.utils import logger
 from domino.dominosettings import Settings
 
 # built-ins
 from functools import partial
 from pathlib import Path
-import importlib
 import pprint
 import pickle
 import os
@@ -44,9 +47,6 @@ import re
 # icon
 icon_dir = Path(__file__).parent.parent.parent / "icons"
 
-# comopnent list
-COMPONENTLIST.remove("assembly")
-
 
 # region maya cb
 def cb_setup_output_joint(child, parent, client_data):
@@ -229,6 +229,9 @@ cmds.evalDeferred(command)"""
 
     # callback
     callback_id = None
+    dirty = True
+    # added_nodes 가 이보다 많다면 확인하지 않고 dirty 로 기록합니다. build 중 생성되는 transform.
+    added_nodes_limit = 1000
 
     def __init__(self, parent=None):
         if cmds.workspaceControl(self.control_name, query=True, exists=True):
@@ -238,6 +241,18 @@ cmds.evalDeferred(command)"""
 
         super(Manager, self).__init__(parent=parent)
         self.setObjectName(self.ui_name)
+        # rig 변경을 기록하는 callback. manager 가 숨겨져 있어도 유지하고 닫을 때 제거합니다.
+        self.dirty_callback_ids = []
+        self.root_callback_ids = []
+        # workspaceControl 이 삭제되거나 module 이 reload 되어 widget 이 삭제될 때 제거합니다.
+        dirty_callback_ids = self.dirty_callback_ids
+        root_callback_ids = self.root_callback_ids
+        self.destroyed.connect(
+            lambda *args: (
+                Manager.remove_callbacks(dirty_callback_ids),
+                Manager.remove_callbacks(root_callback_ids),
+            )
+        )
         self.expand_state = []
         self.setWindowTitle("Domino Manager")
 
@@ -250,12 +265,34 @@ cmds.evalDeferred(command)"""
         self.command_menu = self.menu_bar.addMenu("Commands")
         self.build_new_scene_action = QtGui.QAction("Build in new scene")
         self.build_new_scene_action.triggered.connect(partial(self.build, True))
+        self.build_new_scene_fast_action = QtGui.QAction(
+            "Build in new scene (fast, no undo)"
+        )
+        self.build_new_scene_fast_action.triggered.connect(
+            partial(self.build, True, True)
+        )
+        self.build_incremental_action = QtGui.QAction("Build incremental")
+        self.build_incremental_action.triggered.connect(partial(self.build, False))
         self.print_component_action = QtGui.QAction("Print component")
         self.print_component_action.triggered.connect(self.print_component)
         self.command_menu.addAction(self.build_new_scene_action)
+        self.command_menu.addAction(self.build_new_scene_fast_action)
+        self.command_menu.addAction(self.build_incremental_action)
         self.command_menu.addAction(self.print_component_action)
+        self.command_menu.addSeparator()
+        self.binary_format_action = QtGui.QAction("Save binary sidecar (v2)")
+        self.binary_format_action.setCheckable(True)
+        self.binary_format_action.setChecked(
+            bool(cmds.optionVar(query="dominoBinaryFormat"))
+        )
+        self.binary_format_action.toggled.connect(self.set_binary_format)
+        self.command_menu.addAction(self.binary_format_action)
 
         self.template_menu = self.menu_bar.addMenu("Templates")
+        self.template_menu.setToolTipsVisible(True)
+        self.template_menu.aboutToShow.connect(self.update_template_menu)
+        self.template_menu_version = -1
+        self.template_actions = []
         # endregion
 
         # region -    Manager / domino path
@@ -290,6 +327,16 @@ cmds.evalDeferred(command)"""
         domino_layout.addWidget(self.domino_path_version_up_btn)
         domino_layout.setSpacing(4)
         layout.addLayout(domino_layout)
+        self.save_progress_bar = QtWidgets.QProgressBar()
+        self.save_progress_bar.setFixedHeight(12)
+        self.save_progress_bar.setTextVisible(False)
+        self.save_progress_bar.hide()
+        layout.addWidget(self.save_progress_bar)
+        self.save_handle = None
+        self.added_nodes = []
+        self.save_timer = QtCore.QTimer()
+        self.save_timer.setInterval(100)
+        self.save_timer.timeout.connect(self.poll_save)
         # endregion
 
         # region -    Manager / tree
@@ -350,6 +397,8 @@ QTreeView::branch:open:has-children  {{
         self.reuse_mirror_action.triggered.connect(partial(self.mirror_component, True))
         self.new_mirror_action = QtGui.QAction("Mirror(new)")
         self.new_mirror_action.triggered.connect(partial(self.mirror_component, False))
+        self.load_subtree_action = QtGui.QAction("Load subtree from file")
+        self.load_subtree_action.triggered.connect(self.load_subtree)
         self.remove_action = QtGui.QAction("Remove")
         self.remove_action.triggered.connect(self.remove_component)
 
@@ -364,6 +413,7 @@ QTreeView::branch:open:has-children  {{
         self.context_menu.addAction(self.duplicate_action)
         self.context_menu.addAction(self.reuse_mirror_action)
         self.context_menu.addAction(self.new_mirror_action)
+        self.context_menu.addAction(self.load_subtree_action)
         self.context_menu.addSeparator()
         self.context_menu.addAction(self.remove_action)
         self.rig_tree_view.customContextMenuRequested[QtCore.QPoint].connect(
@@ -383,11 +433,113 @@ QTreeView::branch:open:has-children  {{
         self.domino_path_line_edit.setText(path)
         os.environ["DOMINO_RIG_WORK_PATH"] = path
 
-    def refresh(self):
-        self.rig_tree_model.serialize()
+    # region -    Manager / dirty
+    def mark_dirty(self, *args):
+        self.dirty = True
+
+    def cb_node_added(self, node, client_data):
+        # attribute 는 생성 후에 추가되므로 refresh 에서 확인합니다.
+        if self.dirty:
+            return
+        if len(self.added_nodes) >= self.added_nodes_limit:
+            self.dirty = True
+            self.added_nodes = []
+            return
+        self.added_nodes.append(om.MObjectHandle(node))
+
+    def cb_node_removed(self, node, client_data):
+        fn_node = om.MFnDependencyNode(node)
+        if fn_node.hasAttribute("is_domino_rig_root") or fn_node.hasAttribute(
+            "is_domino_guide_root"
+        ):
+            self.dirty = True
+
+    def cb_attribute_changed(self, msg, plug, other_plug, client_data):
+        self.dirty = True
+
+    def add_dirty_callbacks(self):
+        if self.dirty_callback_ids:
+            return
+        for msg in (
+            om.MSceneMessage.kAfterNew,
+            om.MSceneMessage.kAfterOpen,
+            om.MSceneMessage.kAfterImport,
+            om.MSceneMessage.kAfterCreateReference,
+            om.MSceneMessage.kAfterRemoveReference,
+        ):
+            self.dirty_callback_ids.append(
+                om.MSceneMessage.addCallback(msg, self.mark_dirty)
+            )
+        for event in ("Undo", "Redo"):
+            self.dirty_callback_ids.append(
+                om.MEventMessage.addEventCallback(event, self.mark_dirty)
+            )
+        self.dirty_callback_ids.append(
+            om.MDGMessage.addNodeAddedCallback(self.cb_node_added, "transform")
+        )
+        self.dirty_callback_ids.append(
+            om.MDGMessage.addNodeRemovedCallback(self.cb_node_removed, "transform")
+        )
+        logger.info(f"Add manager dirty callback ids: {self.dirty_callback_ids}")
+
+    @staticmethod
+    def remove_callbacks(callback_ids):
+        for callback_id in callback_ids:
+            try:
+                om.MMessage.removeCallback(callback_id)
+            except RuntimeError:
+                pass
+        callback_ids.clear()
+
+    def watch_rig_roots(self):
+        """rig, guide root 의 attribute 변경을 callback 으로 기록합니다."""
+        self.remove_callbacks(self.root_callback_ids)
+        if self.rig_tree_model.rig is None:
+            return
+        stack = [self.rig_tree_model.rig]
+        while stack:
+            component = stack.pop(0)
+            for node in (component.rig_root, component.guide_root):
+                if not cmds.objExists(node):
+                    continue
+                self.root_callback_ids.append(
+                    om.MNodeMessage.addAttributeChangedCallback(
+                        get_mobject(node), self.cb_attribute_changed
+                    )
+                )
+            stack.extend(component["children"])
+
+    def is_dirty(self):
+        if self.dirty:
+            return True
+        for handle in self.added_nodes:
+            if not handle.isValid():
+                continue
+            fn_node = om.MFnDependencyNode(handle.object())
+            if fn_node.hasAttribute("is_domino_rig_root"):
+                self.dirty = True
+                break
+        self.added_nodes = []
+        return self.dirty
+
+    def update_model(self):
+        """in-memory rig 를 수정한 manager 작업 뒤 serialize 없이 tree 를 갱신합니다."""
         self.rig_tree_model.populate_model()
+        self.watch_rig_roots()
+        self.dirty = False
+        self.added_nodes = []
+
+    # endregion
+
+    def refresh(self, force=False):
+        """rig 가 dirty 이거나 force 가 True 일 때만 scene 을 serialize 합니다."""
+        if force or self.is_dirty():
+            self.rig_tree_model.serialize()
+            self.update_model()
         self.component_list_widget.clear()
-        self.component_list_widget.addItems(COMPONENTLIST)
+        self.component_list_widget.addItems(
+            [x for x in REGISTRY.names() if x != "assembly"]
+        )
         os.environ.pop("DOMINO_RIG_WORK_PATH", None)
 
         if self.rig_tree_model.rig and cmds.objExists(
@@ -399,26 +551,34 @@ QTreeView::branch:open:has-children  {{
             if domino_path:
                 self.set_domino_work_path(domino_path)
 
-        template_dir = os.getenv("DOMINO_RIG_TEMPLATE_DIR", None)
+        # template 디렉토리는 background 에서 확인하고 menu 는 열 때 갱신합니다.
+        TEMPLATES.refresh()
+
+    def update_template_menu(self):
+        """catalogue 가 바뀌었을 때만 Templates menu 를 다시 만듭니다."""
+        TEMPLATES.flush_log()
+        if self.template_menu_version == TEMPLATES.version and self.template_actions:
+            return
+        self.template_menu.clear()
         # 메모리에서 제거되는거 방지.
-        self.actions = []
-        menu = [
-            x
-            for x in self.menu_bar.children()
-            if isinstance(x, QtWidgets.QMenu) and x.title() == "Templates"
-        ][0]
-        if template_dir:
-            for template in Path(template_dir).iterdir():
-                if not template.is_file():
-                    continue
-                if template.suffix != ".domino":
-                    continue
-                action = QtGui.QAction(template.name.split(".")[0])
-                action.triggered.connect(
-                    partial(self.load_template, template.as_posix(), True)
-                )
-                menu.addAction(action)
-                self.actions.append(action)
+        self.template_actions = []
+        entries = TEMPLATES.entries()
+        if not entries:
+            text = "Loading..." if TEMPLATES.is_refreshing() else "No templates"
+            action = QtGui.QAction(text)
+            action.setEnabled(False)
+            self.template_menu.addAction(action)
+            self.template_actions.append(action)
+            return
+        for entry in entries:
+            action = QtGui.QAction(f"{entry['name']}  ({entry['count']})")
+            action.setToolTip(
+                "\n".join(f"{k} x{v}" for k, v in entry["components"].items())
+            )
+            action.triggered.connect(partial(self.load_template, entry["path"], True))
+            self.template_menu.addAction(action)
+            self.template_actions.append(action)
+        self.template_menu_version = TEMPLATES.version
 
     def set_modeling_path(self):
         file_path = cmds.fileDialog2(
@@ -525,10 +685,9 @@ QTreeView::branch:open:has-children  {{
                 return
             module_name = items[0].text()
             try:
-                module = importlib.import_module(f"domino.component.{module_name}")
+                component = REGISTRY.create(module_name)
             except ModuleNotFoundError:
                 return
-            component = module.Rig()
             if hasattr(component, "input_data"):
                 result = component.input_data()
                 if not result:
@@ -538,8 +697,7 @@ QTreeView::branch:open:has-children  {{
             # region 이미 존재하는 리그가 없다면 assembly 생성.
             rig = self.rig_tree_model.rig
             if rig is None:
-                assembly_module = importlib.import_module("domino.component.assembly")
-                rig = assembly_module.Rig()
+                rig = REGISTRY.create("assembly")
                 rig.populate()
                 rig.rig()
                 rig.attach_guide()
@@ -601,6 +759,7 @@ QTreeView::branch:open:has-children  {{
             # endregion
 
             # refresh model
+            self.update_model()
             self.refresh()
 
             cmds.select(selected) if selected else cmds.select(clear=True)
@@ -618,6 +777,7 @@ QTreeView::branch:open:has-children  {{
             for index in indexes:
                 item = self.rig_tree_model.itemFromIndex(index)
                 item.component.duplicate_component(True)
+            self.update_model()
             self.refresh()
         finally:
             cmds.undoInfo(closeChunk=True)
@@ -633,10 +793,75 @@ QTreeView::branch:open:has-children  {{
             for index in indexes:
                 item = self.rig_tree_model.itemFromIndex(index)
                 item.component.mirror_component(reuse_exists, True)
+            self.update_model()
             self.refresh()
         finally:
             cmds.undoInfo(closeChunk=True)
 
+    def load_subtree(self):
+        """다른 .domino 의 component subtree 를 선택한 component 아래에 추가합니다.
+
+        선택한 component 가 없다면 assembly 아래에 추가합니다.
+        """
+        rig = self.rig_tree_model.rig
+        if rig is None:
+            logger.warning("rig 가 없습니다.")
+            return
+        file_path = cmds.fileDialog2(
+            caption="Load Domino Subtree",
+            startingDirectory=cmds.workspace(query=True, rootDirectory=True),
+            fileFilter="Domino Rig (*.domino)",
+            fileMode=1,
+        )
+        if not file_path:
+            return
+        tree = list_components(file_path[0])
+
+        dialog = QtWidgets.QDialog(self)
+        dialog.setWindowTitle("Select Subtree")
+        dialog_layout = QtWidgets.QVBoxLayout(dialog)
+        tree_widget = QtWidgets.QTreeWidget()
+        tree_widget.setHeaderLabels(["Component", "Type"])
+        stack = [(tree, tree_widget)]
+        while stack:
+            data, parent_item = stack.pop(0)
+            item = QtWidgets.QTreeWidgetItem(
+                parent_item,
+                [
+                    "_".join([str(x) for x in data["identifier"] if str(x)]),
+                    data["component"],
+                ],
+            )
+            item.setData(0, QtCore.Qt.ItemDataRole.UserRole, data["path"])
+            stack.extend([(child, item) for child in data["children"]])
+        tree_widget.expandAll()
+        button_box = QtWidgets.QDialogButtonBox(
+            QtWidgets.QDialogButtonBox.StandardButton.Ok
+            | QtWidgets.QDialogButtonBox.StandardButton.Cancel
+        )
+        button_box.accepted.connect(dialog.accept)
+        button_box.rejected.connect(dialog.reject)
+        dialog_layout.addWidget(tree_widget)
+        dialog_layout.addWidget(button_box)
+        if not dialog.exec():
+            return
+        items = tree_widget.selectedItems()
+        if not items:
+            return
+        path = items[0].data(0, QtCore.Qt.ItemDataRole.UserRole)
+
+        parent = rig
+        indexes = self.rig_tree_view.selectedIndexes()
+        if indexes:
+            parent = self.rig_tree_model.itemFromIndex(indexes[0]).component
+        try:
+            cmds.undoInfo(openChunk=True)
+            rig.sync_from_scene()
+            load_subtree(file_path[0], path, parent)
+            self.refresh(force=True)
+        finally:
+            cmds.undoInfo(closeChunk=True)
+
     def remove_component(self):
         indexes = self.rig_tree_view.selectedIndexes()
         if not indexes:
@@ -648,6 +873,7 @@ QTreeView::branch:open:has-children  {{
             for index in indexes:
                 item = self.rig_tree_model.itemFromIndex(index)
                 item.component.remove_component()
+            self.update_model()
             self.refresh()
         finally:
             cmds.undoInfo(closeChunk=True)
@@ -669,13 +895,16 @@ QTreeView::branch:open:has-children  {{
                 component.rename_component(
                     component["name"]["value"], side, index, True
                 )
+            self.update_model()
             self.refresh()
         finally:
             cmds.undoInfo(closeChunk=True)
 
     # region -    Manager / Import, Export
     def save(self):
+        # tree item 이 새 rig 의 component 를 가리키도록 갱신합니다.
         self.rig_tree_model.serialize()
+        self.update_model()
         data = self.rig_tree_model.rig
         if not data:
             return
@@ -718,13 +947,43 @@ QTreeView::branch:open:has-children  {{
                 file_path = ensure_version_in_file_path(file_path)
         # endregion
 
-        save(file_path, data)
+        self.save_handle = save(
+            file_path,
+            data,
+            binary=self.binary_format_action.isChecked(),
+            background=True,
+        )
+        self.save_progress_bar.setValue(0)
+        self.save_progress_bar.show()
+        self.save_timer.start()
         if cmds.objExists(data.guide_root):
             cmds.setAttr(f"{data.guide_root}.domino_path", file_path, type="string")
         self.set_domino_work_path(file_path)
         ui = Settings.get_instance()
         ui.refresh()
 
+    def poll_save(self):
+        if self.save_handle is None:
+            self.save_timer.stop()
+            self.save_progress_bar.hide()
+            return
+        count, total = self.save_handle.progress()
+        self.save_progress_bar.setMaximum(total)
+        self.save_progress_bar.setValue(count)
+        # done 을 먼저 확인해야 마지막 message 까지 출력됩니다.
+        done = self.save_handle.done()
+        self.save_handle.flush_log()
+        if not done:
+            return
+        self.save_timer.stop()
+        self.save_progress_bar.hide()
+        for key, message in self.save_handle.errors():
+            logger.error(f"Save {key} 실패했습니다. {message}")
+        self.save_handle = None
+
+    def set_binary_format(self, checked):
+        cmds.optionVar(intValue=("dominoBinaryFormat", int(checked)))
+
     def load(self):
         mel.eval(
             """
@@ -748,6 +1007,13 @@ global proc DominoLoadOptionsUISetup(string $parent)
     radioButton -l "DeformerOrder" breakpoint_deformerorder;
     radioButton -l "Post Scripts" -select breakpoint_post_scripts;
 
+    separator -style "in" -height 12;
+    checkBox -l "Fast Build (no undo)" -v `optionVar -q "dominoFastBuild"` domino_fast_build;
+    int $use_cache = 0;
+    if (`optionVar -exists "dominoUseBuildCache"`)
+        $use_cache = `optionVar -q "dominoUseBuildCache"`;
+    checkBox -l "Use Build Cache" -v $use_cache domino_use_build_cache;
+
     // 컬렉션 이름을 optionVar에 저장
     optionVar -sv "dominoBreakPointCollection" $gDominoRadioCollection;
 }
@@ -760,6 +1026,8 @@ global proc DominoLoadOptionsUICommit(string $parent)
 
     // 선택된 버튼 이름도 optionVar 로 저장
     optionVar -sv "dominoBreakPoint" $sel;
+    optionVar -iv "dominoFastBuild" `checkBox -q -v domino_fast_build`;
+    optionVar -iv "dominoUseBuildCache" `checkBox -q -v domino_use_build_cache`;
 }
 """
         )
@@ -806,8 +1074,16 @@ global proc DominoLoadOptionsUICommit(string $parent)
             if tags:
                 cmds.delete(tags)
 
-            load(file_path[0], create=True, break_point=break_point)
-            self.refresh()
+            fast = bool(cmds.optionVar(q="dominoFastBuild"))
+            use_cache = bool(cmds.optionVar(q="dominoUseBuildCache"))
+            load(
+                file_path[0],
+                create=True,
+                break_point=break_point,
+                fast=fast,
+                use_cache=use_cache,
+            )
+            self.refresh(force=True)
             self.set_domino_work_path(file_path[0])
 
     def load_template(self, file_path, create):
@@ -821,22 +1097,28 @@ global proc DominoLoadOptionsUICommit(string $parent)
         tags = cmds.ls(type="controller")
         if tags:
             cmds.delete(tags)
-        load(file_path, create)
-        self.refresh()
+        load(file_path, create, data=TEMPLATES.read(file_path))
+        self.refresh(force=True)
 
     # endregion
-    def build(self, new_scene=False):
+    def build(self, new_scene=False, fast=False):
         rig = self.rig_tree_model.rig
         if rig:
+            # build 중 생성되는 node 는 cb_node_added 에서 기록하지 않습니다.
+            self.dirty = True
             if new_scene:
                 cmds.file(newFile=True, force=True)
-                build({}, rig)
+                build({}, rig, fast=fast)
+            elif cmds.objExists(RIG):
+                # scene 의 rig root 데이터와 기록된 content hash 를 비교합니다.
+                build({}, serialize(), incremental=True)
         orig_path = self.domino_path_line_edit.text()
-        self.refresh()
+        self.refresh(force=True)
         self.set_domino_work_path(orig_path)
 
     def showEvent(self, e):
         cmds.workspaceControl(self.control_name, edit=True, uiScript=self.ui_script)
+        self.add_dirty_callbacks()
         self.refresh()
         if self.callback_id is None:
             self.callback_id = om.MDagMessage.addParentAddedCallback(
@@ -852,6 +1134,14 @@ global proc DominoLoadOptionsUICommit(string $parent)
             self.callback_id = None
         super(Manager, self).hideEvent(e)
 
+    def dockCloseEventTriggered(self):
+        self.remove_callbacks(self.dirty_callback_ids)
+        self.remove_callbacks(self.root_callback_ids)
+        # 닫혀 있는 동안의 변경은 기록되지 않으므로 다시 열 때 serialize 합니다.
+        self.dirty = True
+        self.added_nodes = []
+        logger.info("Remove manager dirty callbacks")
+
     @classmethod
     def get_instance(cls):
         if cls._instance is None:
@@ -8,42 +8,31 @@ from maya.app.general.mayaMixin import MayaQWidgetDockableMixin
 
 # domino
 from domino.core.utils import logger
-from domino.component.assemblyui import Assembly
-from domino.component.pivot01ui import Pivot01
-from domino.component.cog01ui import COG01
-from domino.component.control01ui import Control01
-from domino.component.uicontainer01ui import UIContainer01
-from domino.component.fk01ui import Fk01
-from domino.component.fkik2jnt01ui import Fkik2Jnt01
-from domino.component.humanspine01ui import HumanSpine01
-from domino.component.humanneck01ui import HumanNeck01
-from domino.component.humanarm01ui import HumanArm01
-from domino.component.humanleg01ui import HumanLeg01
-from domino.component.eye01ui import Eye01
-from domino.component.psd01ui import Psd01
-from domino.component.chain01ui import Chain01
-from domino.component.foot01ui import Foot01
-from domino.component.sc01ui import Sc01
-
-
-UITABLE = {
-    "assembly": Assembly,
-    "pivot01": Pivot01,
-    "cog01": COG01,
-    "control01": Control01,
-    "uicontainer01": UIContainer01,
-    "fk01": Fk01,
-    "fkik2jnt01": Fkik2Jnt01,
-    "humanspine01": HumanSpine01,
-    "humanneck01": HumanNeck01,
-    "humanarm01": HumanArm01,
-    "humanleg01": HumanLeg01,
-    "eye01": Eye01,
-    "foot01": Foot01,
-    "psd01": Psd01,
-    "chain01": Chain01,
-    "sc01": Sc01,
-}
+from domino.component import REGISTRY
+
+# built-ins
+from collections.abc import Mapping
+
+
+class UITable(Mapping):
+    """component 이름 -> UI class.
+
+    UI module 은 처음 찾을 때 REGISTRY 를 통해 import 됩니다.
+    """
+
+    def __getitem__(self, key):
+        if key not in REGISTRY.names():
+            raise KeyError(key)
+        return REGISTRY.ui_class(key)
+
+    def __iter__(self):
+        return iter(REGISTRY.names())
+
+    def __len__(self):
+        return len(REGISTRY.names())
+
+
+UITABLE = UITable()
 
 
 def cb_auto_settings(*args):
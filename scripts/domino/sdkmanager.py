@@ -487,15 +487,8 @@ def import_sdk(file_path):
             anim.deserialize_fcurve(fcurve_data)
 
 
-def export_sdk(file_path):
-    sdk_node = get_sdk_node()
-    if sdk_node is None:
-        return
-
-    file_path = Path(file_path)
-    if not file_path.parent.exists():
-        return logger.warning(f"경로가 존재하지 않습니다: {file_path.parent}")
-
+def get_export_data():
+    """export 할 sdk data. 등록된 driven 의 fcurve 를 포함합니다."""
     data = get_data()
 
     for driver in data["sdk"].keys():
@@ -520,6 +513,19 @@ def export_sdk(file_path):
                 continue
 
             data["sdk"][driver]["fcurve"].append(anim.serialize_fcurve(anim_curve))
+    return data
+
+
+def export_sdk(file_path):
+    sdk_node = get_sdk_node()
+    if sdk_node is None:
+        return
+
+    file_path = Path(file_path)
+    if not file_path.parent.exists():
+        return logger.warning(f"경로가 존재하지 않습니다: {file_path.parent}")
+
+    data = get_export_data()
 
     with open(file_path, "w") as f:
         json.dump(data, f, indent=4)
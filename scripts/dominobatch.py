@@ -0,0 +1,349 @@
+"""여러 .domino 파일을 headless maya(mayapy) worker 로 병렬 build 합니다.
+
+coordinator 는 maya 없이 실행되며 worker process pool 을 관리합니다.
+worker 는 stdin 으로 json job 을 한 줄씩 받아 build 하고 stdout 으로
+json 결과를 한 줄씩 돌려줍니다.
+
+    job    {"id": 0, "file_path": "...", "break_point": 9, "output": "..."}
+    result {"id": 0, "status": "ok" | "error", "time": 1.0, "output": "...", "error": ""}
+
+Examples:
+    python dominobatch.py "D:/characters/*.domino" --workers 4 --break-point 9
+    python dominobatch.py a.domino b.domino --mayapy "C:/Program Files/Autodesk/Maya2025/bin/mayapy.exe"
+    python dominobatch.py "D:/characters/*.domino" --stand-in
+
+stand-in worker 는 maya 없이 protocol, pool 을 확인하는 용도입니다.
+"""
+
+# built-ins
+from pathlib import Path
+import argparse
+import glob
+import json
+import logging
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BREAK_POINT_POSTCUSTOMSCRIPTS = 9
+
+logger = logging.getLogger("DominoBatch")
+
+
+# region WORKER
+def run_job_stand_in(job):
+    """maya 없이 job 을 처리합니다. 파일이 존재하는지만 확인합니다."""
+    if not Path(job["file_path"]).exists():
+        raise FileNotFoundError(job["file_path"])
+    with open(job["file_path"], "r") as f:
+        json.load(f)
+    return job["output"]
+
+
+def initialize_maya():
+    import maya.standalone
+
+    maya.standalone.initialize(name="python")
+
+    from maya import cmds
+
+    if not cmds.pluginInfo("bifrostGraph", query=True, loaded=True):
+        cmds.loadPlugin("bifrostGraph", quiet=True)
+
+
+def run_job_maya(job):
+    """새 scene 에서 load 후 output 경로에 저장합니다.
+
+    build 는 error 를 logger 로만 남기므로 Domino logger 의 error 를 확인합니다.
+    """
+    from maya import cmds
+    from domino.component import load
+
+    errors = []
+
+    class ErrorHandler(logging.Handler):
+        def emit(self, record):
+            errors.append(record.getMessage())
+
+    handler = ErrorHandler(level=logging.ERROR)
+    domino_logger = logging.getLogger("Domino")
+    domino_logger.addHandler(handler)
+    try:
+        cmds.file(newFile=True, force=True)
+        load(
+            job["file_path"],
+            create=True,
+            break_point=job["break_point"],
+            fast=True,
+        )
+    finally:
+        domino_logger.removeHandler(handler)
+    if errors:
+        raise RuntimeError(errors[0])
+
+    cmds.file(rename=job["output"])
+    cmds.file(save=True, type="mayaBinary", force=True)
+    return job["output"]
+
+
+def worker(stand_in=False):
+    """stdin 의 job 을 처리하고 stdout 으로 결과를 보냅니다.
+
+    maya 가 stdout 에 출력하는 log 와 섞이지 않도록 protocol 용 fd 를 복제하고
+    fd 1 은 stderr 로 돌립니다.
+    """
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), "w", buffering=1)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    run_job = run_job_stand_in
+    if not stand_in:
+        sys.path.insert(0, Path(__file__).parent.as_posix())
+        initialize_maya()
+        run_job = run_job_maya
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        if job.get("command") == "quit":
+            break
+        start_time = time.perf_counter()
+        result = {"id": job["id"], "output": job["output"], "error": ""}
+        try:
+            result["output"] = run_job(job)
+            result["status"] = "ok"
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = f"{e.__class__.__name__}: {e}"
+        result["time"] = time.perf_counter() - start_time
+        protocol.write(json.dumps(result) + "\n")
+
+
+# endregion
+
+
+# region POOL
+class WorkerProcess:
+    """worker process 하나와 json line protocol."""
+
+    def __init__(self, command, log_path):
+        self.command = command
+        self.log_path = log_path
+        self.process = None
+        self._log = None
+
+    def start(self):
+        self._log = open(self.log_path, "a")
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self._log,
+            text=True,
+            bufsize=1,
+        )
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def run(self, job):
+        """job 을 보내고 결과를 기다립니다. worker 가 종료되면 error 결과를 돌려줍니다."""
+        if not self.is_alive():
+            self.start()
+        try:
+            self.process.stdin.write(json.dumps(job) + "\n")
+            self.process.stdin.flush()
+            line = self.process.stdout.readline()
+        except (BrokenPipeError, OSError) as e:
+            line = ""
+            logger.debug(e)
+        if not line:
+            self.process.wait()
+            return {
+                "id": job["id"],
+                "status": "error",
+                "time": 0.0,
+                "output": job["output"],
+                "error": f"worker exited ({self.process.returncode}), log: {self.log_path}",
+            }
+        return json.loads(line)
+
+    def stop(self):
+        if self.is_alive():
+            try:
+                self.process.stdin.write(json.dumps({"command": "quit"}) + "\n")
+                self.process.stdin.close()
+                self.process.wait(timeout=60)
+            except (BrokenPipeError, OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+        if self._log:
+            self._log.close()
+
+
+class Pool:
+    """worker process 마다 thread 하나가 job queue 를 처리합니다.
+
+    Examples:
+        >>> pool = Pool(get_worker_command(stand_in=True), workers=2)
+        >>> results = pool.run(jobs)
+    """
+
+    def __init__(self, command, workers=2, log_dir=None):
+        self.command = command
+        self.workers = max(1, workers)
+        self.log_dir = Path(log_dir or Path(tempfile.gettempdir()) / "dominobatch")
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+
+    def run(self, jobs):
+        job_queue = queue.Queue()
+        for job in jobs:
+            job_queue.put(job)
+        results = []
+        lock = threading.Lock()
+
+        def work(i):
+            process = WorkerProcess(self.command, self.log_dir / f"worker{i}.log")
+            try:
+                while True:
+                    try:
+                        job = job_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    result = process.run(job)
+                    result["file_path"] = job["file_path"]
+                    result["worker"] = i
+                    with lock:
+                        results.append(result)
+                    logger.info(
+                        f"[{result['status']:<5}] {result['time']:>8.2f}s {job['file_path']}"
+                    )
+            finally:
+                process.stop()
+
+        threads = [
+            threading.Thread(target=work, args=(i,), daemon=True)
+            for i in range(min(self.workers, len(jobs)))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return sorted(results, key=lambda x: x["id"])
+
+
+def get_worker_command(mayapy=None, stand_in=False):
+    if stand_in:
+        return [sys.executable, Path(__file__).as_posix(), "--worker", "--stand-in"]
+    mayapy = mayapy or os.getenv("DOMINO_MAYAPY", "mayapy")
+    return [mayapy, Path(__file__).as_posix(), "--worker"]
+
+
+# endregion
+
+
+# region JOB / REPORT
+def collect_files(patterns):
+    files = []
+    for pattern in patterns:
+        matches = glob.glob(pattern) if glob.has_magic(pattern) else [pattern]
+        for f in sorted(matches):
+            path = Path(f).resolve().as_posix()
+            if path not in files:
+                files.append(path)
+    return files
+
+
+def create_jobs(files, break_point=BREAK_POINT_POSTCUSTOMSCRIPTS, output_dir=None):
+    """build 결과는 output_dir 또는 .domino 옆에 {name}.build.mb 로 저장됩니다."""
+    jobs = []
+    for i, f in enumerate(files):
+        path = Path(f)
+        name = path.name.split(".")[0]
+        directory = Path(output_dir) if output_dir else path.parent
+        jobs.append(
+            {
+                "id": i,
+                "file_path": path.as_posix(),
+                "break_point": break_point,
+                "output": (directory / f"{name}.build.mb").as_posix(),
+            }
+        )
+    return jobs
+
+
+def create_report(results, total_time):
+    passed = [x for x in results if x["status"] == "ok"]
+    failed = [x for x in results if x["status"] != "ok"]
+    return {
+        "total": len(results),
+        "passed": len(passed),
+        "failed": len(failed),
+        "total_time": total_time,
+        "build_time": sum(x["time"] for x in results),
+        "results": results,
+    }
+
+
+def log_report(report):
+    logger.info("")
+    for result in report["results"]:
+        line = f"{result['status']:<6}{result['time']:>10.2f}s  {result['file_path']}"
+        if result["error"]:
+            line += f"\n{'':<18}{result['error']}"
+        logger.info(line)
+    logger.info(
+        f"\n{report['passed']}/{report['total']} passed, "
+        f"{report['failed']} failed, "
+        f"wall {report['total_time']:.2f}s, build {report['build_time']:.2f}s"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build .domino files with headless maya workers."
+    )
+    parser.add_argument("files", nargs="*", help=".domino files or glob patterns")
+    parser.add_argument("--workers", type=int, default=max(1, os.cpu_count() // 2))
+    parser.add_argument(
+        "--break-point", type=int, default=BREAK_POINT_POSTCUSTOMSCRIPTS
+    )
+    parser.add_argument("--output-dir", default=None)
+    parser.add_argument("--log-dir", default=None)
+    parser.add_argument("--report", default=None, help="json report path")
+    parser.add_argument("--mayapy", default=None, help="default: DOMINO_MAYAPY")
+    parser.add_argument("--stand-in", action="store_true")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        worker(stand_in=args.stand_in)
+        return 0
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    files = collect_files(args.files)
+    if not files:
+        logger.warning("build 할 .domino 파일이 없습니다.")
+        return 1
+
+    jobs = create_jobs(files, args.break_point, args.output_dir)
+    pool = Pool(
+        get_worker_command(args.mayapy, args.stand_in),
+        workers=args.workers,
+        log_dir=args.log_dir,
+    )
+    start_time = time.perf_counter()
+    results = pool.run(jobs)
+    report = create_report(results, time.perf_counter() - start_time)
+    log_report(report)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
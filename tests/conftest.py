@@ -0,0 +1,44 @@
+"""tests 는 mayapy 에서 실행합니다. maya 가 없다면 maya 가 필요한 test 는 skip 됩니다.
+
+mayapy -m pytest tests
+"""
+
+# built-ins
+from pathlib import Path
+import importlib.util
+import sys
+
+# scripts 디렉토리는 maya 의 PYTHONPATH 와 같게 import 경로에 추가합니다.
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+if SCRIPTS_DIR.as_posix() not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR.as_posix())
+
+try:
+    import maya.standalone
+except ImportError:
+    HAS_MAYA = False
+else:
+    HAS_MAYA = True
+    maya.standalone.initialize(name="python")
+
+
+def pytest_unconfigure(config):
+    if HAS_MAYA:
+        maya.standalone.uninitialize()
+
+
+def load_module(relative_path):
+    """maya 를 import 하지 않는 module 을 domino package 없이 file 에서 불러옵니다.
+
+    domino/__init__.py 가 maya 를 import 하므로 numpy 만 사용하는 module 을
+    maya 없이 test 할 때 사용합니다.
+
+    Args:
+        relative_path (str): scripts 기준 경로. ex) "domino/core/remap.py"
+    """
+    path = SCRIPTS_DIR / relative_path
+    name = "_test_" + path.stem
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
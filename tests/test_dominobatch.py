@@ -0,0 +1,105 @@
+"""dominobatch 의 worker pool 을 stand-in worker 로 확인합니다. maya 가 필요하지 않습니다."""
+
+# built-ins
+import json
+import subprocess
+import sys
+
+from conftest import SCRIPTS_DIR
+
+import dominobatch
+
+DOMINOBATCH = (SCRIPTS_DIR / "dominobatch.py").as_posix()
+
+
+def write_files(tmp_path):
+    good = []
+    for i in range(3):
+        path = tmp_path / f"good{i}.domino"
+        path.write_text(json.dumps({"component": {"value": "assembly"}}))
+        good.append(path.as_posix())
+    bad = tmp_path / "bad.domino"
+    bad.write_text("{ not json")
+    missing = tmp_path / "missing.domino"
+    return good, bad.as_posix(), missing.as_posix()
+
+
+def run_cli(*args):
+    return subprocess.run(
+        [sys.executable, DOMINOBATCH, *args],
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+
+def test_stand_in_report(tmp_path):
+    good, bad, missing = write_files(tmp_path)
+    report_path = tmp_path / "report.json"
+    process = run_cli(
+        *good,
+        bad,
+        missing,
+        "--stand-in",
+        "--workers",
+        "2",
+        "--log-dir",
+        (tmp_path / "logs").as_posix(),
+        "--report",
+        report_path.as_posix(),
+    )
+    assert process.returncode == 1, process.stderr
+
+    report = json.loads(report_path.read_text())
+    assert report["total"] == 5
+    assert report["passed"] == 3
+    assert report["failed"] == 2
+    assert [x["id"] for x in report["results"]] == list(range(5))
+    assert set(x["worker"] for x in report["results"]) <= {0, 1}
+
+    results = {x["file_path"]: x for x in report["results"]}
+    for path in good:
+        assert results[path]["status"] == "ok"
+        assert results[path]["error"] == ""
+        assert results[path]["output"].endswith(".build.mb")
+    assert results[bad]["status"] == "error"
+    assert results[bad]["error"].startswith("JSONDecodeError")
+    assert results[missing]["status"] == "error"
+    assert results[missing]["error"].startswith("FileNotFoundError")
+
+
+def test_stand_in_all_passed(tmp_path):
+    good, _, _ = write_files(tmp_path)
+    output_dir = tmp_path / "output"
+    process = run_cli(
+        (tmp_path / "good*.domino").as_posix(),
+        "--stand-in",
+        "--workers",
+        "4",
+        "--output-dir",
+        output_dir.as_posix(),
+        "--log-dir",
+        (tmp_path / "logs").as_posix(),
+    )
+    assert process.returncode == 0, process.stderr
+    assert "3/3 passed, 0 failed" in process.stderr
+
+
+def test_no_files(tmp_path):
+    process = run_cli((tmp_path / "*.domino").as_posix(), "--stand-in")
+    assert process.returncode == 1
+
+
+def test_pool_restarts_exited_worker(tmp_path):
+    good, _, _ = write_files(tmp_path)
+    jobs = dominobatch.create_jobs(good)
+    # 첫 job 을 quit 으로 바꿔 worker 를 종료시킵니다.
+    jobs[0] = {"id": 0, "command": "quit", "file_path": "", "output": ""}
+    pool = dominobatch.Pool(
+        dominobatch.get_worker_command(stand_in=True),
+        workers=1,
+        log_dir=tmp_path / "logs",
+    )
+    results = pool.run(jobs)
+    assert [x["status"] for x in results] == ["error", "ok", "ok"]
+    assert results[0]["error"].startswith("worker exited")
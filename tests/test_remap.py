@@ -0,0 +1,191 @@
+"""core/remap 의 KDTree, barycentric 좌표, remap 을 확인합니다. maya 가 필요하지 않습니다."""
+
+# built-ins
+import numpy as np
+import pytest
+
+from conftest import load_module
+
+remap = load_module("domino/core/remap.py")
+
+# z = 0 평면의 (0, 0) - (1, 1) quad. triangle 두개.
+QUAD_POINTS = np.array(
+    [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.0, 1.0, 0.0]]
+)
+QUAD_TRIANGLES = np.array([[0, 1, 2], [0, 2, 3]])
+
+
+def brute_force(points, queries):
+    d = ((queries[:, None, :] - points[None, :, :]) ** 2).sum(axis=-1)
+    return np.sqrt(d.min(axis=1)), d.argmin(axis=1)
+
+
+def create_grid(count=6):
+    """(count, count) point 의 grid mesh."""
+    u, v = np.meshgrid(np.arange(count), np.arange(count), indexing="ij")
+    points = np.stack([u.ravel(), v.ravel(), np.zeros(count * count)], axis=1)
+    triangles = []
+    for i in range(count - 1):
+        for j in range(count - 1):
+            a, b = i * count + j, (i + 1) * count + j
+            triangles.extend([[a, b, b + 1], [a, b + 1, a + 1]])
+    return points.astype(np.float64), np.array(triangles)
+
+
+def get_point_weights(indices, weights):
+    """index 별 weight 의 합. 같은 index 가 여러번 나올 수 있습니다."""
+    result = {}
+    for i, w in zip(indices, weights):
+        result[int(i)] = result.get(int(i), 0.0) + w
+    return {k: v for k, v in result.items() if v > 1e-9}
+
+
+# region KDTREE
+@pytest.mark.parametrize("leaf_size", [1, 4, 16])
+def test_kdtree_query(leaf_size):
+    rng = np.random.default_rng(0)
+    points = rng.random((500, 3))
+    # 중복된 point 와 이미 있는 point 위치의 query 를 포함합니다.
+    points = np.concatenate([points, points[:50]])
+    queries = np.concatenate([rng.random((200, 3)) * 1.5 - 0.25, points[::37]])
+
+    tree = remap.KDTree(points, leaf_size=leaf_size)
+    distances, indices = tree.query(queries, chunk_size=64)
+    expected_distances, _ = brute_force(points, queries)
+
+    np.testing.assert_allclose(distances, expected_distances)
+    # 거리가 같은 point 중 어느 것이든 됩니다.
+    np.testing.assert_allclose(
+        np.linalg.norm(points[indices] - queries, axis=1), expected_distances
+    )
+    np.testing.assert_array_equal(distances[200:], 0.0)
+
+
+def test_kdtree_duplicate_points():
+    points = np.repeat([[1.0, 2.0, 3.0], [-1.0, 0.0, 0.0]], 40, axis=0)
+    distances, indices = remap.KDTree(points, leaf_size=4).query([[1.0, 2.0, 4.0]])
+
+    np.testing.assert_allclose(distances, [1.0])
+    assert indices[0] < 40
+
+
+def test_kdtree_single_point():
+    tree = remap.KDTree([[1.0, 1.0, 1.0]])
+    distances, indices = tree.query([[1.0, 1.0, 1.0], [1.0, 1.0, 3.0]])
+
+    np.testing.assert_allclose(distances, [0.0, 2.0])
+    np.testing.assert_array_equal(indices, [0, 0])
+
+
+def test_kdtree_empty():
+    with pytest.raises(ValueError):
+        remap.KDTree(np.zeros((0, 3)))
+
+
+# endregion
+
+
+# region TRIANGLE
+def test_closest_point_on_triangles():
+    a, b, c = (np.repeat(QUAD_POINTS[[i]], 3, axis=0) for i in QUAD_TRIANGLES[0])
+    points = np.array(
+        [
+            # 내부 위의 point
+            [0.75, 0.25, 0.5],
+            # ab edge 밖
+            [0.5, -0.5, 0.0],
+            # b vertex 밖
+            [2.0, -1.0, 0.0],
+        ]
+    )
+    bary = remap.closest_point_on_triangles(points, a, b, c)
+
+    np.testing.assert_allclose(bary[0], [0.25, 0.5, 0.25])
+    np.testing.assert_allclose(bary[1], [0.5, 0.5, 0.0])
+    np.testing.assert_allclose(bary[2], [0.0, 1.0, 0.0])
+    np.testing.assert_allclose(bary.sum(axis=1), 1.0)
+
+
+@pytest.mark.parametrize(
+    "point, closest, expected",
+    [
+        ([0.75, 0.25, 0.5], [0.75, 0.25, 0.0], {0: 0.25, 1: 0.5, 2: 0.25}),
+        ([0.5, -0.5, 0.0], [0.5, 0.0, 0.0], {0: 0.5, 1: 0.5}),
+        ([2.0, -1.0, 0.0], [1.0, 0.0, 0.0], {1: 1.0}),
+    ],
+)
+def test_barycentric_mapping(point, closest, expected):
+    indices, weights = remap.get_mapping(QUAD_POINTS, [point], QUAD_TRIANGLES)
+
+    assert indices.shape == weights.shape == (1, 3)
+    result = get_point_weights(indices[0], weights[0])
+    assert result.keys() == expected.keys()
+    for index, weight in expected.items():
+        assert result[index] == pytest.approx(weight)
+    np.testing.assert_allclose(
+        remap.remap(QUAD_POINTS, indices, weights), [closest], atol=1e-12
+    )
+
+
+def test_nearest_mapping():
+    targets = np.array([[0.75, 0.25, 0.5], [-1.0, 2.0, 0.0]])
+    for triangles, mode in ((QUAD_TRIANGLES, remap.NEAREST), (None, remap.BARYCENTRIC)):
+        indices, weights = remap.get_mapping(QUAD_POINTS, targets, triangles, mode)
+
+        np.testing.assert_array_equal(indices, [[1, 1, 1], [3, 3, 3]])
+        np.testing.assert_array_equal(weights, [[1.0, 0.0, 0.0]] * 2)
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        remap.get_mapping(QUAD_POINTS, QUAD_POINTS, QUAD_TRIANGLES, mode="linear")
+
+
+# endregion
+
+
+# region REMAP
+def test_remap_identity():
+    points, triangles = create_grid()
+    values = np.random.default_rng(0).random((len(points), 3))
+    indices, weights = remap.get_mapping(points, points, triangles)
+
+    np.testing.assert_allclose(
+        remap.remap(values[:, 0], indices, weights), values[:, 0]
+    )
+    np.testing.assert_allclose(remap.remap(values, indices, weights), values)
+
+
+def test_remap_shapes():
+    values = np.array([0.0, 1.0, 2.0, 3.0])
+    layers = np.stack([values, values * 10.0], axis=1)
+    indices = np.array([[0, 1, 2], [3, 3, 3]])
+    weights = np.array([[0.25, 0.5, 0.25], [1.0, 0.0, 0.0]])
+
+    result = remap.remap(values, indices, weights)
+    assert result.shape == (2,)
+    np.testing.assert_allclose(result, [1.0, 3.0])
+
+    result = remap.remap(layers, indices, weights)
+    assert result.shape == (2, 2)
+    np.testing.assert_allclose(result, [[1.0, 10.0], [3.0, 30.0]])
+
+
+def test_remap_grid():
+    # 조밀한 grid 로 옮긴 선형 값은 보간 후에도 같은 선형 값입니다.
+    source_points, triangles = create_grid(4)
+    target_points, _ = create_grid(10)
+    target_points = target_points / 3.0
+    values = np.stack(
+        [source_points[:, 0] * 2.0 + source_points[:, 1], source_points[:, 1]], axis=1
+    )
+    indices, weights = remap.get_mapping(source_points, target_points, triangles)
+    expected = np.stack(
+        [target_points[:, 0] * 2.0 + target_points[:, 1], target_points[:, 1]], axis=1
+    )
+
+    np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+    np.testing.assert_allclose(remap.remap(values, indices, weights), expected)
+
+
+# endregion
@@ -0,0 +1,124 @@
+"""REGISTRY 의 기본 data 와 일부러 망가뜨린 data 로 schema 의 validate, migrate 를 확인합니다."""
+
+# built-ins
+import copy
+import json
+
+import pytest
+
+pytest.importorskip("maya")
+
+from domino.component import REGISTRY
+from domino.core import schema
+
+
+def default_data(name):
+    """.domino 에 저장된 것과 같은 component 의 기본 data."""
+    return json.loads(json.dumps(REGISTRY.create(name)))
+
+
+def create_assembly():
+    """REGISTRY 의 모든 component 를 children 으로 가진 assembly data."""
+    data = default_data("assembly")
+    data.update(copy.deepcopy(schema.ROOT_KEYS))
+    data[schema.VERSION_KEY] = schema.SCHEMA_VERSION
+    for name in REGISTRY.names():
+        if name != "assembly":
+            data["children"].append(default_data(name))
+    return data
+
+
+@pytest.mark.parametrize("name", REGISTRY.names())
+def test_registry_defaults(name):
+    warnings = []
+    problems = schema.validate(
+        default_data(name), REGISTRY, references=False, warnings=warnings
+    )
+    assert problems == []
+
+
+def test_registry_assembly():
+    warnings = []
+    assert schema.validate(create_assembly(), REGISTRY, warnings=warnings) == []
+
+
+def test_length_mismatch_is_warning():
+    # uicontainer01 의 DATA 는 guide 에서 guide_mirror_type 을 다시 맞춥니다.
+    data = default_data("uicontainer01")
+    data["guide_mirror_type"]["value"] = [2, 2]
+    data["guide_matrix"]["value"] = data["guide_matrix"]["value"][:1] * 3
+    warnings = []
+    assert schema.validate(data, REGISTRY, references=False, warnings=warnings) == []
+    assert any("guide_matrix, guide_mirror_type" in x for x in warnings)
+
+
+def test_migrate_registry_defaults():
+    data = create_assembly()
+    data.pop(schema.VERSION_KEY)
+    for key in schema.ROOT_KEYS:
+        data.pop(key)
+    # 이후 component 에 추가된 attribute 처럼 DATA 의 마지막 attribute 를 지웁니다.
+    removed = {}
+    for child in data["children"]:
+        name = child["component"]["value"]
+        removed[name] = REGISTRY.data(name)[-1].long_name
+        child.pop(removed[name])
+        child.pop("output_joint")
+
+    data = schema.migrate(data, REGISTRY)
+    assert data[schema.VERSION_KEY] == schema.SCHEMA_VERSION
+    for key, value in schema.ROOT_KEYS.items():
+        assert data[key] == value
+    for child in data["children"]:
+        name = child["component"]["value"]
+        long_name = removed[name]
+        migrated = json.loads(json.dumps(child[long_name]))
+        assert migrated == default_data(name)[long_name]
+        assert child["output_joint"] == []
+    assert schema.validate(data, REGISTRY, warnings=[]) == []
+
+
+def test_migrate_newer_version():
+    data = create_assembly()
+    data[schema.VERSION_KEY] = schema.SCHEMA_VERSION + 1
+    assert schema.migrate(data, REGISTRY) is data
+    assert data[schema.VERSION_KEY] == schema.SCHEMA_VERSION + 1
+
+
+def test_broken_data():
+    data = create_assembly()
+    data.pop("blendshape")
+    fk = next(x for x in data["children"] if x["component"]["value"] == "fk01")
+    fk["index"]["value"] = "0"
+    fk["guide_matrix"]["value"][0] = [1.0, 0.0, 0.0]
+    fk.pop("npo_matrix")
+
+    duplicate = copy.deepcopy(data["children"][0])
+    data["children"].append(duplicate)
+    data["children"].append({"component": {"value": "unknown01"}})
+    data["children"].append(default_data("fk01") | {"controller": None})
+    data["children"][0]["controller"].append(
+        {
+            "description": "broken",
+            "parent_controllers": [[["missing", "C", 0], "fk0"]],
+        }
+    )
+
+    problems = schema.validate(data, REGISTRY, warnings=[])
+    text = "\n".join(problems)
+    assert "blendshape 가 없습니다." in text
+    assert "index int 가 아닙니다. '0'" in text
+    assert "guide_matrix[0] 길이 16 의 list 가 아닙니다." in text
+    assert "npo_matrix 가 없습니다." in text
+    assert "identifier" in text and "중복됩니다." in text
+    assert "등록되지 않은 component 입니다. 'unknown01'" in text
+    assert "controller 가 없습니다." in text
+    assert "parent controller component ('missing', 'C', 0) 가 없습니다." in text
+
+
+def test_broken_enum():
+    data = default_data("fk01")
+    data["side"]["value"] = 99
+    problems = schema.validate(data, REGISTRY, references=False)
+    assert any("side 99 가 enum 범위" in x for x in problems)
+    assert problems[0].startswith("root: ")
@@ -0,0 +1,138 @@
+"""core/sparse 의 prune 과 CSR 변환을 확인합니다. maya 가 필요하지 않습니다."""
+
+# built-ins
+import numpy as np
+import pytest
+
+from conftest import load_module
+
+sparse = load_module("domino/core/sparse.py")
+
+
+def random_weights(point_count=50, layer_count=6, default_value=0.0, seed=0):
+    """절반 정도가 default 인 (point, layer) 배열. float32 로 표현되는 값만 사용합니다."""
+    rng = np.random.default_rng(seed)
+    weights = rng.random((point_count, layer_count)).astype(np.float32)
+    weights = weights.astype(np.float64)
+    weights[rng.random(weights.shape) < 0.5] = default_value
+    # 모두 default 인 row 도 포함합니다.
+    weights[3] = default_value
+    return weights
+
+
+@pytest.mark.parametrize("default_value", [0.0, 1.0])
+def test_csr_round_trip(default_value):
+    weights = random_weights(default_value=default_value)
+    indptr, indices, data = sparse.to_csr(weights, default_value)
+
+    assert len(indptr) == weights.shape[0] + 1
+    assert indptr[-1] == len(indices) == len(data)
+    assert np.count_nonzero(weights != default_value) == len(data)
+    assert indices.dtype == np.int32
+    assert data.dtype == np.float32
+    assert indptr[4] == indptr[3]
+
+    result = sparse.from_csr(indptr, indices, data, weights.shape, default_value)
+    np.testing.assert_array_equal(result, weights)
+
+
+def test_csr_all_default():
+    weights = np.zeros((4, 3))
+    indptr, indices, data = sparse.to_csr(weights)
+
+    np.testing.assert_array_equal(indptr, np.zeros(5))
+    assert len(indices) == len(data) == 0
+    np.testing.assert_array_equal(
+        sparse.from_csr(indptr, indices, data, weights.shape), weights
+    )
+
+
+def test_from_csr_rows():
+    weights = random_weights()
+    csr = sparse.to_csr(weights)
+
+    result = sparse.from_csr(*csr, weights.shape, rows=slice(10, 20))
+    np.testing.assert_array_equal(result, weights[10:20])
+
+    # 범위를 넘는 stop 은 point 수로 자릅니다.
+    result = sparse.from_csr(*csr, weights.shape, rows=slice(45, 100))
+    np.testing.assert_array_equal(result, weights[45:])
+
+
+@pytest.mark.parametrize("default_value", [0.0, 1.0])
+def test_take_rows(default_value):
+    weights = random_weights(default_value=default_value)
+    csr = sparse.to_csr(weights, default_value)
+
+    # 순서가 섞이고 중복된 row 와 모두 default 인 row.
+    rows = np.array([7, 0, 49, 3, 7, 12])
+    result = sparse.take_rows(*csr, rows, weights.shape[1], default_value)
+    np.testing.assert_array_equal(result, weights[rows])
+
+    empty = sparse.take_rows(*csr, np.array([], dtype=np.int64), weights.shape[1])
+    assert empty.shape == (0, weights.shape[1])
+
+
+def test_concatenate_csr():
+    weights = random_weights()
+    chunks = [sparse.to_csr(weights[i : i + 16]) for i in range(0, len(weights), 16)]
+
+    indptr, indices, data = sparse.concatenate_csr(chunks)
+    expected = sparse.to_csr(weights)
+    np.testing.assert_array_equal(indptr, expected[0])
+    np.testing.assert_array_equal(indices, expected[1])
+    np.testing.assert_array_equal(data, expected[2])
+
+
+def test_get_column():
+    weights = random_weights(default_value=1.0)
+    csr = sparse.to_csr(weights, 1.0)
+
+    for column in range(weights.shape[1]):
+        result = sparse.get_column(*csr, len(weights), column, default_value=1.0)
+        np.testing.assert_array_equal(result, weights[:, column])
+
+
+def test_prune_threshold():
+    weights = np.array(
+        [
+            [0.5, 0.49995, 0.00005],
+            [0.25, 0.25, 0.5],
+            [0.0, 0.0, 0.0],
+        ]
+    )
+    total = weights.sum(axis=1)
+    result = sparse.prune_weights(weights, threshold=1e-4)
+
+    # 직접 수정합니다.
+    assert result is weights
+    assert weights[0, 2] == 0.0
+    np.testing.assert_allclose(weights.sum(axis=1), total)
+    np.testing.assert_allclose(weights[1], [0.25, 0.25, 0.5])
+    # 모든 weight 가 0 인 vertex 는 0 으로 남습니다.
+    np.testing.assert_array_equal(weights[2], [0.0, 0.0, 0.0])
+
+
+def test_prune_max_influences():
+    weights = np.array(
+        [
+            [0.1, 0.4, 0.2, 0.3],
+            [0.7, 0.0, 0.3, 0.0],
+        ]
+    )
+    total = weights.sum(axis=1)
+    sparse.prune_weights(weights, max_influences=2)
+
+    assert (np.count_nonzero(weights, axis=1) <= 2).all()
+    np.testing.assert_allclose(weights.sum(axis=1), total)
+    # 큰 weight 두개가 비율을 유지합니다.
+    np.testing.assert_allclose(weights[0], [0.0, 4 / 7, 0.0, 3 / 7])
+    np.testing.assert_allclose(weights[1], [0.7, 0.0, 0.3, 0.0])
+
+
+def test_prune_influence_count():
+    # influence 수가 max_influences 이하라면 threshold 만 적용합니다.
+    weights = random_weights(layer_count=3)
+    expected = weights.copy()
+    sparse.prune_weights(weights, threshold=0.0, max_influences=4)
+    np.testing.assert_allclose(weights, expected)
@@ -0,0 +1,143 @@
+"""export_weights_to_directory 의 .npz 와 deformerWeights json export 를 확인합니다.
+
+deformer 하나가 여러 geometry 에 연결된 경우 geometry 마다 파일 하나를 씁니다.
+"""
+
+# built-ins
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pytest.importorskip("maya")
+
+from maya import cmds
+
+from domino.core import rigkit, sparse, weights
+
+
+@pytest.fixture(autouse=True)
+def new_scene():
+    cmds.file(new=True, force=True)
+    yield
+    cmds.file(new=True, force=True)
+
+
+def get_shape(transform):
+    return cmds.listRelatives(transform, shapes=True, noIntermediate=True)[0]
+
+
+def get_cluster_weights(cluster, shape, component="vtx"):
+    return np.array(
+        cmds.percent(cluster, f"{shape}.{component}[*]", query=True, value=True)
+    )
+
+
+def create_meshes_cluster():
+    """cube, sphere 두 mesh 에 연결된 cluster. mesh 마다 일부 weight 를 칠합니다."""
+    cube = cmds.polyCube(name="cube")[0]
+    sphere = cmds.polySphere(name="sphere", subdivisionsX=8, subdivisionsY=6)[0]
+    cluster = cmds.cluster(cube, sphere, name="multi_cluster")[0]
+    cmds.percent(cluster, f"{cube}.vtx[0:3]", value=0.25)
+    cmds.percent(cluster, f"{sphere}.vtx[5]", value=0.0)
+    cmds.percent(cluster, f"{sphere}.vtx[10:12]", value=0.5)
+    return cluster, [get_shape(cube), get_shape(sphere)]
+
+
+def test_export_npz_per_shape(tmp_path):
+    cluster, shapes = create_meshes_cluster()
+    expected = {x: get_cluster_weights(cluster, x) for x in shapes}
+
+    paths = rigkit.export_weights_to_directory(tmp_path.as_posix(), [cluster])
+
+    assert paths == [
+        (tmp_path / weights.get_file_name(x, cluster, "cluster")).as_posix()
+        for x in shapes
+    ]
+    assert not list(tmp_path.glob("*.json"))
+    for shape, path in zip(shapes, paths):
+        data = weights.read_weights(path)
+        count = cmds.polyEvaluate(shape, vertex=True)
+        assert data["version"] == weights.FORMAT_VERSION
+        assert data["deformer"] == cluster
+        assert data["deformer_type"] == "cluster"
+        assert data["shape"] == shape
+        assert data["shape_info"] == (count,)
+        assert data["layers"] == ["weights"]
+        assert data["default_value"] == 1.0
+        assert data["points"].shape == (count, 3)
+        # default(1) 가 아닌 weight 만 저장합니다.
+        assert len(data["data"]) == np.count_nonzero(expected[shape] != 1.0)
+        dense = sparse.from_csr(
+            data["indptr"], data["indices"], data["data"], (count, 1), 1.0
+        )
+        np.testing.assert_allclose(dense[:, 0], expected[shape])
+
+    # 모든 weight 를 되돌리고 .npz 로 다시 적용합니다.
+    for shape in shapes:
+        cmds.percent(cluster, f"{shape}.vtx[*]", value=1.0)
+    for path in paths:
+        assert weights.import_weights(path) == cluster
+    for shape in shapes:
+        np.testing.assert_allclose(get_cluster_weights(cluster, shape), expected[shape])
+
+
+def test_export_skin_npz(tmp_path):
+    cube = cmds.polyCube(name="cube", subdivisionsY=4)[0]
+    cmds.select(clear=True)
+    joints = [cmds.joint(name=f"joint{i}", position=(0, i - 0.5, 0)) for i in range(2)]
+    skin = cmds.skinCluster(joints, cube, toSelectedBones=True, name="skin")[0]
+    shape = get_shape(cube)
+    exported, _ = weights.read_skin_weights(skin, shape)
+    expected = sparse.prune_weights(exported.copy())
+
+    paths = rigkit.export_weights_to_directory(tmp_path.as_posix(), [skin])
+
+    assert [Path(x).name for x in paths] == [
+        weights.get_file_name(shape, skin, "skinCluster")
+    ]
+    data = weights.read_weights(paths[0])
+    assert data["layers"] == joints
+    assert data["default_value"] == 0.0
+    dense = sparse.from_csr(
+        data["indptr"], data["indices"], data["data"], expected.shape
+    )
+    np.testing.assert_allclose(dense, expected, atol=1e-6)
+
+    cmds.skinPercent(skin, shape, transformValue=[(joints[0], 1.0)])
+    weights.import_weights(paths[0])
+    result, _ = weights.read_skin_weights(skin, shape)
+    np.testing.assert_allclose(result, expected, atol=1e-6)
+
+
+def test_export_json_fallback(tmp_path):
+    """lattice 가 있다면 is_supported 가 아니므로 geometry 마다 json 을 씁니다."""
+    sphere = cmds.polySphere(name="sphere", subdivisionsX=8, subdivisionsY=6)[0]
+    lattice = cmds.lattice(cmds.polyCube(name="cube")[0], name="ffd")[1]
+    cluster = cmds.cluster(sphere, lattice, name="mixed_cluster")[0]
+    cmds.percent(cluster, f"{sphere}.vtx[0:3]", value=0.25)
+    cmds.percent(cluster, f"{lattice}.pt[0][0][0]", value=0.5)
+    shapes = cmds.deformer(cluster, geometry=True, query=True)
+    assert not weights.is_supported(cluster)
+
+    # 이전 export 의 .npz 는 지웁니다.
+    stale = tmp_path / weights.get_file_name(shapes[0], cluster, "cluster")
+    stale.write_bytes(b"")
+
+    paths = rigkit.export_weights_to_directory(tmp_path.as_posix(), [cluster])
+
+    assert paths == [
+        (tmp_path / rigkit.get_weight_file_name(x, cluster, "cluster")).as_posix()
+        for x in shapes
+    ]
+    assert not stale.exists()
+    assert not list(tmp_path.glob(f"*{weights.WEIGHT_EXTENSION}"))
+    for shape, path in zip(shapes, paths):
+        with open(path, "r") as f:
+            data = json.load(f)["deformerWeight"]
+        # 다른 geometry 의 weight 는 포함하지 않습니다.
+        assert [x["name"] for x in data["shapes"]] == [shape]
+        assert [x["name"] for x in data["deformers"]] == [cluster]
+        assert data["weights"]
+        assert all(x["shape"] == shape for x in data["weights"])
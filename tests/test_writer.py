@@ -0,0 +1,131 @@
+"""background save(SaveHandle) 의 쓰기, error, log 를 확인합니다."""
+
+# built-ins
+import json
+import logging
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("maya")
+
+from domino.core import writer
+from domino.core.utils import logger
+
+
+class RecordHandler(logging.Handler):
+    def __init__(self):
+        super().__init__(level=logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append((record.getMessage(), threading.current_thread()))
+
+
+@pytest.fixture
+def records():
+    handler = RecordHandler()
+    level = logger.level
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    yield handler.records
+    logger.removeHandler(handler)
+    logger.setLevel(level)
+
+
+def test_background_write(tmp_path, records):
+    handle = writer.SaveHandle((tmp_path / "rig.domino").as_posix())
+    started = threading.Event()
+
+    def write(i):
+        started.wait(10)
+        path = writer.write_json((tmp_path / f"{i}.json").as_posix(), {"i": i})
+        handle.log(f"write {i}")
+        return path
+
+    for i in range(16):
+        handle.submit(i, write, i)
+    order = []
+    handle.finalize(lambda: order.append(sorted(x.name for x in tmp_path.iterdir())))
+    handle.start()
+
+    # thread pool 이 끝나기 전에 돌아옵니다.
+    assert not handle.done()
+    assert handle.progress() == (0, 17)
+    started.set()
+    assert handle.wait(30)
+
+    assert handle.done()
+    assert handle.progress() == (17, 17)
+    assert handle.errors() == []
+    for i in range(16):
+        assert json.loads((tmp_path / f"{i}.json").read_text()) == {"i": i}
+    # finalize 는 모든 쓰기가 끝난 뒤 실행됩니다.
+    assert order == [sorted(f"{i}.json" for i in range(16))]
+    assert not list(tmp_path.glob("*.tmp"))
+
+    # thread pool 의 message 는 wait 를 호출한 thread 에서 출력됩니다.
+    messages = [x for x in records if x[0].startswith("write ")]
+    assert len(messages) == 16
+    assert all(x[1] is threading.current_thread() for x in messages)
+
+
+def test_concurrent_exports(tmp_path):
+    """latency 가 있는 export(network drive 등) 는 thread pool 에서 동시에 실행됩니다."""
+    count, latency = 16, 0.2
+    handle = writer.SaveHandle((tmp_path / "rig.domino").as_posix())
+
+    def export(i):
+        time.sleep(latency)
+        return writer.write_json((tmp_path / f"{i}.json").as_posix(), {"i": i})
+
+    start_time = time.perf_counter()
+    for i in range(count):
+        handle.submit(i, export, i)
+    handle.start()
+    assert handle.wait(30)
+    elapsed = time.perf_counter() - start_time
+
+    assert handle.errors() == []
+    assert len(list(tmp_path.glob("*.json"))) == count
+    # 순서대로 실행하면 count * latency 입니다. CI 를 고려해 여유있게 비교합니다.
+    assert writer.MAX_WORKERS >= 2
+    assert elapsed < 0.5 * count * latency
+
+
+def test_background_errors(tmp_path, records):
+    handle = writer.SaveHandle((tmp_path / "rig.domino").as_posix())
+
+    def fail():
+        raise PermissionError("denied")
+
+    handle.submit("ok", writer.write_json, (tmp_path / "ok.json").as_posix(), {})
+    handle.submit("fail", fail)
+    handle.start()
+    assert handle.wait(30)
+
+    assert (tmp_path / "ok.json").exists()
+    assert handle.errors() == [("fail", "PermissionError: denied")]
+    assert any("Save fail 실패했습니다." in x[0] for x in records)
+
+
+def test_wait_for_file(tmp_path):
+    file_path = (tmp_path / "rig.domino").as_posix()
+    handle = writer.SaveHandle(file_path)
+    release = threading.Event()
+    handle.submit("slow", release.wait, 30)
+    handle.start()
+
+    threading.Timer(0.2, release.set).start()
+    writer.wait(file_path)
+    assert handle.done()
+    assert writer._HANDLES.get(file_path) is None
+
+
+def test_snapshot_copies_containers():
+    data = {"a": [1, [2, 3]], "b": {"c": (4, 5)}}
+    copied = writer.snapshot(data)
+    assert copied == {"a": [1, [2, 3]], "b": {"c": [4, 5]}}
+    copied["a"][1].append(9)
+    assert data["a"][1] == [2, 3]